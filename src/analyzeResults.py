@@ -0,0 +1,546 @@
+#!/usr/bin/env python3
+
+# Python Implementation: aggregate and compare benchmark results
+# -*- coding: utf-8 -*-
+##
+# @file       analyzeResults.py
+#
+# @version    1.1.0
+#
+# @par Purpose
+#             Load all benchmark results of a log directory, group them by
+#             benchmark and platform, and compute statistics, speedup
+#             matrices, outliers and regressions between two result sets as
+#             well as LaTeX tables like the ones in doc/Benchmarks.tex.
+#
+# @par Synopsis:
+#                 analyzeResults.py [--logs <dir>] [--metric <metric>]
+#                                   [--platforms <p1,p2,...>] <command>
+#             where command is one of
+#                 summary                   statistics per benchmark and
+#                                           platform
+#                 table [--headers <p1=h1,p2=h2,...>]
+#                                           LaTeX table of the medians, with
+#                                           the given column headers for the
+#                                           platforms, e.g. the host names of
+#                                           doc/Benchmarks.tex
+#                 speedup [<module>]        speedup matrices between the
+#                                           platforms
+#                 outliers [--threshold t]  runs deviating from their group
+#                 compare <dir> [--threshold t]
+#                                           regressions of the results in
+#                                           the log directory over the
+#                                           baseline results in dir
+#             and metric is one of trainingTime (default), testTime,
+#             testAccuracy and throughput.
+#
+# @par Comments
+#             The results are held in a columnar table of numpy arrays, one
+#             array per field, with NaN for missing values.  Since parsing
+#             hundreds of legacy logs takes a while, the columns are cached in
+#             $TEMP (or /tmp) keyed by the names, sizes and modification times
+#             of the files in the log directory.
+#
+#             This is Python 3 code!
+
+# Known Bugs: none
+#
+# @author     Ekkehard Blanz <Ekkehard.Blanz@gmail.com> (C) 2026
+#
+# @copyright  See COPYING file that comes with this distribution
+#
+# File history:
+#
+#      Date         | Author         | Modification
+#  -----------------+----------------+------------------------------------------
+#   Sat Oct 17 2026 | Ekkehard Blanz | created
+#   Sat Oct 17 2026 | Ekkehard Blanz | escaped LaTeX table headers and titles,
+#                   |                | added header option
+#                   |                |
+
+import sys
+import os
+import math
+import hashlib
+import argparse
+import numpy as np
+
+import runStatistics
+import resultRecord
+
+
+# benchmark modules in the sequence and with the names of doc/Benchmarks.tex
+moduleTitles = [("mnist1D", "MNIST Digits 1D"),
+                ("imdb", "IMDB"),
+                ("reuters", "Reuters"),
+                ("mnist2D", "MNIST Digits 2D"),
+                ("dogsVsCats", "Dogs vs Cats"),
+                ("imdbEmbedded", "IMDB Embedded"),
+                ("mpiWeather", "MPI Weather"),
+                ("mpiWeatherConv", "MPI Weather Conv.")]
+
+# string and numeric columns of a result table
+stringColumns = ["module", "platform", "dtype", "source"]
+numericColumns = ["experiment", "run", "trainingSize", "testSize",
+                  "trainingTime", "testTime", "testAccuracy", "throughput"]
+
+# metrics where a smaller value is better
+timeMetrics = ["trainingTime", "testTime"]
+
+
+class ResultTable:
+    """!
+    @brief Columnar in-memory representation of benchmark results.
+
+    Every column is a numpy array with one element per run; string columns
+    have dtype str, numeric columns dtype float64 with NaN for missing values.
+    """
+
+    def __init__( self, columns ):
+        """!
+        @brief Constructor.
+        @param columns dictionary of column name to numpy array
+        """
+        self.columns = columns
+
+
+    def __len__( self ):
+        return len( self.columns["module"] )
+
+
+    def __getitem__( self, name ):
+        return self.columns[name]
+
+
+    @classmethod
+    def fromRecords( cls, records ):
+        """!
+        @brief Create a table from result records.
+        @param records list of records as defined in resultRecord.py
+        @return new table
+        """
+        columns = {}
+        for name in stringColumns:
+            columns[name] = np.array( [str( record[name] )
+                                       for record in records], dtype=str )
+        for name in numericColumns:
+            values = []
+            for record in records:
+                if name == "throughput":
+                    epochs = record.get( "epochs" ) or {}
+                    value = epochs.get( "steadyStateThroughput" )
+                else:
+                    value = record[name]
+                values.append( np.nan if value is None else value )
+            columns[name] = np.array( values, dtype=np.float64 )
+        return cls( columns )
+
+
+    def select( self, mask ):
+        """!
+        @brief Select rows of the table.
+        @param mask boolean or index array
+        @return new table with the selected rows
+        """
+        return ResultTable( {name: column[mask]
+                             for name, column in self.columns.items()} )
+
+
+    def where( self, **conditions ):
+        """!
+        @brief Select the rows where the given columns have the given values.
+        @param conditions column name and value pairs
+        @return new table with the matching rows
+        """
+        mask = np.ones( len( self ), dtype=bool )
+        for name, value in conditions.items():
+            mask &= self.columns[name] == value
+        return self.select( mask )
+
+
+    def groups( self, keys=("module", "platform") ):
+        """!
+        @brief Group the rows by the values of some columns.
+        @param keys names of the columns to group by
+        @return dictionary of key tuple to index array of the rows
+        """
+        if len( self ) == 0:
+            return {}
+        keyColumns = [self.columns[key] for key in keys]
+        combined = np.array( ["\0".join( values )
+                              for values in zip( *keyColumns )] )
+        unique, inverse = np.unique( combined, return_inverse=True )
+        order = np.argsort( inverse, kind="stable" )
+        bounds = np.searchsorted( inverse[order],
+                                  np.arange( len( unique ) + 1 ) )
+        result = {}
+        for i, key in enumerate( unique ):
+            result[tuple( key.split( "\0" ) )] = order[bounds[i]:bounds[i + 1]]
+        return result
+
+
+    def unique( self, name ):
+        """!
+        @brief Return the distinct values of a column.
+        @param name name of the column
+        @return sorted list of the values
+        """
+        return sorted( set( self.columns[name].tolist() ) )
+
+
+def directorySignature( logDir ):
+    """!
+    @brief Compute a signature of the result files of a log directory.
+    @param logDir log directory
+    @return hexadecimal digest of the names, sizes and modification times
+    """
+    digest = hashlib.sha1()
+    for fileName in sorted( os.listdir( logDir ) ):
+        if fileName.endswith( ".log" ) or fileName.endswith( ".jsonl" ):
+            stat = os.stat( os.path.join( logDir, fileName ) )
+            digest.update( "{0}:{1}:{2};".format(
+                fileName, stat.st_size, stat.st_mtime_ns ).encode() )
+    return digest.hexdigest()
+
+
+def loadTable( logDir, useCache=True ):
+    """!
+    @brief Load the results of a log directory into a table.
+    @param logDir log directory
+    @param useCache if True, the columns are read from and written to a cache
+           file in $TEMP (or /tmp)
+    @return result table
+    """
+    cacheName = None
+    if useCache:
+        cacheDir = os.path.join( os.getenv( "TEMP", "/tmp" ), "dlBenchmarks",
+                                 "results" )
+        os.makedirs( cacheDir, exist_ok=True )
+        cacheName = os.path.join( cacheDir,
+                                  directorySignature( logDir ) + ".npz" )
+        if os.path.isfile( cacheName ):
+            cache = np.load( cacheName )
+            return ResultTable( {name: cache[name] for name in cache.files} )
+
+    table = ResultTable.fromRecords( resultRecord.loadDirectory( logDir ) )
+
+    if cacheName is not None:
+        tmpName = "{0}.{1}.npz".format( cacheName[:-4], os.getpid() )
+        np.savez( tmpName, **table.columns )
+        os.replace( tmpName, cacheName )
+    return table
+
+
+def groupStatistics( table, metric ):
+    """!
+    @brief Compute the statistics of a metric per benchmark and platform.
+    @param table result table
+    @param metric name of the numeric column
+    @return dictionary of (module, platform) to statistics as returned by
+            runStatistics.summarize(), groups without values are omitted
+    """
+    result = {}
+    for key, rows in table.groups().items():
+        values = table[metric][rows]
+        stats = runStatistics.summarize( values[~np.isnan( values )].tolist() )
+        if stats is not None:
+            result[key] = stats
+    return result
+
+
+def speedupMatrix( table, module, platforms, metric="trainingTime" ):
+    """!
+    @brief Compute the speedups between platforms for one benchmark.
+
+    Element [i, j] is the factor by which platform i is faster than platform j
+    based on the medians of the metric, i.e. the ratio of the median times of
+    j and i for time metrics and of i and j for all other metrics.
+    @param table result table
+    @param module name of the benchmark module
+    @param platforms list of platforms
+    @param metric name of the numeric column
+    @return square numpy array with NaN where a platform has no results
+    """
+    medians = np.full( len( platforms ), np.nan )
+    subset = table.where( module=module )
+    for i, platform in enumerate( platforms ):
+        values = subset[metric][subset["platform"] == platform]
+        values = values[~np.isnan( values )]
+        if len( values ):
+            medians[i] = np.median( values )
+    if metric in timeMetrics:
+        return medians[np.newaxis, :] / medians[:, np.newaxis]
+    return medians[:, np.newaxis] / medians[np.newaxis, :]
+
+
+def findOutliers( table, metric, threshold=3.5 ):
+    """!
+    @brief Find runs whose metric deviates strongly from the other runs of the
+           same benchmark on the same platform.
+
+    The deviation is measured by the modified z-score based on the median
+    absolute deviation, which unlike the standard deviation is not inflated by
+    the outliers themselves.
+    @param table result table
+    @param metric name of the numeric column
+    @param threshold modified z-score above which a run is an outlier
+    @return list of (row index, modified z-score) tuples
+    """
+    outliers = []
+    for key, rows in table.groups().items():
+        values = table[metric][rows]
+        valid = ~np.isnan( values )
+        if np.count_nonzero( valid ) < 3:
+            continue
+        median = np.median( values[valid] )
+        mad = np.median( np.abs( values[valid] - median ) )
+        if mad == 0:
+            continue
+        scores = 0.6745 * (values - median) / mad
+        for row, score in zip( rows, scores ):
+            if not np.isnan( score ) and abs( score ) > threshold:
+                outliers.append( (int( row ), float( score )) )
+    return outliers
+
+
+def findRegressions( baseline, current, metric, threshold=0.05 ):
+    """!
+    @brief Find benchmarks and platforms whose results got worse.
+
+    A group is reported if its mean got worse by more than the relative
+    threshold and the difference of the means is significant according to
+    Welch's t-test at the 95 % level.  Groups with a single run on either side
+    are reported on the threshold alone.
+    @param baseline result table of the reference results
+    @param current result table of the new results
+    @param metric name of the numeric column
+    @param threshold relative change that is considered relevant
+    @return list of dictionaries with module, platform, baseline and current
+            mean, relative change and significance, worst first
+    """
+    baselineStats = groupStatistics( baseline, metric )
+    currentStats = groupStatistics( current, metric )
+    regressions = []
+    for key in sorted( set( baselineStats ) & set( currentStats ) ):
+        old = baselineStats[key]
+        new = currentStats[key]
+        if old["mean"] == 0:
+            continue
+        change = (new["mean"] - old["mean"]) / old["mean"]
+        if metric not in timeMetrics:
+            change = -change
+        if change <= threshold:
+            continue
+
+        significant = None
+        if old["n"] > 1 and new["n"] > 1:
+            oldVar = old["stddev"]**2 / old["n"]
+            newVar = new["stddev"]**2 / new["n"]
+            if oldVar + newVar == 0:
+                significant = True
+            else:
+                t = abs( new["mean"] - old["mean"] ) / math.sqrt( oldVar +
+                                                                  newVar )
+                dof = (oldVar + newVar)**2 / \
+                    (oldVar**2 / (old["n"] - 1) + newVar**2 / (new["n"] - 1))
+                significant = t > runStatistics.tCritical95(
+                    max( 1, int( dof ) ) )
+            if not significant:
+                continue
+
+        regressions.append( {"module": key[0],
+                             "platform": key[1],
+                             "baseline": old["mean"],
+                             "current": new["mean"],
+                             "change": change,
+                             "significant": significant} )
+    regressions.sort( key=lambda regression: -regression["change"] )
+    return regressions
+
+
+def latexEscape( text ):
+    """!
+    @brief Escape the characters LaTeX treats specially.
+    @param text plain text, e.g. a platform name like ARMARM_8
+    @return LaTeX source of the text
+    """
+    specials = {"\\": "\\textbackslash{}", "&": "\\&", "%": "\\%",
+                "$": "\\$", "#": "\\#", "_": "\\_", "{": "\\{",
+                "}": "\\}", "~": "\\textasciitilde{}",
+                "^": "\\textasciicircum{}"}
+    return "".join( specials.get( character, character )
+                    for character in text )
+
+
+def parseHeaders( text, platforms ):
+    """!
+    @brief Map platforms to column headers.
+    @param text comma-separated platform=header pairs or None
+    @param platforms list of platforms
+    @return list of headers, the platform name for every platform without one
+    @throw ValueError if a pair has no = or names an unknown platform
+    """
+    headerMap = {}
+    for pair in ( text or "" ).split( "," ):
+        if not pair:
+            continue
+        platform, separator, header = pair.partition( "=" )
+        if not separator or platform not in platforms:
+            raise ValueError( "{0} is not of the form platform=header with "
+                              "one of the platforms {1}".format(
+                                  pair, ", ".join( platforms ) ) )
+        headerMap[platform] = header
+    return [headerMap.get( platform, platform ) for platform in platforms]
+
+
+def latexTable( table, metric, platforms, caption, label, headers=None,
+                scale=1 ):
+    """!
+    @brief Create a LaTeX table of the medians of a metric in the layout of
+           doc/Benchmarks.tex.
+    @param table result table
+    @param metric name of the numeric column
+    @param platforms list of platforms, one column each
+    @param caption caption of the table
+    @param label label of the table
+    @param headers column headers as plain text, the platform names by
+           default - like the row titles, they are escaped for LaTeX
+    @param scale factor to apply to all values
+    @return LaTeX source of the table
+    """
+    if headers is None:
+        headers = platforms
+    stats = groupStatistics( table, metric )
+
+    text = "\\begin{table}[ht!]\n\\begin{center}\n\\begin{small}\n"
+    text += "\\begin{tabular}{|l|" + "r|" * len( platforms ) + "} \\hline\n"
+    text += "                  &\\multicolumn{{{0}}}{{c|}}{{{1}}} " \
+            "\\\\\n".format( len( platforms ), caption )
+    text += "                  & " + \
+            " & ".join( latexEscape( header ) for header in headers ) + \
+            " \\\\ \\hline \\hline\n"
+    for module, title in moduleTitles:
+        if module not in table["module"]:
+            continue
+        cells = []
+        for platform in platforms:
+            if (module, platform) in stats:
+                cells.append( "{0:7.1f}".format(
+                    stats[(module, platform)]["median"] * scale ) )
+            else:
+                cells.append( "      -" )
+        text += "{0:18s}& ".format( latexEscape( title ) ) + \
+                " & ".join( cells ) + \
+                " \\\\ \\hline\n"
+    text += "\\end{tabular}\n\\end{small}\n"
+    text += "\\caption{{{0}.}}\n\\label{{{1}}}\n".format( caption, label )
+    text += "\\end{center}\n\\end{table}\n"
+    return text
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Aggregate and compare benchmark results." )
+    parser.add_argument( "--logs", default="../logs",
+                         help="log directory (default: ../logs)" )
+    parser.add_argument( "--metric", default="trainingTime",
+                         choices=["trainingTime", "testTime", "testAccuracy",
+                                  "throughput"],
+                         help="metric to analyze (default: trainingTime)" )
+    parser.add_argument( "--platforms", default=None,
+                         help="comma-separated platforms in the sequence to "
+                              "report them (default: all)" )
+    parser.add_argument( "--no-cache", action="store_true",
+                         help="do not use the cache of parsed results" )
+    subparsers = parser.add_subparsers( dest="command", required=True )
+    subparsers.add_parser( "summary" )
+    tableParser = subparsers.add_parser( "table" )
+    tableParser.add_argument( "--headers", default=None,
+                              help="comma-separated platform=header pairs, "
+                                   "e.g. ARMARM_8=Boromir (default: the "
+                                   "platform names)" )
+    speedupParser = subparsers.add_parser( "speedup" )
+    speedupParser.add_argument( "module", nargs="?", default=None )
+    outlierParser = subparsers.add_parser( "outliers" )
+    outlierParser.add_argument( "--threshold", type=float, default=3.5 )
+    compareParser = subparsers.add_parser( "compare" )
+    compareParser.add_argument( "baseline" )
+    compareParser.add_argument( "--threshold", type=float, default=0.05 )
+    args = parser.parse_args()
+
+    table = loadTable( args.logs, not args.no_cache )
+    if args.platforms is None:
+        platforms = table.unique( "platform" )
+    else:
+        platforms = args.platforms.split( "," )
+    modules = [module for module, title in moduleTitles
+               if module in table["module"]]
+    # scale accuracies to percent
+    scale = 100 if args.metric == "testAccuracy" else 1
+
+    if args.command == "summary":
+        stats = groupStatistics( table, args.metric )
+        print( "{0:16s}{1:22s}{2:>4s}{3:>11s}{4:>11s}{5:>11s}{6:>11s}"
+               "{7:>11s}".format( "Module", "Platform", "n", "mean", "median",
+                                  "stddev", "min", "95% CI" ) )
+        for module in modules:
+            for platform in platforms:
+                if (module, platform) not in stats:
+                    continue
+                s = stats[(module, platform)]
+                print( "{0:16s}{1:22s}{2:4d}{3:11.3f}{4:11.3f}{5:11.3f}"
+                       "{6:11.3f}{7:11.3f}".format(
+                           module, platform, s["n"], s["mean"] * scale,
+                           s["median"] * scale, s["stddev"] * scale,
+                           s["min"] * scale, s["ci95"] * scale ) )
+
+    elif args.command == "table":
+        captions = {"trainingTime": "Training Time [s]",
+                    "testTime": "Test Time [s]",
+                    "testAccuracy": "Accuracy [\\%]",
+                    "throughput": "Throughput [samples/s]"}
+        try:
+            headers = parseHeaders( args.headers, platforms )
+        except ValueError as e:
+            parser.error( str( e ) )
+        print( latexTable( table, args.metric, platforms,
+                           captions[args.metric], "tab:" + args.metric,
+                           headers, scale ) )
+
+    elif args.command == "speedup":
+        for module in modules:
+            if args.module is not None and module != args.module:
+                continue
+            matrix = speedupMatrix( table, module, platforms, args.metric )
+            print( "Speedup of row over column for {0}:".format( module ) )
+            print( " " * 22 + "".join( "{0:>22s}".format( platform )
+                                       for platform in platforms ) )
+            for platform, row in zip( platforms, matrix ):
+                print( "{0:22s}".format( platform ) +
+                       "".join( "{0:22.2f}".format( value ) for value in row ) )
+            print()
+
+    elif args.command == "outliers":
+        for row, score in findOutliers( table, args.metric, args.threshold ):
+            print( "{0:16s}{1:22s} experiment {2:>3s}: {3:11.3f} "
+                   "(z = {4:.1f})".format(
+                       table["module"][row], table["platform"][row],
+                       "-" if np.isnan( table["experiment"][row] ) else
+                       str( int( table["experiment"][row] ) ),
+                       table[args.metric][row] * scale, score ) )
+
+    elif args.command == "compare":
+        baseline = loadTable( args.baseline, not args.no_cache )
+        regressions = findRegressions( baseline, table, args.metric,
+                                       args.threshold )
+        for regression in regressions:
+            print( "{0:16s}{1:22s}{2:11.3f} -> {3:11.3f} "
+                   "({4:+.1f} % worse)".format(
+                       regression["module"], regression["platform"],
+                       regression["baseline"] * scale,
+                       regression["current"] * scale,
+                       regression["change"] * 100 ) )
+        if not regressions:
+            print( "No regressions found" )
+
+    sys.exit( 0 )
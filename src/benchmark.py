@@ -5,7 +5,7 @@
 ##
 # @file       benchmark.py
 #
-# @version    1.3.1
+# @version    1.24.0
 #
 # @par Purpose
 #             Run a Python script using keras and tensorflow as a benchmark and
@@ -13,20 +13,131 @@
 #
 # @par Synopsis:
 #                 benchmark.py <module> [<exp. number>] [<mlc device]
+#                              [--repeat N] [--warmup K] [--sparse]
+#                              [--image-cache] [--pipeline generator|tfdata]
+#                              [--pipeline-cache] [--manifest <file>]
+#                              [--dtype <dtype> | --precision <precision>]
+#                              [--threads N [--affinity]]
+#                              [--batch-size B] [--epochs E]
+#                              [--memory-interval S]
+#                              [--utilization-interval S]
+#                              [--inference [--inference-batch-sizes <list>]
+#                               [--inference-repeat N] [--inference-warmup K]]
+#                              [--save-model | --evaluate-only]
+#                              [--quantize] [--synthetic]
+#                              [--trace] [--refresh-hardware]
+#                              [--profile <steps> [--profile-top N]]
 #             where exp. number is the number of the experiment and mlc device
 #             is one of "cpu" "gpu" or "any" where "any" lets TensorFlow decide
 #             which computational device to use, which is the default.  This is
 #             only used on the Mac.  The sequence of the optional parameters is
 #             arbitrary.  If the experiment number is not given, it is not used
 #             as part of the log file name.  If the architecture has no GPU, the
-#             mlc device parameter is ignored if given.
+#             mlc device parameter is ignored if given.  With --repeat, the
+#             test run is executed N times in the same process and the log
+#             reports the mean of the measurements together with their median,
+#             standard deviation, minimum and 95 % confidence interval; the
+#             first K runs given with --warmup are executed in addition and
+#             discarded.  A timing callback is installed for every test
+#             run and the log lists the time of every epoch and batch as well
+#             as the throughput with the first epoch, which includes tracing
+#             the graph, separated from the steady state.  Next to the log,
+#             a file with the same name but the extension .jsonl receives one
+#             machine-readable record per measured run as described in
+#             resultRecord.py.  With --sparse, the IMDB and Reuters
+#             benchmarks feed their multi-hot encoded input as a sparse tensor.
+#             With --image-cache, the dogs vs cats benchmark decodes its JPEG
+#             images only once into the dataset cache and streams them from
+#             there.  With --pipeline tfdata, the dogs vs cats and weather
+#             benchmarks prepare their input with a parallel, prefetching
+#             tf.data pipeline instead of a Python generator, and with
+#             --pipeline-cache that pipeline keeps decoded images in memory.
+#             The input pipeline of these benchmarks is always logged.
+#             With --manifest, the dogs vs cats benchmark reads its split of
+#             the dataset from the given JSON file or, if the file does not
+#             exist yet, writes the split there, so that later runs use the
+#             same images even if the dataset directory changes.
+#             --dtype overrides the floating-point precision the platform uses
+#             by default and appends it to the platform name of the log.
+#             --precision float16 or bfloat16 selects the Keras mixed precision
+#             policy of that name, under which the layers compute in 16 bits
+#             while their weights stay float32, the output layers compute in
+#             float32, so that the loss is computed in full precision, and
+#             Keras scales the loss of float16 models dynamically; the input
+#             data are float32 and cast by the first layer.  --precision
+#             float32 selects the full precision policy.
+#             The policy is logged and appended to the platform name.
+#             --threads limits the intra-op and inter-op thread pools of
+#             TensorFlow to N threads each and --affinity additionally pins
+#             the process to N cores; the thread count is appended to the
+#             platform name of the log as well.  --batch-size and --epochs
+#             override the batch size and number of epochs of the module and
+#             are appended to the platform name, too.  runSuite.py runs whole
+#             matrices of benchmarks with this script and sweep.py runs one
+#             benchmark over a range of thread counts or batch sizes.
+#             During every test run, the memory usage is sampled every S
+#             seconds (0.5 by default, 0 disables sampling) and the peak
+#             memory of the data preparation, training and evaluation phases
+#             is logged; the full time series goes into the result records.
+#             The same holds for the load of every CPU core and the GPU, whose
+#             time series of all measured runs is also written to
+#             <log name>.utilization.csv for plotting.  With --inference,
+#             the latency distribution and throughput of predictions of the
+#             trained network of the last run are measured for single samples
+#             and small batches (1, 8, 32 and 128 by default, see
+#             inferenceBenchmark.py) and logged.  With --save-model, the
+#             weights of the trained network of the last run are stored as
+#             described in modelStore.py, and with --evaluate-only, the
+#             stored weights are loaded into the network instead of training
+#             it, so that only the evaluation and the inference are measured,
+#             e.g. on a slow device with weights trained on a fast host.
+#             Evaluate-only runs append _eval to the platform name.  With
+#             --quantize, the trained network of the last run is converted
+#             into TensorFlow Lite models without quantization, with dynamic
+#             range and with full integer quantization, and the size, the
+#             single-sample latency (measured as often as given with
+#             --inference-repeat and --inference-warmup) and the accuracy on
+#             the test samples of every model are logged (see
+#             quantization.py).  With --synthetic, the benchmarks run with
+#             random data of the shapes, sizes and label cardinalities of
+#             their datasets instead of the datasets, which measures the
+#             model alone and runs without the data (see syntheticData.py);
+#             _synthetic is appended to the platform name.  The log and the
+#             result record of the last run break the wall time of the whole
+#             benchmark down into phases from the start of the interpreter to
+#             the writing of the log (see phaseTimer.py).  The hardware is
+#             described as explained in hardwareInfo.py, whose CPU detection is
+#             cached until the next boot unless --refresh-hardware is given.
+#             In a container with a CPU quota, the thread pools of TensorFlow
+#             are limited to the effective number of cores unless --threads
+#             is given; the platform name is not changed by that.  With
+#             --trace, the data preparation, the input pipelines, the epochs
+#             and batches of the training and the evaluation of every
+#             measured run are recorded as spans and written to
+#             <log name>.run<N>.trace.json, which chrome://tracing and
+#             Perfetto show as a timeline (see spanTracer.py).  With
+#             --profile [E:]F-L, the TensorFlow profiler captures the training
+#             steps F to L of epoch E (1 by default) of the last measured run
+#             into the directory <log name>.profile, which TensorBoard opens,
+#             and the log lists the N operation types with the highest self
+#             time (20 by default, --profile-top) and the time of the input
+#             pipeline (see profileCapture.py).  The profiler slows the
+#             captured steps down, which the times of that run include.
 #
 # @par Comments
 #             The Python functions that this benchmark wrapper runs are supposed
 #             to be self-contained and only use the datatype for the
-#             measurements as an input and to produce a tuple consisting of
+#             measurements and a list of Keras callbacks to pass on to the
+#             training as an input and to produce a tuple consisting of
 #             training size, test size, training time, test time, test accuracy,
-#             and the trained network model as an output.  The Python scripts
+#             and the trained network model as an output.  A module may
+#             declare its batch size in a module-level variable batchSize,
+#             which is used to compute throughputs, and a function
+#             sampleData() returning preprocessed test samples, which is used
+#             to measure the inference.  Further options of a
+#             test run are passed as keyword arguments, but only if they are
+#             given on the command line, so modules need to accept only those
+#             options that make sense for them.  The Python scripts
 #             are expected to reside in the same directory as this script.  The
 #             logs will be placed in a parallel logs sub-directory, which is
 #             expected to exist and be writeable. Since data that the scripts
@@ -38,7 +149,7 @@
 #
 # Known Bugs: none
 #
-# @author     Ekkehard Blanz <Ekkehard.Blanz@gmail.com> (C) 2019-2021
+# @author     Ekkehard Blanz <Ekkehard.Blanz@gmail.com> (C) 2019-2026
 #
 # @copyright  See COPYING file that comes with this distribution
 #
@@ -52,19 +163,65 @@
 #   Wed Jun 30 2021 | Ekkehard Blanz | added Mac M1 support and call to
 #                   |                | mlcompute.set_mlc_device()
 #   Thu Aug 19 2021 | Ekkehard Blanz | caught exception from missing mlcompute
+#   Sat Oct 17 2026 | Ekkehard Blanz | added --repeat and --warmup options
+#   Sat Oct 17 2026 | Ekkehard Blanz | added per-epoch and per-batch timing
+#   Sat Oct 17 2026 | Ekkehard Blanz | added machine-readable result records
+#   Sat Oct 17 2026 | Ekkehard Blanz | added --sparse option
+#   Sat Oct 17 2026 | Ekkehard Blanz | added --image-cache option
+#   Sat Oct 17 2026 | Ekkehard Blanz | added --pipeline and --pipeline-cache
+#                   |                | options
+#   Sat Oct 17 2026 | Ekkehard Blanz | added --dtype option
+#   Sat Oct 17 2026 | Ekkehard Blanz | added --threads and --affinity options
+#   Sat Oct 17 2026 | Ekkehard Blanz | added --batch-size and --epochs options
+#                   |                | and peak memory
+#   Sat Oct 17 2026 | Ekkehard Blanz | added memory sampling
+#   Sat Oct 17 2026 | Ekkehard Blanz | added CPU and GPU utilization sampling
+#   Sat Oct 17 2026 | Ekkehard Blanz | added inference latency measurement
+#   Sat Oct 17 2026 | Ekkehard Blanz | added --save-model and --evaluate-only
+#                   |                | options
+#   Sat Oct 17 2026 | Ekkehard Blanz | added --precision option
+#   Sat Oct 17 2026 | Ekkehard Blanz | added --quantize option
+#   Sat Oct 17 2026 | Ekkehard Blanz | added --synthetic option
+#   Sat Oct 17 2026 | Ekkehard Blanz | added phase breakdown and deferred
+#                   |                | imports
+#   Sat Oct 17 2026 | Ekkehard Blanz | added cached hardware fingerprint and
+#                   |                | thread pools limited to the effective
+#                   |                | cores
+#   Sat Oct 17 2026 | Ekkehard Blanz | added --trace option
+#   Sat Oct 17 2026 | Ekkehard Blanz | added --profile option
+#   Sat Oct 17 2026 | Ekkehard Blanz | added --manifest option
 #                   |                |
 
+import time
+scriptStart = time.time()
+
 import sys
 import os
+import shutil
+import argparse
+import importlib
+import inspect
 
-import cpuinfo
 import psutil
-import tensorflow as tf
 try:
-    from tensorflow.python.compiler.mlcompute import mlcompute
-    haveMlcompute = True
+    import resource
+    haveResource = True
 except ModuleNotFoundError:
-    haveMlcompute = False
+    haveResource = False
+
+import runStatistics
+import resultRecord
+import modelStore
+import hardwareInfo
+import phaseTimer
+import spanTracer
+
+# only light modules are imported up to here, the framework, cpuinfo and the
+# benchmark module are imported in the phases that need them, so that their
+# time is measured and --help does not wait for them
+phaseTimer.timer.add( "interpreterStart",
+                      scriptStart - psutil.Process().create_time() )
+phaseTimer.begin( "argumentParsing" )
 
 
 log = ""
@@ -76,85 +233,530 @@ def addSummary( line ):
     return
 
 
-# take care of the idiosyncrasies of the different architectures
-info = cpuinfo.get_cpu_info()
-try:
-    vendor = info["vendor_id"]
-    arch = info["arch"]
-    brand = info["brand"]
-    freqAdvertised = info["hz_advertised"]
-    if arch == "ARM_8":
-        vendor = "NVIDIA"
-        hasGPU = True
-        dtype = "float16"
-    else:
-        hasGPU = False
-        dtype = "float32"
-except KeyError:
-    # Apple and Raspberry Pi don't have vendor_id key
+def formatStatistics( label, stats, scale=1 ):
+    """!
+    @brief Format one line of the statistics table of repeated runs.
+    @param label label of the line
+    @param stats statistics as returned by runStatistics.summarize() or None
+    @param scale factor to apply to all values
+    @return formatted line or an empty string if stats is None
+    """
+    if stats is None:
+        return ""
+    return "{0:18s}{1:8.3f} {2:8.3f} {3:8.3f} {4:8.3f} {5:8.3f}\n".format(
+        label, stats["mean"] * scale, stats["median"] * scale,
+        stats["stddev"] * scale, stats["min"] * scale, stats["ci95"] * scale )
+
+
+def restoreWeights( network, runCallbacks ):
+    """!
+    @brief Load the stored weights of the benchmark module into a network
+           instead of training it.
+
+    The callbacks of the test run see an empty training, so that the phase
+    samplers switch to the evaluation phase.  The program is terminated if
+    no weights are stored for the network.
+    @param network compiled Keras model
+    @param runCallbacks list of Keras callbacks of the test run
+    """
+    global weightsFile
+    phaseTimer.begin( "weightsLoad" )
     try:
-        vendor = info["brand_raw"][0:5]
-        arch = info["brand_raw"][6:]
-        brand = info["brand_raw"]
-        freqAdvertised = "??? Hz" # not available on M1
-        hasGPU = True
-        dtype = "float32"
-    except KeyError:
-        # this may be a stretch - but it works in my setting where RPi is the
-        # only one that has neither vendor_id nor the brand_raw key set
-        vendor = "RaspberryPi"
-        arch = info["arch"]
-        brand = info["brand"]
-        freqAdvertised = info["hz_advertised"]
-        hasGPU = False
-        dtype = "float32"
+        weightsFile = modelStore.loadWeights( moduleName, network, dtype )
+    except FileNotFoundError as e:
+        print( "ERROR:", e )
+        print( "Run without --evaluate-only and with --save-model first" )
+        sys.exit( 1 )
+    for callback in runCallbacks:
+        callback.on_train_begin()
+        callback.on_train_end()
+
+
+def peakMemory():
+    """!
+    @brief Return the peak resident set size of this process so far.
+    @return peak resident set size in bytes or None if it is not available
+    """
+    if not haveResource:
+        return None
+    peak = resource.getrusage( resource.RUSAGE_SELF ).ru_maxrss
+    # macOS reports bytes, Linux kB
+    return peak if sys.platform == "darwin" else peak * 1024
+
 
 # parse command line arguments
 
-if len( sys.argv ) < 2:
-    print( "benchmark requires the script to be benchmarked as argument" )
-    sys.exit( 1 )
-moduleName = sys.argv[1]
+parser = argparse.ArgumentParser(
+    description="Run a benchmark module and log the results." )
+parser.add_argument( "module", help="benchmark module to run" )
+parser.add_argument( "extra", nargs="*", metavar="exp. number | mlc device",
+                     help="number of the experiment and/or mlc device "
+                          "(cpu, gpu or any) in arbitrary sequence" )
+parser.add_argument( "--repeat", type=int, default=1, metavar="N",
+                     help="number of measured runs (default: 1)" )
+parser.add_argument( "--warmup", type=int, default=0, metavar="K",
+                     help="number of additional runs before the measured "
+                          "ones, which are discarded (default: 0)" )
+parser.add_argument( "--sparse", action="store_true",
+                     help="keep multi-hot encoded input data sparse" )
+parser.add_argument( "--image-cache", action="store_true",
+                     help="decode images only once into the dataset cache" )
+# the modes of inputPipeline.py, which imports TensorFlow
+parser.add_argument( "--pipeline", choices=["generator", "tfdata"],
+                     default=None,
+                     help="input pipeline of generator-based benchmarks "
+                          "(default: generator)" )
+parser.add_argument( "--pipeline-cache", action="store_true",
+                     help="cache decoded data in the tf.data pipeline" )
+parser.add_argument( "--manifest", default=None, metavar="FILE",
+                     help="file the split of the dataset is read from or "
+                          "written to" )
+parser.add_argument( "--synthetic", action="store_true",
+                     help="use random data instead of the dataset" )
+parser.add_argument( "--dtype", default=None,
+                     choices=["float16", "float32", "float64"],
+                     help="floating-point precision of the data (default: "
+                          "depends on the platform)" )
+parser.add_argument( "--precision", default=None,
+                     choices=["float32", "float16", "bfloat16"],
+                     help="precision of the layers, float16 and bfloat16 "
+                          "select a mixed precision policy (default: the "
+                          "one of the data)" )
+parser.add_argument( "--threads", type=int, default=None, metavar="N",
+                     help="number of threads of the intra-op and inter-op "
+                          "thread pools of TensorFlow (default: TensorFlow "
+                          "decides)" )
+parser.add_argument( "--batch-size", type=int, default=None, metavar="B",
+                     help="batch size (default: the one of the module)" )
+parser.add_argument( "--epochs", type=int, default=None, metavar="E",
+                     help="number of training epochs (default: the one of "
+                          "the module)" )
+parser.add_argument( "--memory-interval", type=float, default=0.5,
+                     metavar="S",
+                     help="interval of the memory samples in seconds, 0 to "
+                          "disable sampling (default: 0.5)" )
+parser.add_argument( "--utilization-interval", type=float, default=0.5,
+                     metavar="S",
+                     help="interval of the CPU and GPU load samples in "
+                          "seconds, 0 to disable sampling (default: 0.5)" )
+parser.add_argument( "--inference", action="store_true",
+                     help="measure the inference latency and throughput of "
+                          "the trained network" )
+parser.add_argument( "--inference-batch-sizes", default=None,
+                     metavar="<list>",
+                     help="comma-separated batch sizes of the inference "
+                          "measurement (default: 1,8,32,128 as given in "
+                          "inferenceBenchmark.py)" )
+parser.add_argument( "--inference-repeat", type=int, default=100, metavar="N",
+                     help="number of measured batches per batch size "
+                          "(default: 100)" )
+parser.add_argument( "--inference-warmup", type=int, default=10, metavar="K",
+                     help="number of warm-up batches per batch size "
+                          "(default: 10)" )
+parser.add_argument( "--quantize", action="store_true",
+                     help="compare the trained network with its quantized "
+                          "TensorFlow Lite models" )
+group = parser.add_mutually_exclusive_group()
+group.add_argument( "--save-model", action="store_true",
+                    help="store the weights of the trained network" )
+group.add_argument( "--evaluate-only", action="store_true",
+                    help="load stored weights instead of training the "
+                         "network" )
+parser.add_argument( "--trace", action="store_true",
+                     help="write a Chrome trace of the data preparation and "
+                          "training of every measured run" )
+parser.add_argument( "--profile", default=None, metavar="<steps>",
+                     help="capture a TensorFlow profile of the training steps "
+                          "F to L of epoch E of the last run, given as "
+                          "[E:]F-L counted from 1" )
+parser.add_argument( "--profile-top", type=int, default=None, metavar="N",
+                     help="number of operation types of the profile summary "
+                          "(default: 20 as given in profileCapture.py)" )
+parser.add_argument( "--refresh-hardware", action="store_true",
+                     help="detect the CPU again instead of using the cached "
+                          "description" )
+parser.add_argument( "--affinity", action="store_true",
+                     help="pin the process to as many cores as given with "
+                          "--threads (Linux only)" )
+args = parser.parse_args()
+
+if len( args.extra ) > 2:
+    parser.error( "at most an experiment number and a device can be given" )
+if args.repeat < 1 or args.warmup < 0:
+    parser.error( "--repeat must be positive and --warmup non-negative" )
+if args.threads is not None and args.threads < 1:
+    parser.error( "--threads must be positive" )
+if ( args.batch_size is not None and args.batch_size < 1 ) or \
+   ( args.epochs is not None and args.epochs < 1 ):
+    parser.error( "--batch-size and --epochs must be positive" )
+if args.affinity and args.threads is None:
+    parser.error( "--affinity requires --threads" )
+if args.dtype is not None and args.precision is not None:
+    parser.error( "--dtype and --precision are mutually exclusive" )
+if args.evaluate_only and args.epochs is not None:
+    parser.error( "--epochs cannot be used with --evaluate-only" )
+if args.evaluate_only and args.profile is not None:
+    parser.error( "--profile cannot be used with --evaluate-only" )
+if args.profile_top is not None and args.profile_top < 1:
+    parser.error( "--profile-top must be positive" )
+# the default batch sizes are filled in when inferenceBenchmark is imported
+inferenceBatchSizes = None
+if args.inference_batch_sizes is not None:
+    try:
+        inferenceBatchSizes = [int( b ) for b in
+                               args.inference_batch_sizes.split( "," )]
+    except ValueError:
+        parser.error( "--inference-batch-sizes must be a comma-separated "
+                      "list of numbers" )
+if ( inferenceBatchSizes is not None and min( inferenceBatchSizes ) < 1 ) or \
+   args.inference_repeat < 1 or args.inference_warmup < 0:
+    parser.error( "--inference-batch-sizes and --inference-repeat must be "
+                  "positive and --inference-warmup non-negative" )
+
+phaseTimer.begin( "frameworkImport" )
+import tensorflow as tf
+from keras import backend
+try:
+    from tensorflow.python.compiler.mlcompute import mlcompute
+    haveMlcompute = True
+except ModuleNotFoundError:
+    haveMlcompute = False
+try:
+    from keras import mixed_precision
+    haveMixedPrecision = True
+except ImportError:
+    haveMixedPrecision = False
+
+from timingCallback import TimingCallback, PhaseCallback, TraceCallback
+from memorySampler import MemorySampler
+from utilizationSampler import UtilizationSampler, writeCsv
+
+# the CPU description is cached, the limits of the container are read anew -
+# the vendor, architecture, brand, frequency, GPU and default precision are
+# determined as ever, since they make up the platform name of the log
+phaseTimer.begin( "hardwareDetection" )
+hardware = hardwareInfo.fingerprint( args.refresh_hardware )
+vendor = hardware["vendor"]
+arch = hardware["arch"]
+brand = hardware["brand"]
+freqAdvertised = hardware["frequency"]
+hasGPU = hardware["hasGPU"]
+dtype = hardware["dtype"]
+
+# the thread pools can only be configured before TensorFlow is initialized;
+# TensorFlow sizes them for all cores of the machine by default, which
+# oversubscribes a container with a CPU quota, so they are limited to the
+# effective number of cores unless --threads is given
+threads = {"intraOp": None, "interOp": None, "affinity": None}
+poolThreads = args.threads
+if poolThreads is None and hardware["effectiveCores"] < hardware["cores"]:
+    poolThreads = hardware["effectiveCores"]
+if poolThreads is not None:
+    tf.config.threading.set_intra_op_parallelism_threads( poolThreads )
+    tf.config.threading.set_inter_op_parallelism_threads( poolThreads )
+    threads["intraOp"] = poolThreads
+    threads["interOp"] = poolThreads
+if args.affinity:
+    if not hasattr( os, "sched_setaffinity" ):
+        print( "ERROR: --affinity is not supported on this system" )
+        sys.exit( 1 )
+    cores = sorted( os.sched_getaffinity( 0 ) )[:args.threads]
+    os.sched_setaffinity( 0, cores )
+    threads["affinity"] = cores
+
+moduleName = args.module
 if moduleName.endswith( ".py" ):
     moduleName = moduleName[:-3]
 
 addOn = ""
+experiment = None
 deviceName = "any"
-if len( sys.argv ) > 2:
-    try:
-        addOn = "_" + str( int( sys.argv[2] ) )
-    except ValueError:
-        if hasGPU:
-            deviceName = sys.argv[2].lower()
-
-if len( sys.argv ) > 3:
+platform = vendor + arch
+for arg in args.extra:
     try:
-        addOn = "_" + str( int( sys.argv[3] ) )
+        experiment = int( arg )
+        addOn = "_" + str( experiment )
     except ValueError:
         if hasGPU:
-            deviceName = sys.argv[3].lower()
+            deviceName = arg.lower()
 
 if hasGPU:
     if deviceName in ["gpu", "cpu", "any"]:
         if haveMlcompute:
             mlcompute.set_mlc_device( device_name=deviceName )
-            addOn = "_" + deviceName + addOn
+            platform += "_" + deviceName
     else:
-        print( "ERROR: Wrong command line argument: ", sys.argv[3] )
+        print( "ERROR: Wrong command line argument: ", deviceName )
+        sys.exit( 1 )
+
+# an explicitly given precision becomes part of the platform name, so that its
+# logs do not overwrite the ones of the default precision of the platform
+if args.dtype is not None:
+    dtype = args.dtype
+    platform += "_" + dtype
+
+# a precision policy applies to all layers that are built after it is set;
+# the input data stay float32, which also holds word indices beyond 2048
+# exactly, and are cast to the compute precision by the first layer
+precision = {"policy": None,
+             "computeDtype": None,
+             "variableDtype": None,
+             "lossScaling": None}
+if args.precision is not None:
+    if not haveMixedPrecision:
+        print( "ERROR: this Keras version does not support precision "
+               "policies" )
+        sys.exit( 1 )
+    if args.precision == "float32":
+        policy = mixed_precision.Policy( "float32" )
+    else:
+        policy = mixed_precision.Policy( "mixed_" + args.precision )
+    mixed_precision.set_global_policy( policy )
+    dtype = "float32"
+    precision["policy"] = policy.name
+    precision["computeDtype"] = policy.compute_dtype
+    precision["variableDtype"] = policy.variable_dtype
+    platform += "_" + policy.name
+# the same holds for an explicitly given number of threads, batch size and
+# number of epochs
+if args.threads is not None:
+    platform += "_t" + str( args.threads )
+if args.batch_size is not None:
+    platform += "_b" + str( args.batch_size )
+if args.epochs is not None:
+    platform += "_e" + str( args.epochs )
+if args.evaluate_only:
+    platform += "_eval"
+if args.synthetic:
+    platform += "_synthetic"
+
+phaseTimer.begin( "moduleImport" )
+module = importlib.import_module( moduleName )
+testRun = module.testRun
+if args.inference:
+    import inferenceBenchmark
+    if inferenceBatchSizes is None:
+        inferenceBatchSizes = inferenceBenchmark.defaultBatchSizes
+if args.quantize:
+    import quantization
+if args.profile is not None:
+    import profileCapture
+    try:
+        profileEpoch, profileFirst, profileLast = \
+            profileCapture.parseStepRange( args.profile )
+    except ValueError as e:
+        parser.error( "--profile: " + str( e ) )
+    profileTop = args.profile_top or profileCapture.defaultTop
+
+# options for the test run - only options that are given are passed on, so a
+# module has to support an option only if it is actually used
+runOptions = {}
+if args.sparse:
+    runOptions["sparse"] = True
+if args.image_cache:
+    runOptions["imageCache"] = True
+if args.pipeline is not None:
+    runOptions["pipeline"] = args.pipeline
+if args.pipeline_cache:
+    runOptions["pipelineCache"] = True
+if args.manifest is not None:
+    runOptions["manifest"] = os.path.abspath( args.manifest )
+if args.synthetic:
+    runOptions["synthetic"] = True
+if args.batch_size is not None:
+    runOptions["batchSize"] = args.batch_size
+if args.epochs is not None:
+    runOptions["epochs"] = args.epochs
+supportedOptions = inspect.signature( testRun ).parameters
+for option in runOptions:
+    if option not in supportedOptions:
+        print( "ERROR: " + moduleName + " does not support the option",
+               option )
         sys.exit( 1 )
+# the input pipeline is always logged, so that runs with the default pipeline
+# can be told apart from runs with the tf.data pipeline
+if "pipeline" in supportedOptions and "pipeline" not in runOptions:
+    runOptions["pipeline"] = supportedOptions["pipeline"].default
+if args.evaluate_only and "loadWeights" not in supportedOptions:
+    print( "ERROR: " + moduleName + " does not support loading stored "
+           "weights" )
+    sys.exit( 1 )
+if ( args.inference or args.quantize ) and \
+   not hasattr( module, "sampleData" ):
+    print( "ERROR: " + moduleName + " does not provide sample data for the "
+           "inference measurement" )
+    sys.exit( 1 )
+if args.quantize and runOptions.get( "sparse" ):
+    print( "ERROR: TensorFlow Lite models do not support sparse input" )
+    sys.exit( 1 )
+
+weightsFile = None
+
+filename = "../logs/" + moduleName + "." + platform + addOn + ".log"
 
-exec( "from " + moduleName + " import testRun" )
+# run the warm-up runs first and discard their results - each run builds a
+# fresh model, the session is cleared in between to release the old ones
+results = []
+timings = []
+peaks = []
+samplers = []
+utilizations = []
+traceFiles = []
+profiler = None
+for run in range( args.warmup + args.repeat ):
+    if run > 0:
+        backend.clear_session()
+    timing = TimingCallback( runOptions.get( "batchSize",
+                                             getattr( module, "batchSize",
+                                                      None ) ) )
+    runCallbacks = [timing, PhaseCallback()]
+    if args.trace:
+        spanTracer.enable()
+        runCallbacks.append( TraceCallback() )
+    # the profile is captured in the last run only
+    if args.profile is not None and run == args.warmup + args.repeat - 1:
+        profileDir = os.path.splitext( filename )[0] + ".profile"
+        shutil.rmtree( profileDir, ignore_errors=True )
+        profiler = profileCapture.ProfilerCallback( profileDir, profileEpoch,
+                                                    profileFirst,
+                                                    profileLast )
+        runCallbacks.append( profiler )
+    sampler = None
+    if args.memory_interval > 0:
+        sampler = MemorySampler( args.memory_interval )
+        runCallbacks.append( sampler )
+        sampler.start()
+    utilization = None
+    if args.utilization_interval > 0:
+        utilization = UtilizationSampler( args.utilization_interval )
+        runCallbacks.append( utilization )
+        utilization.start()
+    # the weights are loaded by a function rather than an option, so they are
+    # not part of the options that are logged
+    weightsOption = {}
+    if args.evaluate_only:
+        weightsOption["loadWeights"] = \
+            lambda network: restoreWeights( network, runCallbacks )
+    # the test run begins its preprocessing and modelBuild phases itself
+    phaseTimer.begin( "datasetLoad" )
+    with spanTracer.span( "testRun", run=run ):
+        result = testRun( dtype, callbacks=runCallbacks, **runOptions,
+                          **weightsOption )
+    if sampler is not None:
+        sampler.stop()
+    if utilization is not None:
+        utilization.stop()
+    if run >= args.warmup:
+        results.append( result )
+        timings.append( timing )
+        peaks.append( peakMemory() )
+        samplers.append( sampler )
+        utilizations.append( utilization )
+        if args.trace:
+            traceFile = "{0}.run{1}.trace.json".format(
+                os.path.splitext( filename )[0], run - args.warmup )
+            spanTracer.writeTrace( traceFile, {"module": moduleName,
+                                               "platform": platform,
+                                               "run": run - args.warmup} )
+            traceFiles.append( traceFile )
+spanTracer.disable()
 
 trainingSize, testSize, trainingTime, testTime, testAccuracy, network = \
-    testRun( dtype )
+    results[-1]
+
+# Keras wraps the optimizer of float16 models for dynamic loss scaling
+if args.precision is not None:
+    precision["lossScaling"] = isinstance( network.optimizer,
+                                           mixed_precision.LossScaleOptimizer )
+
+profile = None
+if profiler is not None:
+    phaseTimer.begin( "profileSummary" )
+    profile = {"directory": profileDir,
+               "epoch": profileEpoch,
+               "first": profileFirst,
+               "last": profileLast,
+               "capturedSteps": profiler.capturedSteps,
+               "summary": profileCapture.summarize( profileDir, profileTop )}
+
+if args.save_model:
+    phaseTimer.begin( "weightsSave" )
+    weightsFile = modelStore.saveWeights( moduleName, network, dtype )
+
+# the inference is measured with the network of the last run only, its
+# samples are prepared with the same options as the test run
+inference = None
+quantized = None
+if args.inference or args.quantize:
+    phaseTimer.begin( "inference" )
+    sampleOptions = {option: value for option, value in runOptions.items()
+                     if option in
+                     inspect.signature( module.sampleData ).parameters}
+if args.inference:
+    samples, _ = module.sampleData(
+        dtype, "test",
+        max( inferenceBatchSizes ) * inferenceBenchmark.poolBatches,
+        **sampleOptions )
+    inference = inferenceBenchmark.measure( network, samples,
+                                            inferenceBatchSizes,
+                                            args.inference_repeat,
+                                            args.inference_warmup )
+# the quantized models are compared on all test samples the module provides
+if args.quantize:
+    samples, labels = module.sampleData( dtype, "test", **sampleOptions )
+    representative, _ = module.sampleData(
+        dtype, "train", quantization.representativeSamples, **sampleOptions )
+    quantized = quantization.compare( network, samples, labels,
+                                      representative, threads["intraOp"],
+                                      args.inference_repeat,
+                                      args.inference_warmup )
+
+# the log cannot contain the time of writing it, which only goes into the
+# result records
+phaseTimer.begin( "logWriting" )
+trainingStats = runStatistics.summarize( [r[2] for r in results] )
+testStats = runStatistics.summarize( [r[3] for r in results] )
+accuracyStats = runStatistics.summarize( [r[4] for r in results] )
+throughputStats = runStatistics.summarize(
+    [t.summary( r[0] )["steadyStateThroughput"]
+     for t, r in zip( timings, results )] )
+if args.repeat > 1:
+    trainingTime = trainingStats["mean"]
+    if testStats is not None:
+        testTime = testStats["mean"]
+    if accuracyStats is not None:
+        testAccuracy = accuracyStats["mean"]
 
 log += "Running " + moduleName + " on " + brand + ", "
-log += "{0} bits\n".format( info["bits"] )
-log += "with {0} cores, ".format( os.cpu_count() )
+log += "{0} bits\n".format( hardware["bits"] )
+log += "with {0} cores, ".format( hardware["cores"] )
 log += "running at " + freqAdvertised + "\n"
+if hardware["effectiveCores"] < hardware["cores"]:
+    log += "Effective cores: {0} ({1} available".format(
+        hardware["effectiveCores"], hardware["availableCores"] )
+    if hardware["cpuQuota"] is not None:
+        log += ", CPU quota {0:.2f} cores".format( hardware["cpuQuota"] )
+    log += ")\n"
+if hardware["isa"]:
+    log += "Instruction set extensions: " + ", ".join( hardware["isa"] ) + \
+           "\n"
+if len( hardware["numaNodes"] ) > 1:
+    log += "NUMA nodes: {0} with {1} cores\n".format(
+        len( hardware["numaNodes"] ),
+        ", ".join( str( len( node ) ) for node in hardware["numaNodes"] ) )
 log += "Installed memory: " \
-       "{0} GB\n".format( round( psutil.virtual_memory().total / 1024**3 ) )
+       "{0} GB\n".format( round( hardware["memory"] / 1024**3 ) )
+if hardware["memoryLimit"] is not None:
+    log += "Memory limit: {0:.1f} GB\n".format(
+        hardware["memoryLimit"] / 1024**3 )
 log += "Floatingpoint precision: " + dtype + "\n"
+if args.precision is not None:
+    log += "Precision policy: {0} (compute {1}, variables {2}, loss " \
+           "scaling {3})\n".format( precision["policy"],
+                                     precision["computeDtype"],
+                                     precision["variableDtype"],
+                                     "on" if precision["lossScaling"]
+                                     else "off" )
 log += "GPU acceleration is "
 if hasGPU:
     log += "available "
@@ -169,15 +771,58 @@ else:
     log += "not available"
 log += "\nUsing TensorFlow Version "
 log += tf.__version__
-log += "\n\n\n"
+log += "\n"
+if threads["intraOp"] is not None:
+    log += "Thread pools: {0} intra-op, {1} inter-op threads".format(
+        threads["intraOp"], threads["interOp"] )
+    if threads["affinity"] is not None:
+        log += ", pinned to cores " + \
+               ",".join( str( core ) for core in threads["affinity"] )
+    log += "\n"
+if runOptions:
+    log += "Test run options: "
+    log += ", ".join( "{0}={1}".format( option, value )
+                      for option, value in runOptions.items() )
+    log += "\n"
+if args.evaluate_only:
+    log += "Weights loaded from: " + weightsFile + "\n"
+elif args.save_model:
+    log += "Weights saved to: " + weightsFile + "\n"
+if traceFiles:
+    log += "Traces written to: " + ", ".join( traceFiles ) + "\n"
+log += "\n\n"
 
 log += "Training size: {0:7d} samples\n".format( trainingSize )
 log += "Test size:     {0:7d} samples\n".format( testSize )
 log += "Training time: {0:7.3f} s\n".format( trainingTime )
 log += "Test time:     {0:7.3f} s\n".format( testTime )
+if peaks[-1] is not None:
+    log += "Peak memory:   {0:7.0f} MB\n".format( peaks[-1] / 1024**2 )
 if testAccuracy is not None:
     log += "Classification accuracy on test data: " \
         "{0:4.2f} %\n".format( testAccuracy * 100 )
+if args.repeat > 1:
+    log += "\nStatistics over {0} runs ".format( args.repeat )
+    log += "({0} warm-up runs discarded):\n".format( args.warmup )
+    log += "                    mean   median   stddev      min   95% CI\n"
+    log += formatStatistics( "Training time [s]:", trainingStats )
+    log += formatStatistics( "Test time [s]:", testStats )
+    log += formatStatistics( "Accuracy [%]:", accuracyStats, 100 )
+    log += formatStatistics( "Samples/s:", throughputStats )
+timingReport = timings[-1].report( trainingSize )
+if timingReport:
+    log += "\n" + timingReport
+if samplers[-1] is not None:
+    log += "\n" + samplers[-1].report()
+if utilizations[-1] is not None:
+    log += "\n" + utilizations[-1].report()
+if inference is not None:
+    log += "\n" + inferenceBenchmark.report( inference )
+if quantized is not None:
+    log += "\n" + quantization.report( quantized )
+if profile is not None:
+    log += "\n" + profileCapture.report( profile )
+log += "\n" + phaseTimer.timer.report()
 log += "\n\nNet architecture:\n"
 log += "Input Shape:  {0}\n\n".format( network.input_shape )
 network.summary( print_fn=addSummary )
@@ -186,12 +831,72 @@ print( "\n\n\n" )
 print( log )
 print( "\n" )
 
-filename = "../logs/" + moduleName + "." + vendor + arch + \
-           addOn + ".log"
-
 print( "Writing to filename: ", filename )
 f = open( filename, "w" )
 f.write( log )
 f.close()
+phaseTimer.timer.end()
+phases = phaseTimer.timer.summary()
+
+# write a machine-readable record of every measured run next to the log
+trainableParameters = int( sum( backend.count_params( weight )
+                                for weight in network.trainable_weights ) )
+records = []
+for run, (result, timing, peak, sampler, utilization) in enumerate(
+        zip( results, timings, peaks, samplers, utilizations ) ):
+    memory = {"peakRSS": peak}
+    if sampler is not None:
+        memory.update( sampler.summary() )
+    records.append( resultRecord.makeRecord(
+        module=moduleName,
+        platform=platform,
+        experiment=experiment,
+        run=run,
+        repeat=args.repeat,
+        warmup=args.warmup,
+        hardware={"brand": brand,
+                  "bits": hardware["bits"],
+                  "cores": hardware["cores"],
+                  "frequency": freqAdvertised,
+                  "memoryGB": round( hardware["memory"] / 1024**3 ),
+                  "gpuAvailable": hasGPU,
+                  "effectiveCores": hardware["effectiveCores"],
+                  "cpuQuota": hardware["cpuQuota"],
+                  "memoryLimit": hardware["memoryLimit"],
+                  "isa": hardware["isa"],
+                  "numaNodes": hardware["numaNodes"]},
+        device=deviceName if hasGPU else None,
+        dtype=dtype,
+        tfVersion=tf.__version__,
+        threads=threads,
+        precision=precision,
+        memory=memory,
+        utilization=None if utilization is None else utilization.summary(),
+        inference=inference if run == args.repeat - 1 else None,
+        quantization=quantized if run == args.repeat - 1 else None,
+        phases=phases if run == args.repeat - 1 else None,
+        weights=None if weightsFile is None else
+                {"file": weightsFile,
+                 "mode": "loaded" if args.evaluate_only else "saved"},
+        trace=traceFiles[run] if traceFiles else None,
+        profile=profile if run == args.repeat - 1 else None,
+        options=runOptions,
+        trainingSize=result[0],
+        testSize=result[1],
+        trainingTime=result[2],
+        testTime=result[3],
+        testAccuracy=None if result[4] is None else float( result[4] ),
+        inputShape=list( network.input_shape ),
+        parameters={"total": network.count_params(),
+                    "trainable": trainableParameters,
+                    "nonTrainable": network.count_params() -
+                                    trainableParameters},
+        epochs=timing.summary( result[0] ) ) )
+if utilizations[-1] is not None:
+    csvName = os.path.splitext( filename )[0] + ".utilization.csv"
+    print( "Writing utilization to: ", csvName )
+    writeCsv( csvName, utilizations )
+print( "Writing records to: ", resultRecord.recordFileName( filename ) )
+resultRecord.writeRecords( resultRecord.recordFileName( filename ), records )
 
 sys.exit( 0 )
@@ -0,0 +1,162 @@
+# Python Implementation: cache of preprocessed datasets
+# -*- coding: utf-8 -*-
+##
+# @file       datasetCache.py
+#
+# @version    1.1.0
+#
+# @par Purpose
+#             Store the final, model-ready arrays of a dataset after all
+#             preprocessing, so that later benchmark runs can memory-map them
+#             instead of loading and preprocessing the dataset again.
+#
+# @par Comments
+#             Every cache entry is a directory in $TEMP/dlBenchmarks/datasets
+#             (or /tmp/dlBenchmarks/datasets) with one .npy file per array.
+#             Its name is derived from the name of the dataset and all
+#             parameters the preprocessing depends on, e.g. the data type.
+#             Entries are written under a temporary name and renamed when they
+#             are complete, so concurrent or interrupted runs never see partial
+#             entries.  The modification time of an entry directory is updated
+#             whenever the entry is used and the least recently used entries
+#             are removed when the cache grows beyond cacheLimit bytes.
+#
+#             This is Python 3 code!
+
+# Known Bugs: none
+#
+# @author     Ekkehard Blanz <Ekkehard.Blanz@gmail.com> (C) 2026
+#
+# @copyright  See COPYING file that comes with this distribution
+#
+# File history:
+#
+#      Date         | Author         | Modification
+#  -----------------+----------------+------------------------------------------
+#   Sat Oct 17 2026 | Ekkehard Blanz | created
+#   Sat Oct 17 2026 | Ekkehard Blanz | added trace spans
+#                   |                |
+
+import os
+import json
+import shutil
+import hashlib
+import numpy as np
+
+import spanTracer
+
+
+# maximum size of all cache entries in bytes
+cacheLimit = 8 * 1024**3
+
+
+def cacheDirectory():
+    """!
+    @brief Return the cache directory, creating it if necessary.
+    @return path of the cache directory
+    """
+    cacheDir = os.path.join( os.getenv( "TEMP", "/tmp" ), "dlBenchmarks",
+                             "datasets" )
+    os.makedirs( cacheDir, exist_ok=True )
+    return cacheDir
+
+
+def entryName( name, parameters ):
+    """!
+    @brief Compute the directory name of a cache entry.
+    @param name name of the dataset
+    @param parameters dictionary of the preprocessing parameters
+    @return directory name
+    """
+    digest = hashlib.sha1( json.dumps( parameters, sort_keys=True ).encode() )
+    return name + "_" + digest.hexdigest()[:16]
+
+
+def entrySize( entryDir ):
+    """!
+    @brief Compute the size of a cache entry.
+    @param entryDir directory of the entry
+    @return size of all files of the entry in bytes
+    """
+    size = 0
+    for fileName in os.listdir( entryDir ):
+        size += os.path.getsize( os.path.join( entryDir, fileName ) )
+    return size
+
+
+def evict( limit=None, keep=None ):
+    """!
+    @brief Remove the least recently used entries until the cache is not
+           larger than limit.
+    @param limit maximum size of the cache in bytes, cacheLimit by default
+    @param keep name of an entry that must not be removed
+    """
+    if limit is None:
+        limit = cacheLimit
+    cacheDir = cacheDirectory()
+    entries = []
+    for fileName in os.listdir( cacheDir ):
+        entryDir = os.path.join( cacheDir, fileName )
+        # skip entries that are still being written
+        if not os.path.isdir( entryDir ) or fileName.startswith( "." ):
+            continue
+        try:
+            entries.append( (os.path.getmtime( entryDir ), entryDir,
+                             entrySize( entryDir )) )
+        except FileNotFoundError:
+            # removed by a concurrent run
+            pass
+
+    total = sum( size for lastUsed, entryDir, size in entries )
+    for lastUsed, entryDir, size in sorted( entries ):
+        if total <= limit:
+            break
+        if os.path.basename( entryDir ) == keep:
+            continue
+        shutil.rmtree( entryDir, ignore_errors=True )
+        total -= size
+
+
+@spanTracer.traced
+def cachedArrays( name, parameters, prepare ):
+    """!
+    @brief Return the preprocessed arrays of a dataset from the cache,
+           preparing and storing them first if they are not cached yet.
+    @param name name of the dataset
+    @param parameters dictionary of all parameters the preprocessing depends
+           on - it must be serializable as JSON
+    @param prepare function without parameters that returns a dictionary of
+           array names to numpy arrays
+    @return dictionary of array names to read-only memory-mapped arrays
+    """
+    cacheDir = cacheDirectory()
+    entry = entryName( name, parameters )
+    entryDir = os.path.join( cacheDir, entry )
+
+    if not os.path.isdir( entryDir ):
+        arrays = prepare()
+        tmpDir = os.path.join( cacheDir,
+                               ".{0}.{1}".format( entry, os.getpid() ) )
+        os.makedirs( tmpDir )
+        for arrayName, array in arrays.items():
+            np.save( os.path.join( tmpDir, arrayName + ".npy" ),
+                     np.asarray( array ) )
+        f = open( os.path.join( tmpDir, "parameters.json" ), "w" )
+        json.dump( {"name": name, "parameters": parameters}, f )
+        f.close()
+        try:
+            os.rename( tmpDir, entryDir )
+        except OSError:
+            # a concurrent run was faster
+            shutil.rmtree( tmpDir, ignore_errors=True )
+        evict( keep=entry )
+    else:
+        # mark the entry as recently used
+        os.utime( entryDir )
+
+    arrays = {}
+    for fileName in os.listdir( entryDir ):
+        if fileName.endswith( ".npy" ):
+            arrays[fileName[:-4]] = np.load( os.path.join( entryDir, fileName ),
+                                             mmap_mode="r" )
+    return arrays
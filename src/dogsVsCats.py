@@ -3,7 +3,7 @@
 ##
 # @file       dogsVsCats.py
 #
-# @version    1.0.0
+# @version    1.13.0
 #
 # @par Purpose
 #             Run the Kaggle dogs vs cats experiment using keras.
@@ -12,11 +12,18 @@
 #             This experiment is also from Chollet's book using 150 by 150 pixel
 #             color JPEG images with a net using convolution layers.
 #
+#             With the imageCache option, the JPEG images are decoded and
+#             resized only once and kept as a uint8 array in the dataset cache
+#             (see datasetCache.py), so that the epochs measure the training
+#             rather than the JPEG decoder.  With the tfdata pipeline option,
+#             the images are decoded and rescaled by a tf.data pipeline in
+#             parallel to the training (see inputPipeline.py).
+#
 #             This is Python 3 code!
 
 # Known Bugs: none
 #
-# @author     Ekkehard Blanz <Ekkehard.Blanz@gmail.com> (C) 2019
+# @author     Ekkehard Blanz <Ekkehard.Blanz@gmail.com> (C) 2019-2026
 #
 # @copyright  See COPYING file that comes with this distribution
 #
@@ -25,37 +32,78 @@
 #      Date         | Author         | Modification
 #  -----------------+----------------+------------------------------------------
 #   Sat Jul 13 2019 | Ekkehard Blanz | converted from Chollet's book
+#   Sat Oct 17 2026 | Ekkehard Blanz | added callbacks parameter and
+#                   |                | module-level batch size
+#   Sat Oct 17 2026 | Ekkehard Blanz | added option to stream decoded images
+#                   |                | from the dataset cache
+#   Sat Oct 17 2026 | Ekkehard Blanz | added tf.data input pipeline option
+#   Sat Oct 17 2026 | Ekkehard Blanz | replaced the symlink tree by an in-memory
+#                   |                | split of the dataset
+#   Sat Oct 17 2026 | Ekkehard Blanz | made batch size and number of epochs
+#                   |                | overridable
+#   Sat Oct 17 2026 | Ekkehard Blanz | added sampleData() for the inference
+#                   |                | measurement
+#   Sat Oct 17 2026 | Ekkehard Blanz | stored weights can replace the training
+#   Sat Oct 17 2026 | Ekkehard Blanz | the output layer computes in float32
+#   Sat Oct 17 2026 | Ekkehard Blanz | added synthetic data
+#   Sat Oct 17 2026 | Ekkehard Blanz | added phase marks
+#   Sat Oct 17 2026 | Ekkehard Blanz | added trace spans
+#   Sat Oct 17 2026 | Ekkehard Blanz | fixed steps for batch sizes that do not
+#                   |                | divide the sample counts
+#   Sat Oct 17 2026 | Ekkehard Blanz | passed the manifest through and checked
+#                   |                | its sizes
 #                   |                |
 
 import os
 import time
-import shutil
-import uuid
+import json
+import hashlib
+import numpy as np
 
 from keras import models
 from keras import layers
 from keras import optimizers
 
-from keras.preprocessing.image import ImageDataGenerator
+from keras.preprocessing.image import load_img
+
+from datasetCache import cachedArrays
+from inputPipeline import checkMode, imageDataset, arrayDataset
+import syntheticData
+import phaseTimer
+import spanTracer
 
-def prepData( originalDatasetDir, size ):
+
+@spanTracer.traced
+def prepData( originalDatasetDir, size, manifest=None ):
     """!
     @brief Prepare the dogs-versus-cats dataset.
 
-    The directory structure that the ImageDataGenerator expects is a directory
-    for each category - this is what this function provides.  Other than the
-    one in Chollet's book, this one creates only symlinks rather than copying
-    half a GB of data around and it creates the new structure in /tmp where
-    everybody has write access.  Lastly, the creation of a validation data set
-    and the test data set are optional and controlled via the tuple parameter
-    size.  At any rate, each set will have exactly as many images from cats as
-    it has from dogs.  If one set cardinality is zero, the corresponding
-    directory name is empty and the directory will not be created.
+    The original Kaggle training directory holds the images cat.<n>.jpg and
+    dog.<n>.jpg.  This function splits them into a training, a validation and
+    a test set without touching the file system: the file names of every set
+    are built in memory and fed to the input pipeline directly.  Other than
+    the one in Chollet's book, this one neither copies nor links any images.
+    The creation of a validation data set and the test data set are optional
+    and controlled via the tuple parameter size.  At any rate, each set will
+    have exactly as many images from cats as it has from dogs.  If one set
+    cardinality is zero, the corresponding set is empty.
+
+    The split can optionally be persisted in a small JSON manifest: if the
+    manifest file exists, the split is read from it, otherwise it is written
+    there, so that later runs use exactly the same images.  The manifest
+    holds the sizes of the sets and is only used for the same sizes.
     @param originalDatasetDir root directory where the Kaggle dataset resides
     @param size tuple with sizes of test, validation and test set
-    @return (base_dir, train_dir, validation_dir, test_dir) tuple
+    @param manifest name of the manifest file or None
+    @return dictionary with the keys train, validation and test, each holding
+            a (fileNames, labels) tuple with the labels 0 for cats and 1 for
+            dogs as flow_from_directory() would assign them
+    @throw ValueError if the manifest was written for other sizes
     """
 
+    if manifest is not None and os.path.isfile( manifest ):
+        return readManifest( manifest, size )
+
     if not os.path.isdir( originalDatasetDir ) or \
        not os.path.isdir( os.path.join( originalDatasetDir, "train" ) ):
         raise ValueError( "Error: Wrong original dataset direcotry specified"
@@ -64,127 +112,267 @@ def prepData( originalDatasetDir, size ):
     original_dataset_dir = os.path.join( os.path.abspath( originalDatasetDir ),
                                          "train" )
 
-    tmpdir = os.getenv( "TEMP", "/tmp" )
-
-    base_dir = os.path.join( tmpdir, str( uuid.uuid4() ) )
-
-    if size[0] + size[1] + size[2] > len( os.listdir( original_dataset_dir ) ):
-        raise ValueError( "Error: Not enough data for size {0}".format( size ) )
-
-    trainSize = size[0] // 2
-    validationSize = size[1] // 2
-    testSize = size[2] // 2
-
-    os.mkdir(base_dir)
-
-    if trainSize:
-        train_dir = os.path.join(base_dir, 'train')
-        os.mkdir(train_dir)
-
-        train_cats_dir = os.path.join(train_dir, 'cats')
-        os.mkdir(train_cats_dir)
-
-        train_dogs_dir = os.path.join(train_dir, 'dogs')
-        os.mkdir(train_dogs_dir)
-    else:
-        train_dir = ""
-
-    if validationSize:
-        validation_dir = os.path.join(base_dir, 'validation')
-        os.mkdir(validation_dir)
-
-        validation_cats_dir = os.path.join(validation_dir, 'cats')
-        os.mkdir(validation_cats_dir)
-
-        validation_dogs_dir = os.path.join(validation_dir, 'dogs')
-        os.mkdir(validation_dogs_dir)
-    else:
-        validation_dir = ""
-
-    if testSize:
-        test_dir = os.path.join(base_dir, 'test')
-        os.mkdir(test_dir)
-
-        test_cats_dir = os.path.join(test_dir, 'cats')
-        os.mkdir(test_cats_dir)
-
-        test_dogs_dir = os.path.join(test_dir, 'dogs')
-        os.mkdir(test_dogs_dir)
-    else:
-        test_dir = ""
-
+    # the images are numbered consecutively, so checking the last image of
+    # each category is enough and avoids listing the 25k files
+    last = (size[0] // 2) + (size[1] // 2) + (size[2] // 2) - 1
+    for category in ("cat", "dog"):
+        if last >= 0 and not os.path.isfile(
+                os.path.join( original_dataset_dir,
+                              "{0}.{1}.jpg".format( category, last ) ) ):
+            raise ValueError( "Error: Not enough data for size "
+                              "{0}".format( size ) )
+
+    index = {}
     last = 0
-    if trainSize:
-        first = last
-        last = first + trainSize
-        fnames = ['cat.{}.jpg'.format(i) for i in range(first, last)]
-        for fname in fnames:
-            src = os.path.join(original_dataset_dir, fname)
-            dst = os.path.join(train_cats_dir, fname)
-            os.symlink(src, dst)
-
-        fnames = ['dog.{}.jpg'.format(i) for i in range(first, last)]
-        for fname in fnames:
-            src = os.path.join(original_dataset_dir, fname)
-            dst = os.path.join(train_dogs_dir, fname)
-            os.symlink(src, dst)
-
-    if validationSize:
+    for name, setSize in zip( ("train", "validation", "test"), size ):
         first = last
-        last = first + validationSize
-        fnames = ['cat.{}.jpg'.format(i) for i in range(first, last)]
-        for fname in fnames:
-            src = os.path.join(original_dataset_dir, fname)
-            dst = os.path.join(validation_cats_dir, fname)
-            os.symlink(src, dst)
-
-        fnames = ['dog.{}.jpg'.format(i) for i in range(first, last)]
-        for fname in fnames:
-            src = os.path.join(original_dataset_dir, fname)
-            dst = os.path.join(validation_dogs_dir, fname)
-            os.symlink(src, dst)
-
-    if testSize:
-        first = last
-        last = first + testSize
-        fnames = ['cat.{}.jpg'.format(i) for i in range(first, last)]
-        for fname in fnames:
-            src = os.path.join(original_dataset_dir, fname)
-            dst = os.path.join(test_cats_dir, fname)
-            os.symlink(src, dst)
+        last = first + setSize // 2
+        fileNames = []
+        labels = []
+        for label, category in enumerate( ("cat", "dog") ):
+            fileNames += [os.path.join( original_dataset_dir,
+                                        "{0}.{1}.jpg".format( category, i ) )
+                          for i in range( first, last )]
+            labels += [label] * (last - first)
+        index[name] = (fileNames, np.array( labels, dtype=np.uint8 ))
 
-        fnames = ['dog.{}.jpg'.format(i) for i in range(first, last)]
-        for fname in fnames:
-            src = os.path.join(original_dataset_dir, fname)
-            dst = os.path.join(test_dogs_dir, fname)
-            os.symlink(src, dst)
+    if manifest is not None:
+        writeManifest( manifest, index, size )
 
-    return (base_dir, train_dir, validation_dir, test_dir)
+    return index
 
 
-def testRun( dtype ):
+def writeManifest( fileName, index, size ):
+    """!
+    @brief Write the split of the dataset as JSON.
+    @param fileName name of the manifest file
+    @param index dictionary as returned by prepData()
+    @param size tuple with the sizes of the sets as passed to prepData()
+    """
+    tmpName = "{0}.{1}".format( fileName, os.getpid() )
+    f = open( tmpName, "w" )
+    json.dump( {"size": list( size ),
+                "sets": {name: {"files": fileNames,
+                                "labels": labels.tolist()}
+                         for name, (fileNames, labels) in index.items()}}, f )
+    f.close()
+    os.replace( tmpName, fileName )
 
-    trainSize = 2000
-    testSize = 1000
-    batchSize = 20
 
-    baseDir, trainDir, validationDir, testDir = prepData(
-        "../../Data/dogs-vs-cats", (trainSize, 0, testSize) )
+def readManifest( fileName, size ):
+    """!
+    @brief Read the split of the dataset written by writeManifest().
+    @param fileName name of the manifest file
+    @param size tuple with the sizes of the sets the split must have
+    @return dictionary as returned by prepData()
+    @throw ValueError if the manifest was written for other sizes
+    """
+    f = open( fileName )
+    manifest = json.load( f )
+    f.close()
+    if manifest.get( "size" ) != list( size ):
+        raise ValueError( "Error: Manifest {0} was written for size {1}, not "
+                          "{2}".format( fileName, manifest.get( "size" ),
+                                        size ) )
+    return {name: (entry["files"], np.array( entry["labels"], dtype=np.uint8 ))
+            for name, entry in manifest["sets"].items()}
+
+
+@spanTracer.traced
+def decodeImages( fileNames, targetSize ):
+    """!
+    @brief Decode and resize images.
+    @param fileNames list of image file names
+    @param targetSize (height, width) tuple
+    @return uint8 array of shape (len( fileNames ), height, width, 3)
+    """
+    images = np.empty( (len( fileNames ), targetSize[0], targetSize[1], 3),
+                       dtype=np.uint8 )
+    for i, fileName in enumerate( fileNames ):
+        images[i] = np.asarray( load_img( fileName, target_size=targetSize ),
+                                dtype=np.uint8 )
+    return images
 
-    datagen = ImageDataGenerator( rescale=1/255, dtype=dtype )
 
-    trainGenerator = datagen.flow_from_directory(
-        trainDir,
-        target_size=(150, 150),
-        batch_size=batchSize,
-        class_mode="binary" )
+@spanTracer.traced
+def cachedImages( index, targetSize ):
+    """!
+    @brief Return the decoded training and test images from the dataset
+           cache, decoding them first if they are not cached yet.
+
+    The cache entry is keyed by the names, sizes and modification times of
+    the source images and by the target size, so a changed selection of
+    images or a changed image results in a new entry.
+    @param index dictionary with the training and test set as returned by
+           prepData()
+    @param targetSize (height, width) tuple
+    @return dictionary with the uint8 arrays trainImages and testImages and
+            the label arrays trainLabels and testLabels
+    """
+    trainFiles, trainLabels = index["train"]
+    testFiles, testLabels = index["test"]
+
+    digest = hashlib.sha1()
+    for fileName in trainFiles + [""] + testFiles:
+        if fileName:
+            stat = os.stat( fileName )
+            digest.update( "{0}:{1}:{2};".format(
+                os.path.basename( fileName ), stat.st_size,
+                stat.st_mtime_ns ).encode() )
+        else:
+            digest.update( b"|" )
+
+    return cachedArrays( "dogsVsCats",
+                         {"files": digest.hexdigest(),
+                          "targetSize": list( targetSize )},
+                         lambda: {"trainImages": decodeImages( trainFiles,
+                                                               targetSize ),
+                                  "trainLabels": trainLabels,
+                                  "testImages": decodeImages( testFiles,
+                                                              targetSize ),
+                                  "testLabels": testLabels} )
+
+
+def imageBatches( images, labels, batchSize, dtype, shuffle=True ):
+    """!
+    @brief Generate batches of images rescaled to [0, 1] in the given dtype.
+    @param images uint8 array of images
+    @param labels array of labels
+    @param batchSize number of images per batch
+    @param dtype data type of the yielded images and labels
+    @param shuffle if True, the images are drawn in a new random order in
+           every pass
+    """
+    scale = np.array( 1/255, dtype=dtype )
+    while True:
+        if shuffle:
+            order = np.random.permutation( len( images ) )
+        else:
+            order = np.arange( len( images ) )
+        for first in range( 0, len( images ), batchSize ):
+            with spanTracer.span( "imageBatches", "data" ):
+                # sorted indices read the memory-mapped images sequentially
+                index = np.sort( order[first:first + batchSize] )
+                batch = (images[index].astype( dtype ) * scale,
+                         labels[index].astype( dtype ))
+            yield batch
+
+
+def fileBatches( fileNames, labels, targetSize, batchSize, dtype,
+                 shuffle=True ):
+    """!
+    @brief Generate batches of images that are decoded from their files and
+           rescaled to [0, 1] in the given dtype.
+
+    This replaces flow_from_directory() of the ImageDataGenerator, which
+    needs the images sorted into one directory per class, and decodes the
+    images in the same way batch by batch.
+    @param fileNames list of image file names
+    @param labels array of labels
+    @param targetSize (height, width) tuple the images are resized to
+    @param batchSize number of images per batch
+    @param dtype data type of the yielded images and labels
+    @param shuffle if True, the images are drawn in a new random order in
+           every pass
+    """
+    scale = np.array( 1/255, dtype=dtype )
+    while True:
+        if shuffle:
+            order = np.random.permutation( len( fileNames ) )
+        else:
+            order = np.arange( len( fileNames ) )
+        for first in range( 0, len( fileNames ), batchSize ):
+            with spanTracer.span( "fileBatches", "data" ):
+                index = order[first:first + batchSize]
+                images = decodeImages( [fileNames[i] for i in index],
+                                       targetSize )
+                batch = (images.astype( dtype ) * scale,
+                         labels[index].astype( dtype ))
+            yield batch
+
+
+# number of samples per batch - benchmark.py uses it to compute throughputs
+batchSize = 20
+
+# number of training epochs
+epochs = 15
+
+# data of synthetic test runs
+syntheticSpec = {"trainSize": 2000,
+                 "testSize": 1000,
+                 "shape": (150, 150, 3),
+                 "inputs": "uniform",
+                 "labels": "binary"}
+
+
+def testRun( dtype, callbacks=None, imageCache=False, pipeline="generator",
+             pipelineCache=False, batchSize=batchSize, epochs=epochs,
+             loadWeights=None, synthetic=False, manifest=None ):
+    """!
+    @param dtype data type of the input data
+    @param callbacks list of Keras callbacks for the training
+    @param imageCache if True, the images are decoded only once into the
+           dataset cache and streamed from there rather than decoded in
+           every epoch
+    @param pipeline input pipeline, "generator" or "tfdata" (see
+           inputPipeline.py)
+    @param pipelineCache if True, the tf.data pipeline keeps the decoded
+           images in memory after the first epoch - this has no effect if the
+           images come from the dataset cache anyway
+    @param batchSize number of samples per batch, the module-level batchSize
+           by default
+    @param epochs number of training epochs, the module-level epochs by
+           default
+    @param loadWeights function that loads stored weights into the compiled
+           network, which is then not trained (see modelStore.py)
+    @param synthetic if True, random images replace the dataset (see
+           syntheticData.py) and imageCache, pipeline, pipelineCache and
+           manifest have no effect
+    @param manifest name of the file the split of the dataset is read from
+           or written to (see prepData()) or None
+    """
 
-    testGenerator = datagen.flow_from_directory(
-        testDir,
-        target_size=(150, 150),
-        batch_size=batchSize,
-        class_mode="binary" )
+    trainSize = 2000
+    testSize = 1000
+    targetSize = (150, 150)
+
+    tfdata = checkMode( pipeline )
+
+    if not synthetic:
+        index = prepData( "../../Data/dogs-vs-cats",
+                          (trainSize, 0, testSize), manifest )
+
+    # images that are not cached are decoded lazily during the training
+    phaseTimer.begin( "preprocessing" )
+    if synthetic:
+        trainGenerator = syntheticData.batches( syntheticSpec, "train",
+                                                batchSize, dtype )
+        testGenerator = syntheticData.batches( syntheticSpec, "test",
+                                               batchSize, dtype )
+    elif imageCache:
+        data = cachedImages( index, targetSize )
+        if tfdata:
+            inputData = arrayDataset
+        else:
+            inputData = imageBatches
+        trainGenerator = inputData( data["trainImages"], data["trainLabels"],
+                                    batchSize, dtype, shuffle=True )
+        testGenerator = inputData( data["testImages"], data["testLabels"],
+                                   batchSize, dtype, shuffle=False )
+    elif tfdata:
+        trainGenerator = imageDataset( *index["train"], targetSize,
+                                       batchSize, dtype, shuffle=True,
+                                       cache=pipelineCache )
+        testGenerator = imageDataset( *index["test"], targetSize,
+                                      batchSize, dtype, shuffle=False,
+                                      cache=pipelineCache )
+    else:
+        trainGenerator = fileBatches( *index["train"], targetSize,
+                                      batchSize, dtype, shuffle=True )
+        testGenerator = fileBatches( *index["test"], targetSize,
+                                     batchSize, dtype, shuffle=False )
 
+    phaseTimer.begin( "modelBuild" )
     network = models.Sequential()
 
     # Note that conv2D layers require a different input_shape parameter than
@@ -207,28 +395,79 @@ def testRun( dtype ):
 
     network.add( layers.Flatten() )
     network.add( layers.Dense( 512, activation="relu" ) )
-    network.add( layers.Dense( 1, activation="sigmoid" ) )
+    # float32 output under mixed precision
+    network.add( layers.Dense( 1, activation="sigmoid",
+                               dtype="float32" ) )
 
 
     network.compile( optimizer=optimizers.RMSprop( lr=1.e-4 ),
                      loss="binary_crossentropy",
                      metrics=["accuracy"] )
 
-    start = time.time()
-    # 100 steps times batch size of 20 yields all 2000 training samples
-    network.fit_generator( trainGenerator,
-                           steps_per_epoch=(trainSize // batchSize),
-                           epochs=15 )
-    trainingTime = time.time() - start
+    if tfdata:
+        fit, evaluate = network.fit, network.evaluate
+    else:
+        fit, evaluate = network.fit_generator, network.evaluate_generator
+
+    if loadWeights is not None:
+        # the stored weights replace the training
+        loadWeights( network )
+        trainingTime = 0
+    else:
+        start = time.time()
+        # every epoch is one pass over all 2000 training samples, the last
+        # batch of a pass is smaller if batchSize does not divide trainSize
+        fit( trainGenerator,
+             steps_per_epoch=syntheticData.steps( trainSize, batchSize ),
+             epochs=epochs,
+             callbacks=callbacks )
+        trainingTime = time.time() - start
 
     start = time.time()
-    # 50 steps times batch size of 20 yields all 1000 training samples
-    testLoss, testAccuracy = \
-        network.evaluate_generator( testGenerator,
-                                    steps=(testSize // batchSize) )
+    # one pass over all 1000 test samples
+    with spanTracer.span( "evaluate", "training" ):
+        testLoss, testAccuracy = \
+            evaluate( testGenerator,
+                      steps=syntheticData.steps( testSize, batchSize ) )
     testTime = time.time() - start
 
-    shutil.rmtree( baseDir )
-
     return (trainSize, testSize, trainingTime, testTime, testAccuracy, network)
 
+
+def sampleData( dtype, subset="test", count=None, synthetic=False,
+                manifest=None ):
+    """!
+    @brief Return images decoded and rescaled in the same way as testRun()
+           feeds them to the network, e.g. for measuring the inference.
+
+    The images of a set are sorted by category, so a subset of count images
+    is drawn evenly from the whole set to hold both cats and dogs.
+    @param dtype data type of the samples
+    @param subset "train" or "test"
+    @param count maximum number of images or None for all of them
+    @param synthetic if True, random samples as in synthetic test runs are
+           returned
+    @param manifest name of the file the split of the dataset is read from
+           or written to (see prepData()) or None
+    @return (inputs, labels) tuple
+    """
+
+    if synthetic:
+        return syntheticData.samples( syntheticSpec, subset, dtype, count )
+
+    # the same split and image size as in testRun()
+    trainSize = 2000
+    testSize = 1000
+    targetSize = (150, 150)
+
+    fileNames, labels = prepData( "../../Data/dogs-vs-cats",
+                                  (trainSize, 0, testSize),
+                                  manifest )[subset]
+    if count is None or count >= len( fileNames ):
+        index = np.arange( len( fileNames ) )
+    else:
+        index = np.linspace( 0, len( fileNames ) - 1, count ).astype( int )
+
+    images = decodeImages( [fileNames[i] for i in index], targetSize )
+    return (images.astype( dtype ) * np.array( 1/255, dtype=dtype ),
+            labels[index].astype( dtype ))
@@ -0,0 +1,338 @@
+# Python Implementation: hardware fingerprint of the benchmark machine
+# -*- coding: utf-8 -*-
+##
+# @file       hardwareInfo.py
+#
+# @version    1.0.0
+#
+# @par Purpose
+#             Detect the CPU, its instruction set extensions, the NUMA
+#             topology and the CPU and memory limits a container imposes on
+#             the benchmark, so that the logs describe the resources a
+#             benchmark actually had and the thread pools of TensorFlow are
+#             not larger than the CPU quota.
+#
+# @par Comments
+#             Detecting the CPU with cpuinfo runs a subprocess, which takes
+#             seconds on slow devices, so its result is cached in
+#             $TEMP/dlBenchmarks/hardware.json (or /tmp/dlBenchmarks) together
+#             with the boot ID of the kernel and detected again after the next
+#             boot.  The limits of the control group, the cores the process
+#             may run on and the NUMA nodes are read from a few small files on
+#             every call instead, since they differ between containers on the
+#             same host, which share the boot ID and possibly the cache.
+#
+#             The control group limits are read from cgroup v2 (cpu.max and
+#             memory.max) or, if that is not mounted, from cgroup v1
+#             (cpu.cfs_quota_us, cpu.cfs_period_us and memory.limit_in_bytes)
+#             below /sys/fs/cgroup.  The effective number of cores is the
+#             number of cores the process may run on, further limited by the
+#             CPU quota rounded up; a fractional quota of e.g. 1.5 cores thus
+#             yields 2.  On systems without control groups, e.g. macOS, the
+#             limits are None.
+#
+#             The vendor, architecture, brand, frequency, GPU and default
+#             data type are determined as benchmark.py always did, since they
+#             form the platform name of the logs: the old cpuinfo keys
+#             vendor_id, arch, brand and hz_advertised are used if present,
+#             Apple machines only have brand_raw, and a machine with neither
+#             is taken for a Raspberry Pi.
+#
+#             This is Python 3 code!
+
+# Known Bugs: none
+#
+# @author     Ekkehard Blanz <Ekkehard.Blanz@gmail.com> (C) 2026
+#
+# @copyright  See COPYING file that comes with this distribution
+#
+# File history:
+#
+#      Date         | Author         | Modification
+#  -----------------+----------------+------------------------------------------
+#   Sat Oct 17 2026 | Ekkehard Blanz | created
+#                   |                |
+
+import os
+import re
+import json
+import math
+
+import psutil
+
+
+# version of the cached CPU description - detected again if it differs
+cacheVersion = 1
+
+# instruction set extensions reported if cpuinfo lists them among the flags
+isaFlags = ["sse4_2", "avx", "avx2", "fma", "avx512f", "avx512_bf16",
+            "avx512_vnni", "amx_tile", "neon", "asimd", "asimdhp", "sve",
+            "bf16"]
+
+# mount point of the control group file systems
+cgroupRoot = "/sys/fs/cgroup"
+
+
+def readFile( fileName ):
+    """!
+    @brief Read a small system file.
+    @param fileName name of the file
+    @return stripped content of the file or None if it cannot be read
+    """
+    try:
+        with open( fileName ) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def readCgroup( controller, fileName ):
+    """!
+    @brief Read a file of the control group of this process.
+
+    The file is looked up in the control group /proc/self/cgroup names and,
+    if it is not found there, in the root of the hierarchy, which is the
+    control group of the container if the container has its own control
+    group namespace.
+    @param controller name of the cgroup v1 controller, e.g. "cpu", or None
+           for cgroup v2
+    @param fileName name of the file in the control group directory
+    @return stripped content of the file or None if it does not exist
+    """
+    root = cgroupRoot if controller is None else \
+           os.path.join( cgroupRoot, controller )
+    directories = []
+    for line in ( readFile( "/proc/self/cgroup" ) or "" ).splitlines():
+        hierarchy, controllers, path = line.split( ":", 2 )
+        if ( controller is None and hierarchy == "0" ) or \
+           ( controller is not None and
+             controller in controllers.split( "," ) ):
+            directories.append( os.path.join( root, path.lstrip( "/" ) ) )
+    directories.append( root )
+    for directory in directories:
+        content = readFile( os.path.join( directory, fileName ) )
+        if content is not None:
+            return content
+    return None
+
+
+def bootId():
+    """!
+    @brief Return an identifier of the current boot of the machine.
+    @return boot ID of the Linux kernel or, on other systems, the boot time
+    """
+    bootIdentifier = readFile( "/proc/sys/kernel/random/boot_id" )
+    if bootIdentifier is None:
+        bootIdentifier = str( int( psutil.boot_time() ) )
+    return bootIdentifier
+
+
+def cacheFile():
+    """!
+    @brief Return the name of the file caching the CPU description, creating
+           its directory if necessary.
+    @return path of the file
+    """
+    cacheDir = os.path.join( os.getenv( "TEMP", "/tmp" ), "dlBenchmarks" )
+    os.makedirs( cacheDir, exist_ok=True )
+    return os.path.join( cacheDir, "hardware.json" )
+
+
+def describeCpu( info ):
+    """!
+    @brief Derive the CPU description from the output of cpuinfo.
+    @param info dictionary as returned by cpuinfo.get_cpu_info()
+    @return dictionary with vendor, arch, brand, frequency, bits, hasGPU,
+            dtype (the default data type of the platform) and isa (the list
+            of instruction set extensions found among isaFlags)
+    """
+    if all( key in info for key in ("vendor_id", "arch", "brand",
+                                    "hz_advertised") ):
+        cpu = {"vendor": info["vendor_id"],
+               "arch": info["arch"],
+               "brand": info["brand"],
+               "frequency": info["hz_advertised"],
+               "hasGPU": False,
+               "dtype": "float32"}
+        if cpu["arch"] == "ARM_8":
+            cpu["vendor"] = "NVIDIA"
+            cpu["hasGPU"] = True
+            cpu["dtype"] = "float16"
+    elif "brand_raw" in info:
+        # Apple and Raspberry Pi don't have vendor_id key
+        cpu = {"vendor": info["brand_raw"][0:5],
+               "arch": info["brand_raw"][6:],
+               "brand": info["brand_raw"],
+               "frequency": "??? Hz", # not available on M1
+               "hasGPU": True,
+               "dtype": "float32"}
+    else:
+        # this may be a stretch - but it works in my setting where RPi is the
+        # only one that has neither vendor_id nor the brand_raw key set
+        cpu = {"vendor": "RaspberryPi",
+               "arch": info.get( "arch", "unknown" ),
+               "brand": info.get( "brand", "unknown" ),
+               "frequency": info.get( "hz_advertised", "??? Hz" ),
+               "hasGPU": False,
+               "dtype": "float32"}
+    cpu["bits"] = info.get( "bits" )
+    flags = set( info.get( "flags", [] ) )
+    cpu["isa"] = [flag for flag in isaFlags if flag in flags]
+    return cpu
+
+
+def detectCpu():
+    """!
+    @brief Detect the CPU with cpuinfo.
+    @return dictionary as returned by describeCpu()
+    """
+    # imported only here, since the cached description usually suffices
+    import cpuinfo
+    return describeCpu( cpuinfo.get_cpu_info() )
+
+
+def cachedCpu( refresh=False ):
+    """!
+    @brief Return the CPU description from the cache or detect it.
+    @param refresh if True, the CPU is detected even if it is cached
+    @return (cpu, cached) tuple with the dictionary as returned by
+            describeCpu() and whether it came from the cache
+    """
+    fileName = cacheFile()
+    bootIdentifier = bootId()
+    if not refresh:
+        try:
+            with open( fileName ) as f:
+                cache = json.load( f )
+            if cache.get( "version" ) == cacheVersion and \
+               cache.get( "bootId" ) == bootIdentifier:
+                return cache["cpu"], True
+        except (OSError, ValueError, KeyError):
+            pass
+    cpu = detectCpu()
+    tmpName = "{0}.{1}".format( fileName, os.getpid() )
+    with open( tmpName, "w" ) as f:
+        json.dump( {"version": cacheVersion, "bootId": bootIdentifier,
+                    "cpu": cpu}, f, indent=1 )
+    os.replace( tmpName, fileName )
+    return cpu, False
+
+
+def cpuQuota():
+    """!
+    @brief Read the CPU quota of the control group of this process.
+    @return number of cores the quota corresponds to, possibly fractional,
+            or None if the CPU time is not limited
+    """
+    # cgroup v2: "<quota> <period>" or "max <period>"
+    cpuMax = readCgroup( None, "cpu.max" )
+    if cpuMax is not None:
+        fields = cpuMax.split()
+        if fields[0] == "max":
+            return None
+        return int( fields[0] ) / int( fields[1] )
+    # cgroup v1: a quota of -1 means no limit
+    quota = readCgroup( "cpu", "cpu.cfs_quota_us" )
+    period = readCgroup( "cpu", "cpu.cfs_period_us" )
+    if quota is None or period is None or int( quota ) <= 0:
+        return None
+    return int( quota ) / int( period )
+
+
+def memoryLimit():
+    """!
+    @brief Read the memory limit of the control group of this process.
+    @return limit in bytes or None if the memory is not limited below the
+            installed memory
+    """
+    limit = readCgroup( None, "memory.max" )
+    if limit is None:
+        limit = readCgroup( "memory", "memory.limit_in_bytes" )
+    if limit is None or limit == "max":
+        return None
+    # cgroup v1 reports a huge number if there is no limit
+    if int( limit ) >= psutil.virtual_memory().total:
+        return None
+    return int( limit )
+
+
+def parseCpuList( cpuList ):
+    """!
+    @brief Parse a list of cores as the kernel prints it.
+    @param cpuList string like "0-3,8,10-11"
+    @return list of core numbers
+    """
+    cores = []
+    for part in cpuList.split( "," ):
+        if not part:
+            continue
+        first, _, last = part.partition( "-" )
+        cores.extend( range( int( first ), int( last or first ) + 1 ) )
+    return cores
+
+
+def numaNodes():
+    """!
+    @brief Read the NUMA topology.
+    @return list of lists with the cores of every NUMA node, empty if the
+            system does not report its NUMA nodes
+    """
+    nodeDir = "/sys/devices/system/node"
+    try:
+        names = os.listdir( nodeDir )
+    except OSError:
+        return []
+    names = [name for name in names if re.match( r"node\d+$", name )]
+    nodes = []
+    for name in sorted( names, key=lambda name: int( name[4:] ) ):
+        cpuList = readFile( os.path.join( nodeDir, name, "cpulist" ) )
+        nodes.append( parseCpuList( cpuList ) if cpuList else [] )
+    return nodes
+
+
+def availableCores():
+    """!
+    @brief Return the number of cores this process may run on.
+    @return number of cores
+    """
+    if hasattr( os, "sched_getaffinity" ):
+        return len( os.sched_getaffinity( 0 ) )
+    return os.cpu_count()
+
+
+def effectiveCores( quota=None ):
+    """!
+    @brief Return the number of cores this process can keep busy.
+    @param quota CPU quota as returned by cpuQuota() or None
+    @return number of cores the process may run on, limited by the quota
+            rounded up
+    """
+    cores = availableCores()
+    if quota is not None:
+        cores = min( cores, max( 1, math.ceil( quota ) ) )
+    return cores
+
+
+def fingerprint( refresh=False ):
+    """!
+    @brief Describe the hardware available to this process.
+    @param refresh if True, the CPU is detected even if it is cached
+    @return dictionary with the CPU description as returned by describeCpu(),
+            whether it came from the cache (cached), the number of cores of
+            the machine (cores), the number of cores the process may run on
+            (availableCores), the CPU quota in cores (cpuQuota), the
+            effective number of cores (effectiveCores), the installed memory
+            and the memory limit in bytes (memory, memoryLimit) and the cores
+            of every NUMA node (numaNodes)
+    """
+    hardware, cached = cachedCpu( refresh )
+    quota = cpuQuota()
+    hardware.update( {"cached": cached,
+                      "cores": os.cpu_count(),
+                      "availableCores": availableCores(),
+                      "cpuQuota": quota,
+                      "effectiveCores": effectiveCores( quota ),
+                      "memory": psutil.virtual_memory().total,
+                      "memoryLimit": memoryLimit(),
+                      "numaNodes": numaNodes()} )
+    return hardware
@@ -3,7 +3,7 @@
 ##
 # @file       imdb.py
 #
-# @version    1.0.1
+# @version    1.10.0
 #
 # @par Purpose
 #             Run a IMDB movie review classification task using keras.
@@ -17,7 +17,7 @@
 
 # Known Bugs: none
 #
-# @author     Ekkehard Blanz <Ekkehard.Blanz@gmail.com> (C) 2019-2021
+# @author     Ekkehard Blanz <Ekkehard.Blanz@gmail.com> (C) 2019-2026
 #
 # @copyright  See COPYING file that comes with this distribution
 #
@@ -27,6 +27,20 @@
 #  -----------------+----------------+------------------------------------------
 #   Sat Jul 06 2019 | Ekkehard Blanz | converted from Chollet's book
 #   Thu Jul 01 2021 | Ekkehard Blanz | omitted pickle-fix on Mac
+#   Sat Oct 17 2026 | Ekkehard Blanz | added callbacks parameter and
+#                   |                | module-level batch size
+#   Sat Oct 17 2026 | Ekkehard Blanz | vectorized encoding moved to
+#                   |                | sequenceEncoding.py, added sparse option
+#   Sat Oct 17 2026 | Ekkehard Blanz | preprocessed data are cached
+#   Sat Oct 17 2026 | Ekkehard Blanz | made batch size and number of epochs
+#                   |                | overridable
+#   Sat Oct 17 2026 | Ekkehard Blanz | added sampleData() for the inference
+#                   |                | measurement
+#   Sat Oct 17 2026 | Ekkehard Blanz | stored weights can replace the training
+#   Sat Oct 17 2026 | Ekkehard Blanz | the output layer computes in float32
+#   Sat Oct 17 2026 | Ekkehard Blanz | added synthetic data
+#   Sat Oct 17 2026 | Ekkehard Blanz | added phase marks
+#   Sat Oct 17 2026 | Ekkehard Blanz | added trace spans
 #                   |                |
 
 from sys import platform
@@ -42,15 +56,25 @@ from keras import metrics
 
 from keras.datasets import imdb
 
+from sequenceEncoding import (vectorizeSequences, sparseComponents,
+                              toSparseTensor)
+from datasetCache import cachedArrays
+import syntheticData
+import phaseTimer
+import spanTracer
 
-def vectorizeSequences( sequences, dtype, dimension=10000 ):
-    results = np.zeros( (len( sequences ), dimension), dtype=dtype )
-    for i, sequence in enumerate( sequences ):
-        results[i, sequence] = 1.
-    return results
 
-
-def testRun( dtype ):
+@spanTracer.traced
+def prepData( dtype, sparse ):
+    """!
+    @brief Load the IMDB dataset and encode the reviews as multi-hot vectors.
+    @param dtype data type of the result
+    @param sparse if True, the components of sparse tensors are returned
+           instead of dense matrices
+    @return dictionary with the encoded training and test data xTrain and xTest
+            (or their components xTrainIndices, xTrainValues, xTrainShape, etc.)
+            and the labels yTrain and yTest
+    """
 
     if platform != "darwin":
         # save np.load on everything but Mac, which takes care of that in their
@@ -59,7 +83,6 @@ def testRun( dtype ):
         # modify the default parameters of np.load
         np.load = lambda *a,**k: npLoadOld( *a, allow_pickle=True, **k )
 
-
     # call load_data with allow_pickle implicitly set to true
     (trainData, trainLabels), (testData, testLabels) = \
         imdb.load_data( num_words=10000 )
@@ -68,17 +91,100 @@ def testRun( dtype ):
         # restore np.load for future normal usage
         np.load = npLoadOld
 
-    xTrain = vectorizeSequences( trainData, dtype )
-    xTest = vectorizeSequences( testData, dtype )
+    phaseTimer.begin( "preprocessing" )
+
+    arrays = {"yTrain": np.asarray( trainLabels ).astype( dtype ),
+              "yTest": np.asarray( testLabels ).astype( dtype )}
+    for name, sequences in (("xTrain", trainData), ("xTest", testData)):
+        if sparse:
+            indices, values, denseShape = sparseComponents( sequences, dtype )
+            arrays[name + "Indices"] = indices
+            arrays[name + "Values"] = values
+            arrays[name + "Shape"] = denseShape
+        else:
+            arrays[name] = vectorizeSequences( sequences, dtype )
+
+    return arrays
+
+
+# number of samples per batch - benchmark.py uses it to compute throughputs
+batchSize = 512
+
+# number of training epochs
+epochs = 4
+
+# data of synthetic test runs - the multi-hot vectors have about as many
+# ones as the reviews have distinct words
+syntheticSpec = {"trainSize": 25000,
+                 "testSize": 25000,
+                 "shape": (10000,),
+                 "inputs": "multiHot",
+                 "density": 0.012,
+                 "labels": "binary"}
+
+
+def testRun( dtype, callbacks=None, sparse=False, batchSize=batchSize,
+             epochs=epochs, loadWeights=None, synthetic=False ):
+    """!
+    @param dtype data type of the input data
+    @param callbacks list of Keras callbacks for the training
+    @param sparse if True, the multi-hot encoded reviews are kept as a sparse
+           tensor rather than a dense matrix
+    @param batchSize number of samples per batch, the module-level batchSize
+           by default
+    @param epochs number of training epochs, the module-level epochs by
+           default
+    @param loadWeights function that loads stored weights into the compiled
+           network, which is then not trained (see modelStore.py)
+    @param synthetic if True, random data with the shapes of the encoded
+           reviews replace the dataset (see syntheticData.py) - they are
+           always dense
+    """
 
-    yTrain = np.asarray( trainLabels ).astype( dtype )
-    yTest = np.asarray( testLabels ).astype( dtype )
+    if synthetic and sparse:
+        raise ValueError( "Synthetic data cannot be sparse" )
 
+    if synthetic:
+        trainSize = syntheticSpec["trainSize"]
+        testSize = syntheticSpec["testSize"]
+        trainData = syntheticData.batches( syntheticSpec, "train", batchSize,
+                                           dtype )
+        testData = syntheticData.batches( syntheticSpec, "test", batchSize,
+                                          dtype )
+    else:
+        data = cachedArrays( "imdb",
+                             {"dtype": dtype, "numWords": 10000,
+                              "sparse": sparse},
+                             lambda: prepData( dtype, sparse ) )
+
+        if sparse:
+            xTrain = toSparseTensor( data["xTrainIndices"],
+                                     data["xTrainValues"],
+                                     data["xTrainShape"] )
+            xTest = toSparseTensor( data["xTestIndices"], data["xTestValues"],
+                                    data["xTestShape"] )
+        else:
+            xTrain = data["xTrain"]
+            xTest = data["xTest"]
+
+        yTrain = data["yTrain"]
+        yTest = data["yTest"]
+        trainSize = len( yTrain )
+        testSize = len( yTest )
+
+    phaseTimer.begin( "modelBuild" )
     network = models.Sequential()
 
-    network.add( layers.Dense( 16, activation="relu", input_shape=(10000,) ) )
+    if sparse:
+        network.add( layers.InputLayer( input_shape=(10000,), sparse=True ) )
+        network.add( layers.Dense( 16, activation="relu" ) )
+    else:
+        network.add( layers.Dense( 16, activation="relu",
+                                   input_shape=(10000,) ) )
     network.add( layers.Dense( 16, activation="relu" ) )
-    network.add( layers.Dense( 1, activation="sigmoid" ) )
+    # float32 output under mixed precision
+    network.add( layers.Dense( 1, activation="sigmoid",
+                               dtype="float32" ) )
 
     #xVal = xTrain[:10000]
     #partialXtrain = xTrain[10000:]
@@ -90,14 +196,68 @@ def testRun( dtype ):
                      loss=losses.binary_crossentropy,
                      metrics=[metrics.binary_accuracy] )
 
-    start = time.time()
-    network.fit( xTrain, yTrain, epochs=4, batch_size=512 )
-    trainingTime = time.time() - start
+    if loadWeights is not None:
+        # the stored weights replace the training
+        loadWeights( network )
+        trainingTime = 0
+    else:
+        start = time.time()
+        if synthetic:
+            network.fit_generator( trainData,
+                                   steps_per_epoch=syntheticData.steps(
+                                       trainSize, batchSize ),
+                                   epochs=epochs,
+                                   callbacks=callbacks )
+        else:
+            network.fit( xTrain, yTrain, epochs=epochs, batch_size=batchSize,
+                         callbacks=callbacks )
+        trainingTime = time.time() - start
 
     start = time.time()
     # loss is e.g. least squares error, accuracy is after non-linear decision
-    testLoss, testAccuracy = network.evaluate( xTest, yTest )
+    with spanTracer.span( "evaluate", "training" ):
+        if synthetic:
+            testLoss, testAccuracy = network.evaluate_generator(
+                testData, steps=syntheticData.steps( testSize, batchSize ) )
+        else:
+            testLoss, testAccuracy = network.evaluate( xTest, yTest )
     testTime = time.time() - start
 
-    return (len( xTrain ), len( xTest ),
+    return (trainSize, testSize,
             trainingTime, testTime, testAccuracy, network)
+
+
+def sampleData( dtype, subset="test", count=None, sparse=False,
+                synthetic=False ):
+    """!
+    @brief Return samples preprocessed in the same way as testRun() feeds
+           them to the network, e.g. for measuring the inference.
+    @param dtype data type of the samples
+    @param subset "train" or "test"
+    @param count maximum number of samples or None for all of them
+    @param sparse if True, the inputs are returned as a sparse tensor
+    @param synthetic if True, random samples as in synthetic test runs are
+           returned
+    @return (inputs, labels) tuple
+    """
+
+    if synthetic:
+        if sparse:
+            raise ValueError( "Synthetic data cannot be sparse" )
+        return syntheticData.samples( syntheticSpec, subset, dtype, count )
+
+    data = cachedArrays( "imdb",
+                         {"dtype": dtype, "numWords": 10000, "sparse": sparse},
+                         lambda: prepData( dtype, sparse ) )
+
+    name = "xTrain" if subset == "train" else "xTest"
+    labels = data["yTrain" if subset == "train" else "yTest"][:count]
+    if sparse:
+        # keep only the entries of the first count rows
+        keep = data[name + "Indices"][:, 0] < len( labels )
+        inputs = toSparseTensor( data[name + "Indices"][keep],
+                                 data[name + "Values"][keep],
+                                 (len( labels ), data[name + "Shape"][1]) )
+    else:
+        inputs = data[name][:count]
+    return inputs, labels
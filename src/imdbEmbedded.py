@@ -3,7 +3,7 @@
 ##
 # @file       imdbEmbedded.py
 #
-# @version    1.0.1
+# @version    1.9.0
 #
 # @par Purpose
 #             Run a IMDB movie review classification task with embedded word
@@ -18,7 +18,7 @@
 
 # Known Bugs: none
 #
-# @author     Ekkehard Blanz <Ekkehard.Blanz@gmail.com> (C) 2019-2021
+# @author     Ekkehard Blanz <Ekkehard.Blanz@gmail.com> (C) 2019-2026
 #
 # @copyright  See COPYING file that comes with this distribution
 #
@@ -28,6 +28,18 @@
 #  -----------------+----------------+------------------------------------------
 #   Sat Jul 06 2019 | Ekkehard Blanz | converted from Chollet's book
 #   Thu Jul 01 2021 | Ekkehard Blanz | omitted pickle-fix on Mac
+#   Sat Oct 17 2026 | Ekkehard Blanz | added callbacks parameter and
+#                   |                | module-level batch size
+#   Sat Oct 17 2026 | Ekkehard Blanz | preprocessed data are cached
+#   Sat Oct 17 2026 | Ekkehard Blanz | made batch size and number of epochs
+#                   |                | overridable
+#   Sat Oct 17 2026 | Ekkehard Blanz | added sampleData() for the inference
+#                   |                | measurement
+#   Sat Oct 17 2026 | Ekkehard Blanz | stored weights can replace the training
+#   Sat Oct 17 2026 | Ekkehard Blanz | the output layer computes in float32
+#   Sat Oct 17 2026 | Ekkehard Blanz | added synthetic data
+#   Sat Oct 17 2026 | Ekkehard Blanz | added phase marks
+#   Sat Oct 17 2026 | Ekkehard Blanz | added trace spans
 #                   |                |
 
 from sys import platform
@@ -41,15 +53,22 @@ from keras import preprocessing
 
 from keras.datasets import imdb
 
+from datasetCache import cachedArrays
+import syntheticData
+import phaseTimer
+import spanTracer
 
-def testRun( dtype ):
 
-    # size of vocabulary
-    maxFeatures = 10000
-    # embedding dimension
-    dim = 8
-    # use only at most maxLen words from each review
-    maxLen = 50
+@spanTracer.traced
+def prepData( dtype, maxFeatures, maxLen ):
+    """!
+    @brief Load the IMDB dataset and pad or truncate the reviews.
+    @param dtype data type of the result
+    @param maxFeatures size of the vocabulary
+    @param maxLen number of words kept from each review
+    @return dictionary with the padded training and test data xTrain and xTest
+            and the labels yTrain and yTest
+    """
 
     if platform != "darwin":
         # save np.load on everything but Mac, which takes care of that in their
@@ -66,6 +85,8 @@ def testRun( dtype ):
         # restore np.load for future normal usage
         np.load = npLoadOld
 
+    phaseTimer.begin( "preprocessing" )
+
     xTrain = preprocessing.sequence.pad_sequences( trainData,
                                                    dtype=dtype,
                                                    maxlen=maxLen )
@@ -73,28 +94,139 @@ def testRun( dtype ):
                                                    dtype=dtype,
                                                    maxlen=maxLen )
 
-    yTrain = np.asarray( trainLabels ).astype( dtype )
-    yTest = np.asarray( testLabels ).astype( dtype )
+    return {"xTrain": xTrain,
+            "xTest": xTest,
+            "yTrain": np.asarray( trainLabels ).astype( dtype ),
+            "yTest": np.asarray( testLabels ).astype( dtype )}
+
+
+# number of samples per batch - benchmark.py uses it to compute throughputs
+batchSize = 32
+
+# number of training epochs
+epochs = 10
+
+# data of synthetic test runs - the vocabulary and review length are the
+# ones of testRun()
+syntheticSpec = {"trainSize": 25000,
+                 "testSize": 25000,
+                 "shape": (50,),
+                 "inputs": "indices",
+                 "vocabulary": 10000,
+                 "labels": "binary"}
+
+
+def testRun( dtype, callbacks=None, batchSize=batchSize, epochs=epochs,
+             loadWeights=None, synthetic=False ):
+    """!
+    @param dtype data type of the input data
+    @param callbacks list of Keras callbacks for the training
+    @param batchSize number of samples per batch, the module-level batchSize
+           by default
+    @param epochs number of training epochs, the module-level epochs by
+           default
+    @param loadWeights function that loads stored weights into the compiled
+           network, which is then not trained (see modelStore.py)
+    @param synthetic if True, random data with the shapes of the padded reviews
+           replace the dataset (see syntheticData.py)
+    """
 
+    # size of vocabulary
+    maxFeatures = 10000
+    # embedding dimension
+    dim = 8
+    # use only at most maxLen words from each review
+    maxLen = 50
+
+    if synthetic:
+        trainSize = syntheticSpec["trainSize"]
+        testSize = syntheticSpec["testSize"]
+        trainData = syntheticData.batches( syntheticSpec, "train", batchSize,
+                                           dtype )
+        testData = syntheticData.batches( syntheticSpec, "test", batchSize,
+                                          dtype )
+    else:
+        data = cachedArrays( "imdbEmbedded",
+                             {"dtype": dtype, "maxFeatures": maxFeatures,
+                              "maxLen": maxLen},
+                             lambda: prepData( dtype, maxFeatures, maxLen ) )
+
+        xTrain = data["xTrain"]
+        xTest = data["xTest"]
+        yTrain = data["yTrain"]
+        yTest = data["yTest"]
+        trainSize = len( yTrain )
+        testSize = len( yTest )
+
+    phaseTimer.begin( "modelBuild" )
     network = models.Sequential()
     network.add( layers.Embedding( maxFeatures, dim, input_length=maxLen ) )
 
     network.add( layers.Flatten() )
-    network.add( layers.Dense( 1, activation="sigmoid" ) )
+    # float32 output under mixed precision
+    network.add( layers.Dense( 1, activation="sigmoid",
+                               dtype="float32" ) )
 
 
     network.compile( optimizer="rmsprop",
                      loss="binary_crossentropy",
                      metrics=["acc"] )
 
-    start = time.time()
-    network.fit( xTrain, yTrain, epochs=10, batch_size=32 )
-    trainingTime = time.time() - start
+    if loadWeights is not None:
+        # the stored weights replace the training
+        loadWeights( network )
+        trainingTime = 0
+    else:
+        start = time.time()
+        if synthetic:
+            network.fit_generator( trainData,
+                                   steps_per_epoch=syntheticData.steps(
+                                       trainSize, batchSize ),
+                                   epochs=epochs,
+                                   callbacks=callbacks )
+        else:
+            network.fit( xTrain, yTrain, epochs=epochs, batch_size=batchSize,
+                         callbacks=callbacks )
+        trainingTime = time.time() - start
 
     start = time.time()
     # loss is e.g. least squares error, accuracy is after non-linear decision
-    testLoss, testAccuracy = network.evaluate( xTest, yTest )
+    with spanTracer.span( "evaluate", "training" ):
+        if synthetic:
+            testLoss, testAccuracy = network.evaluate_generator(
+                testData, steps=syntheticData.steps( testSize, batchSize ) )
+        else:
+            testLoss, testAccuracy = network.evaluate( xTest, yTest )
     testTime = time.time() - start
 
-    return (len( xTrain ), len( xTest ),
+    return (trainSize, testSize,
             trainingTime, testTime, testAccuracy, network)
+
+
+def sampleData( dtype, subset="test", count=None, synthetic=False ):
+    """!
+    @brief Return samples preprocessed in the same way as testRun() feeds
+           them to the network, e.g. for measuring the inference.
+    @param dtype data type of the samples
+    @param subset "train" or "test"
+    @param count maximum number of samples or None for all of them
+    @param synthetic if True, random samples as in synthetic test runs are
+           returned
+    @return (inputs, labels) tuple
+    """
+
+    if synthetic:
+        return syntheticData.samples( syntheticSpec, subset, dtype, count )
+
+    # the same vocabulary and review length as in testRun()
+    maxFeatures = 10000
+    maxLen = 50
+
+    data = cachedArrays( "imdbEmbedded",
+                         {"dtype": dtype, "maxFeatures": maxFeatures,
+                          "maxLen": maxLen},
+                         lambda: prepData( dtype, maxFeatures, maxLen ) )
+
+    if subset == "train":
+        return data["xTrain"][:count], data["yTrain"][:count]
+    return data["xTest"][:count], data["yTest"][:count]
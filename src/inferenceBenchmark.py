@@ -0,0 +1,183 @@
+# Python Implementation: inference latency and throughput of a trained network
+# -*- coding: utf-8 -*-
+##
+# @file       inferenceBenchmark.py
+#
+# @version    1.0.0
+#
+# @par Purpose
+#             Measure the latency distribution and the throughput of
+#             predictions of a trained network for single samples and small
+#             batches, which is what matters for serving a model online rather
+#             than the bulk evaluation of the whole test set.
+#
+# @par Comments
+#             For every batch size, a number of warm-up batches is predicted
+#             first, the first of which includes tracing the prediction
+#             function and is reported separately as the cold-start latency.
+#             Then every batch of the measured ones is predicted on its own
+#             with predict_on_batch(), which returns only when the result is
+#             available, and its latency is taken.  The batches are sliced
+#             from a pool of real test samples before the measurement, so that
+#             neither slicing nor data preparation are part of the latency.
+#
+#             The latency distribution is summarized by its median, 95th and
+#             99th percentile, mean and standard deviation (the jitter) and
+#             its minimum and maximum.  The throughput is the number of
+#             samples of all measured batches divided by the sum of their
+#             latencies.
+#
+#             This is Python 3 code!
+
+# Known Bugs: none
+#
+# @author     Ekkehard Blanz <Ekkehard.Blanz@gmail.com> (C) 2026
+#
+# @copyright  See COPYING file that comes with this distribution
+#
+# File history:
+#
+#      Date         | Author         | Modification
+#  -----------------+----------------+------------------------------------------
+#   Sat Oct 17 2026 | Ekkehard Blanz | created
+#                   |                |
+
+import time
+
+import tensorflow as tf
+
+import runStatistics
+
+
+# batch sizes measured by default - 1 is a single online request
+defaultBatchSizes = [1, 8, 32, 128]
+
+# number of distinct batches that are cycled through during a measurement
+poolBatches = 8
+
+
+def sampleCount( samples ):
+    """!
+    @brief Return the number of samples in a pool.
+    @param samples array or sparse tensor with one sample per row
+    @return number of samples
+    """
+    if isinstance( samples, tf.sparse.SparseTensor ):
+        return int( samples.dense_shape[0] )
+    return len( samples )
+
+
+def sliceBatches( samples, batchSize, count=poolBatches ):
+    """!
+    @brief Slice distinct batches from a pool of samples.
+    @param samples array or sparse tensor with one sample per row
+    @param batchSize number of samples per batch
+    @param count maximum number of batches
+    @return list of batches, fewer than count if the pool is too small
+    @throw ValueError if the pool holds fewer samples than one batch
+    """
+    n = sampleCount( samples )
+    if n < batchSize:
+        raise ValueError( "{0} samples are not enough for a batch of "
+                          "{1}".format( n, batchSize ) )
+    batches = []
+    for first in range( 0, min( n - batchSize, (count - 1) * batchSize ) + 1,
+                        batchSize ):
+        if isinstance( samples, tf.sparse.SparseTensor ):
+            batches.append( tf.sparse.slice( samples, [first, 0],
+                                             [batchSize,
+                                              samples.dense_shape[1]] ) )
+        else:
+            batches.append( samples[first:first + batchSize] )
+    return batches
+
+
+def measureLatency( network, samples, batchSize, repeat=100, warmup=10 ):
+    """!
+    @brief Measure the latency of predictions of one batch size.
+    @param network trained Keras model
+    @param samples pool of input samples as returned by sampleData() of a
+           benchmark module
+    @param batchSize number of samples per batch
+    @param repeat number of measured batches
+    @param warmup number of batches predicted before the measured ones
+    @return dictionary with the batch size, the numbers of measured and
+            warm-up batches, the cold-start latency of the very first batch
+            (coldStart), the median (p50), 95th (p95) and 99th (p99)
+            percentile, mean, standard deviation (stddev), minimum and maximum
+            of the latency, all in seconds, and the throughput in samples per
+            second
+    """
+    batches = sliceBatches( samples, batchSize )
+
+    coldStart = None
+    for i in range( warmup ):
+        start = time.perf_counter()
+        network.predict_on_batch( batches[i % len( batches )] )
+        if i == 0:
+            coldStart = time.perf_counter() - start
+
+    latencies = []
+    for i in range( repeat ):
+        batch = batches[i % len( batches )]
+        start = time.perf_counter()
+        network.predict_on_batch( batch )
+        latencies.append( time.perf_counter() - start )
+
+    stats = runStatistics.summarize( latencies )
+    return {"batchSize": batchSize,
+            "repeat": repeat,
+            "warmup": warmup,
+            "coldStart": coldStart,
+            "p50": runStatistics.percentile( latencies, 50 ),
+            "p95": runStatistics.percentile( latencies, 95 ),
+            "p99": runStatistics.percentile( latencies, 99 ),
+            "mean": stats["mean"],
+            "stddev": stats["stddev"],
+            "min": stats["min"],
+            "max": stats["max"],
+            "throughput": batchSize * repeat / sum( latencies )}
+
+
+def measure( network, samples, batchSizes=defaultBatchSizes, repeat=100,
+             warmup=10 ):
+    """!
+    @brief Measure the latency of predictions for several batch sizes.
+    @param network trained Keras model
+    @param samples pool of input samples with at least as many samples as
+           the largest batch size
+    @param batchSizes list of batch sizes
+    @param repeat number of measured batches per batch size
+    @param warmup number of warm-up batches per batch size
+    @return list of dictionaries as returned by measureLatency(), one per
+            batch size
+    """
+    return [measureLatency( network, samples, batchSize, repeat, warmup )
+            for batchSize in batchSizes]
+
+
+def report( rows ):
+    """!
+    @brief Format the latencies of all batch sizes as a table for the log.
+    @param rows list of dictionaries as returned by measure()
+    @return multi-line string
+    """
+    text = "Inference ({0} measured after {1} warm-up batches per " \
+           "batch size):\n".format( rows[0]["repeat"], rows[0]["warmup"] )
+    text += "Batch size  Cold [ms]  p50 [ms]  p95 [ms]  p99 [ms]" \
+            "  Mean [ms]  Stddev [ms]   Samples/s\n"
+    for row in rows:
+        text += "{0:10d}".format( row["batchSize"] )
+        if row["coldStart"] is None:
+            text += "        n/a"
+        else:
+            text += " {0:10.3f}".format( row["coldStart"] * 1000 )
+        text += " {0:9.3f} {1:9.3f} {2:9.3f} {3:10.3f} {4:12.3f}" \
+                " {5:11.1f}\n".format( row["p50"] * 1000, row["p95"] * 1000,
+                                       row["p99"] * 1000, row["mean"] * 1000,
+                                       row["stddev"] * 1000,
+                                       row["throughput"] )
+    best = max( rows, key=lambda row: row["throughput"] )
+    text += "Highest throughput: {0:.1f} samples/s with batch size " \
+            "{1}\n".format( best["throughput"], best["batchSize"] )
+    return text
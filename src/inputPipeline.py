@@ -0,0 +1,186 @@
+# Python Implementation: tf.data input pipelines for the benchmarks
+# -*- coding: utf-8 -*-
+##
+# @file       inputPipeline.py
+#
+# @version    1.2.0
+#
+# @par Purpose
+#             Provide tf.data input pipelines for the benchmarks that feed
+#             Python generators to fit_generator() and evaluate_generator(),
+#             so that the preparation of the input data runs in parallel and
+#             overlaps with the training.
+#
+# @par Comments
+#             The benchmarks select the input pipeline with their pipeline
+#             option, which is one of pipelineModes:
+#
+#             generator   the Python generators of the original benchmarks,
+#                         which produce one batch after the other on a single
+#                         thread
+#             tfdata      tf.data datasets that prepare the batches with
+#                         parallel map() calls and prefetch them, both tuned
+#                         by tf.data (AUTOTUNE)
+#
+#             All datasets returned by the functions in here repeat forever,
+#             like the generators they replace, so the number of steps has to
+#             be given to fit() and evaluate().  The image datasets are
+#             batched pass by pass like the image generators, so the last
+#             batch of a pass is smaller if the batch size does not divide the
+#             number of images, and ceil( images / batchSize ) steps are one
+#             pass.  The windows of the weather benchmarks are gathered from
+#             the data in a single operation per batch, so there is nothing to
+#             gain from caching them; the decoded images of the dogs vs cats
+#             benchmark can optionally be cached in memory after the first
+#             epoch.
+#
+#             This is Python 3 code!
+
+# Known Bugs: none
+#
+# @author     Ekkehard Blanz <Ekkehard.Blanz@gmail.com> (C) 2026
+#
+# @copyright  See COPYING file that comes with this distribution
+#
+# File history:
+#
+#      Date         | Author         | Modification
+#  -----------------+----------------+------------------------------------------
+#   Sat Oct 17 2026 | Ekkehard Blanz | created
+#   Sat Oct 17 2026 | Ekkehard Blanz | batched image datasets pass by pass
+#   Sat Oct 17 2026 | Ekkehard Blanz | batched window datasets pass by pass
+#                   |                |
+
+import numpy as np
+import tensorflow as tf
+
+
+# input pipelines the benchmarks can be run with, the first one is the default
+pipelineModes = ("generator", "tfdata")
+
+AUTOTUNE = tf.data.experimental.AUTOTUNE
+
+
+def checkMode( pipeline ):
+    """!
+    @brief Check the name of an input pipeline.
+    @param pipeline name of the input pipeline
+    @return True if pipeline is tfdata, False if it is generator
+    """
+    if pipeline not in pipelineModes:
+        raise ValueError( "Unknown input pipeline {0}, expected one of "
+                          "{1}".format( pipeline, ", ".join( pipelineModes ) ) )
+    return pipeline == "tfdata"
+
+
+def windowDataset( data, lookback, delay, min_index, max_index,
+                   shuffle=False, batch_size=128, step=6, dtype=None ):
+    """!
+    @brief Create a dataset of time series windows and targets.
+
+    This is the tf.data counterpart of weatherData.generator() and takes the
+    same parameters.  Shuffled windows are drawn without replacement within
+    every pass over the data rather than with replacement.  Like the
+    generator, which restarts at the first window instead of yielding a
+    partial batch, every pass yields full batches only.
+    @return tf.data.Dataset of (samples, targets) batches
+    """
+    if max_index is None:
+        max_index = len( data ) - delay - 1
+    if dtype is None:
+        dtype = data.dtype
+    data = tf.constant( np.ascontiguousarray( data, dtype=dtype ) )
+    temperature = data[:, 1]
+    offsets = tf.range( -lookback, 0, step, dtype=tf.int64 )
+
+    def gather( rows ):
+        samples = tf.gather( data, rows[:, tf.newaxis] + offsets )
+        targets = tf.gather( temperature, rows + delay )
+        return samples, targets
+
+    dataset = tf.data.Dataset.range( min_index + lookback, max_index )
+    if shuffle:
+        dataset = dataset.shuffle( max_index - min_index - lookback,
+                                   reshuffle_each_iteration=True )
+    # batched before repeating, so that the partial batch at the end of every
+    # pass is dropped and no batch spans two passes
+    dataset = dataset.batch( batch_size, drop_remainder=True ).repeat()
+    dataset = dataset.map( gather, num_parallel_calls=AUTOTUNE )
+    return dataset.prefetch( AUTOTUNE )
+
+
+def imageDataset( fileNames, labels, targetSize, batchSize, dtype,
+                  shuffle=False, cache=False ):
+    """!
+    @brief Create a dataset of decoded and rescaled JPEG images.
+    @param fileNames list of image file names
+    @param labels array of labels
+    @param targetSize (height, width) tuple the images are resized to
+    @param batchSize number of images per batch
+    @param dtype data type of the images and labels
+    @param shuffle if True, the images are drawn in a new random order in
+           every pass
+    @param cache if True, the decoded images are kept in memory after the
+           first pass
+    @return tf.data.Dataset of (images, labels) batches
+    """
+
+    def decode( fileName, label ):
+        image = tf.image.decode_jpeg( tf.io.read_file( fileName ), channels=3 )
+        # nearest neighbor like load_img(), which keeps the image uint8
+        image = tf.image.resize( image, targetSize, method="nearest" )
+        return image, label
+
+    dataset = tf.data.Dataset.from_tensor_slices(
+        (np.asarray( fileNames ), np.asarray( labels )) )
+    # shuffle the file names if the images are decoded in every pass, but the
+    # decoded images if they are cached
+    if shuffle and not cache:
+        dataset = dataset.shuffle( len( fileNames ),
+                                   reshuffle_each_iteration=True )
+    dataset = dataset.map( decode, num_parallel_calls=AUTOTUNE )
+    if cache:
+        dataset = dataset.cache()
+        if shuffle:
+            dataset = dataset.shuffle( len( fileNames ),
+                                       reshuffle_each_iteration=True )
+    return rescaledBatches( dataset, batchSize, dtype )
+
+
+def arrayDataset( images, labels, batchSize, dtype, shuffle=False ):
+    """!
+    @brief Create a dataset of rescaled images from decoded uint8 images.
+    @param images uint8 array of images, e.g. from the dataset cache
+    @param labels array of labels
+    @param batchSize number of images per batch
+    @param dtype data type of the images and labels
+    @param shuffle if True, the images are drawn in a new random order in
+           every pass
+    @return tf.data.Dataset of (images, labels) batches
+    """
+    dataset = tf.data.Dataset.from_tensor_slices(
+        (np.asarray( images ), np.asarray( labels )) )
+    if shuffle:
+        dataset = dataset.shuffle( len( images ),
+                                   reshuffle_each_iteration=True )
+    return rescaledBatches( dataset, batchSize, dtype )
+
+
+def rescaledBatches( dataset, batchSize, dtype ):
+    """!
+    @brief Batch a dataset of uint8 images and labels, rescale the images
+           to [0, 1] and repeat the batches forever.
+    @param dataset tf.data.Dataset of the (image, label) elements of one pass
+    @param batchSize number of images per batch
+    @param dtype data type of the images and labels
+    @return tf.data.Dataset of (images, labels) batches
+    """
+
+    def rescale( images, labels ):
+        return (tf.cast( images, dtype ) * tf.constant( 1/255, dtype=dtype ),
+                tf.cast( labels, dtype ))
+
+    dataset = dataset.batch( batchSize )
+    dataset = dataset.map( rescale, num_parallel_calls=AUTOTUNE )
+    # repeated after batching, so that no batch spans two passes
+    return dataset.repeat().prefetch( AUTOTUNE )
@@ -0,0 +1,143 @@
+# Python Implementation: memory sampling during a test run
+# -*- coding: utf-8 -*-
+##
+# @file       memorySampler.py
+#
+# @version    1.2.0
+#
+# @par Purpose
+#             Provide a Keras callback that samples the memory usage of the
+#             process and the system in a background thread during a test run,
+#             so that the peak memory of every phase of a benchmark is known
+#             and it can be decided whether a workload fits a small device.
+#
+# @par Comments
+#             Every sample holds the time since the start of the test run, the
+#             phase, the resident set size of the process, the available
+#             memory of the system and the memory the TensorFlow allocators of
+#             all GPUs currently hold, if TensorFlow reports it.  TensorFlow
+#             keeps allocator statistics for GPUs only, so the allocator
+#             memory is not available on machines without a GPU, where the
+#             log shows n/a (no GPU) instead.  The samples are assigned to
+#             the data preparation, training and evaluation phases as
+#             described in phaseSampler.py.  The sampler is installed by
+#             benchmark.py for every test run.
+#
+#             This is Python 3 code!
+
+# Known Bugs: none
+#
+# @author     Ekkehard Blanz <Ekkehard.Blanz@gmail.com> (C) 2026
+#
+# @copyright  See COPYING file that comes with this distribution
+#
+# File history:
+#
+#      Date         | Author         | Modification
+#  -----------------+----------------+------------------------------------------
+#   Sat Oct 17 2026 | Ekkehard Blanz | created
+#   Sat Oct 17 2026 | Ekkehard Blanz | moved the sampling thread to
+#                   |                | phaseSampler.py
+#   Sat Oct 17 2026 | Ekkehard Blanz | marked the allocator memory as GPU-only
+#                   |                |
+
+import psutil
+import tensorflow as tf
+
+from phaseSampler import PhaseSampler, phases, phaseIndices
+
+
+def allocatorMemory():
+    """!
+    @brief Return the memory the TensorFlow allocators of all GPUs hold.
+
+    TensorFlow reports allocator statistics for GPUs only, the memory of the
+    CPU allocator is part of the resident set size instead.
+    @return memory in bytes or None if there is no GPU or TensorFlow does not
+            report it
+    """
+    total = None
+    try:
+        for device in tf.config.list_logical_devices( "GPU" ):
+            info = tf.config.experimental.get_memory_info( device.name )
+            total = (total or 0) + info["current"]
+    except (AttributeError, ValueError):
+        # older TensorFlow versions or devices without allocator statistics
+        return None
+    return total
+
+
+class MemorySampler( PhaseSampler ):
+    """!
+    @brief Keras callback sampling the memory usage in a background thread.
+
+    start() has to be called before and stop() after the test run.
+    """
+
+    def __init__( self, interval=0.5 ):
+        """!
+        @brief Constructor.
+        @param interval time between two samples in seconds
+        """
+        super().__init__( interval )
+        self.process = psutil.Process()
+
+
+    def measure( self ):
+        return {"rss": self.process.memory_info().rss,
+                "available": psutil.virtual_memory().available,
+                "tfAllocated": allocatorMemory()}
+
+
+    def summary( self ):
+        """!
+        @brief Summarize the samples per phase.
+        @return dictionary with the sampling interval, a dictionary with the
+                peak resident set size (peakRSS), the minimum available
+                memory (minAvailable) and the peak GPU allocator memory
+                (peakTF, None without a GPU) for every phase that was
+                sampled, all in bytes, and
+                the time series of all samples as a dictionary of lists
+                (time, phase, rss, available, tfAllocated)
+        """
+        series = self.samples()
+
+        phaseStats = {}
+        for phase, index in phaseIndices( series ).items():
+            allocated = [series["tfAllocated"][i] for i in index
+                         if series["tfAllocated"][i] is not None]
+            phaseStats[phase] = {
+                "peakRSS": max( series["rss"][i] for i in index ),
+                "minAvailable": min( series["available"][i] for i in index ),
+                "peakTF": max( allocated ) if allocated else None}
+
+        return {"interval": self.interval,
+                "phases": phaseStats,
+                "series": series}
+
+
+    def report( self ):
+        """!
+        @brief Format the peak memory of every phase as a table for the log.
+        @return multi-line string
+        """
+        stats = self.summary()
+        text = "Memory (sampled every {0} s):\n".format( self.interval )
+        # allocator statistics exist for GPUs only
+        noGPU = not tf.config.list_logical_devices( "GPU" )
+        text += "Phase        Peak RSS [MB]  Min. available [MB]" \
+                "  Peak TF GPU allocator [MB]\n"
+        for phase in phases:
+            if phase not in stats["phases"]:
+                continue
+            phaseStats = stats["phases"][phase]
+            text += "{0:12s} {1:13.0f} {2:20.0f}".format(
+                phase, phaseStats["peakRSS"] / 1024**2,
+                phaseStats["minAvailable"] / 1024**2 )
+            if phaseStats["peakTF"] is not None:
+                text += " {0:27.0f}".format( phaseStats["peakTF"] / 1024**2 )
+            else:
+                text += " {0:>27s}".format( "n/a (no GPU)" if noGPU
+                                            else "n/a" )
+            text += "\n"
+        return text
@@ -3,7 +3,7 @@
 ##
 # @file       mnist1D.py
 #
-# @version    1.0.1
+# @version    1.9.0
 #
 # @par Purpose
 #             Run a MNIST handwritten digits classification task using keras.
@@ -16,7 +16,7 @@
 
 # Known Bugs: none
 #
-# @author     Ekkehard Blanz <Ekkehard.Blanz@gmail.com> (C) 2019
+# @author     Ekkehard Blanz <Ekkehard.Blanz@gmail.com> (C) 2019-2026
 #
 # @copyright  See COPYING file that comes with this distribution
 #
@@ -26,6 +26,18 @@
 #  -----------------+----------------+------------------------------------------
 #   Tue May 21 2019 | Ekkehard Blanz | converted from Chollet's book
 #   Sat Jul 06 2019 | Ekkehard Blanz | converted to benchmarkable function
+#   Sat Oct 17 2026 | Ekkehard Blanz | added callbacks parameter and
+#                   |                | module-level batch size
+#   Sat Oct 17 2026 | Ekkehard Blanz | preprocessed data are cached
+#   Sat Oct 17 2026 | Ekkehard Blanz | made batch size and number of epochs
+#                   |                | overridable
+#   Sat Oct 17 2026 | Ekkehard Blanz | added sampleData() for the inference
+#                   |                | measurement
+#   Sat Oct 17 2026 | Ekkehard Blanz | stored weights can replace the training
+#   Sat Oct 17 2026 | Ekkehard Blanz | the output layer computes in float32
+#   Sat Oct 17 2026 | Ekkehard Blanz | added synthetic data
+#   Sat Oct 17 2026 | Ekkehard Blanz | added phase marks
+#   Sat Oct 17 2026 | Ekkehard Blanz | added trace spans
 #                   |                |
 
 import time
@@ -36,39 +48,144 @@ from keras.utils import to_categorical
 
 from keras.datasets import mnist
 
-def testRun( dtype ):
+from datasetCache import cachedArrays
+import syntheticData
+import phaseTimer
+import spanTracer
 
-    (trainImages, trainLabels), (testImages, testLabels) = mnist.load_data()
-
-    # convert 28 x 28 image matrices into 784 x 1 vectors
-    trainImages = trainImages.reshape( (60000, 28*28) )
-    trainImages = trainImages.astype( dtype ) / 255
 
-    testImages = testImages.reshape( (10000, 28*28) )
-    testImages = testImages.astype( dtype ) / 255
+@spanTracer.traced
+def prepData( dtype ):
+    """!
+    @brief Load the MNIST dataset and preprocess it.
+    @param dtype data type of the result
+    @return dictionary with the 28 x 28 training and test images scaled to
+            [0, 1] and their one-hot encoded labels
+    """
 
-    trainLabels = to_categorical( trainLabels ).astype( dtype )
-    testLabels = to_categorical( testLabels ).astype( dtype )
+    (trainImages, trainLabels), (testImages, testLabels) = mnist.load_data()
 
+    phaseTimer.begin( "preprocessing" )
+
+    return {"trainImages": trainImages.astype( dtype ) / 255,
+            "testImages": testImages.astype( dtype ) / 255,
+            "trainLabels": to_categorical( trainLabels ).astype( dtype ),
+            "testLabels": to_categorical( testLabels ).astype( dtype )}
+
+
+# number of samples per batch - benchmark.py uses it to compute throughputs
+batchSize = 128
+
+# number of training epochs
+epochs = 5
+
+# data of synthetic test runs
+syntheticSpec = {"trainSize": 60000,
+                 "testSize": 10000,
+                 "shape": (28 * 28,),
+                 "inputs": "uniform",
+                 "labels": "oneHot",
+                 "classes": 10}
+
+
+def testRun( dtype, callbacks=None, batchSize=batchSize, epochs=epochs,
+             loadWeights=None, synthetic=False ):
+    """!
+    @param dtype data type of the input data
+    @param callbacks list of Keras callbacks for the training
+    @param batchSize number of samples per batch, the module-level batchSize
+           by default
+    @param epochs number of training epochs, the module-level epochs by
+           default
+    @param loadWeights function that loads stored weights into the compiled
+           network, which is then not trained (see modelStore.py)
+    @param synthetic if True, random data with the shapes of the MNIST images
+           replace the dataset (see syntheticData.py)
+    """
+
+    if synthetic:
+        trainSize = syntheticSpec["trainSize"]
+        testSize = syntheticSpec["testSize"]
+        trainData = syntheticData.batches( syntheticSpec, "train", batchSize,
+                                           dtype )
+        testData = syntheticData.batches( syntheticSpec, "test", batchSize,
+                                          dtype )
+    else:
+        data = cachedArrays( "mnist", {"dtype": dtype},
+                             lambda: prepData( dtype ) )
+
+        # convert 28 x 28 image matrices into 784 x 1 vectors
+        trainImages = data["trainImages"].reshape( (60000, 28*28) )
+        testImages = data["testImages"].reshape( (10000, 28*28) )
+
+        trainLabels = data["trainLabels"]
+        testLabels = data["testLabels"]
+        trainSize = len( trainLabels )
+        testSize = len( testLabels )
+
+    phaseTimer.begin( "modelBuild" )
     network = models.Sequential()
 
     # "densely connected" layers is keras parlor for "fully connected" layers
     network.add( layers.Dense( 512, activation="relu", input_shape=(28*28,) ) )
     # the softmax activatio function gives us probabilities that sum up to 1
-    network.add( layers.Dense( 10, activation="softmax" ) )
+    # float32 output under mixed precision
+    network.add( layers.Dense( 10, activation="softmax",
+                               dtype="float32" ) )
 
 
     network.compile( optimizer="rmsprop", loss="categorical_crossentropy",
                      metrics=["accuracy"] )
 
-    start = time.time()
-    network.fit( trainImages, trainLabels, epochs=5, batch_size=128 )
-    trainingTime = time.time() - start
+    if loadWeights is not None:
+        # the stored weights replace the training
+        loadWeights( network )
+        trainingTime = 0
+    else:
+        start = time.time()
+        if synthetic:
+            network.fit_generator( trainData,
+                                   steps_per_epoch=syntheticData.steps(
+                                       trainSize, batchSize ),
+                                   epochs=epochs,
+                                   callbacks=callbacks )
+        else:
+            network.fit( trainImages, trainLabels, epochs=epochs,
+                         batch_size=batchSize, callbacks=callbacks )
+        trainingTime = time.time() - start
 
     start = time.time()
     # loss is e.g. least squares error, accuracy is after non-linear decision
-    testLoss, testAccuracy = network.evaluate( testImages, testLabels )
+    with spanTracer.span( "evaluate", "training" ):
+        if synthetic:
+            testLoss, testAccuracy = network.evaluate_generator(
+                testData, steps=syntheticData.steps( testSize, batchSize ) )
+        else:
+            testLoss, testAccuracy = network.evaluate( testImages, testLabels )
     testTime = time.time() - start
 
-    return (len( trainImages ), len( testImages ),
+    return (trainSize, testSize,
             trainingTime, testTime, testAccuracy, network)
+
+
+def sampleData( dtype, subset="test", count=None, synthetic=False ):
+    """!
+    @brief Return samples preprocessed in the same way as testRun() feeds
+           them to the network, e.g. for measuring the inference.
+    @param dtype data type of the samples
+    @param subset "train" or "test"
+    @param count maximum number of samples or None for all of them
+    @param synthetic if True, random samples as in synthetic test runs are
+           returned
+    @return (inputs, labels) tuple
+    """
+
+    if synthetic:
+        return syntheticData.samples( syntheticSpec, subset, dtype, count )
+
+    data = cachedArrays( "mnist", {"dtype": dtype},
+                         lambda: prepData( dtype ) )
+
+    images = data[subset + "Images"][:count]
+    return (images.reshape( (len( images ), 28 * 28) ),
+            data[subset + "Labels"][:count])
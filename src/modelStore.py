@@ -0,0 +1,129 @@
+# Python Implementation: store of trained network weights
+# -*- coding: utf-8 -*-
+##
+# @file       modelStore.py
+#
+# @version    1.0.0
+#
+# @par Purpose
+#             Store the weights of trained benchmark networks, so that the
+#             evaluation and inference of a network can be benchmarked without
+#             training it first, e.g. on a slow device with weights trained on
+#             a fast host.
+#
+# @par Comments
+#             The weights are stored as HDF5 files in $TEMP/dlBenchmarks/models
+#             (or /tmp/dlBenchmarks/models).  A file is keyed by the name of
+#             the benchmark module, a hash of the architecture of the network
+#             and the data type, so weights are never loaded into a network
+#             they do not fit.  The architecture hash is computed from the
+#             configuration of the network without the names of its layers,
+#             which Keras numbers consecutively within a session.  To
+#             benchmark a device with weights trained elsewhere, the files are
+#             copied into the same directory on the device.  Files are written
+#             under a temporary name and renamed when they are complete.
+#
+#             This is Python 3 code!
+
+# Known Bugs: none
+#
+# @author     Ekkehard Blanz <Ekkehard.Blanz@gmail.com> (C) 2026
+#
+# @copyright  See COPYING file that comes with this distribution
+#
+# File history:
+#
+#      Date         | Author         | Modification
+#  -----------------+----------------+------------------------------------------
+#   Sat Oct 17 2026 | Ekkehard Blanz | created
+#                   |                |
+
+import os
+import json
+import hashlib
+
+
+def storeDirectory():
+    """!
+    @brief Return the directory of the stored weights, creating it if
+           necessary.
+    @return path of the directory
+    """
+    storeDir = os.path.join( os.getenv( "TEMP", "/tmp" ), "dlBenchmarks",
+                             "models" )
+    os.makedirs( storeDir, exist_ok=True )
+    return storeDir
+
+
+def stripNames( config ):
+    """!
+    @brief Remove the names from a network configuration.
+    @param config configuration as decoded from Model.to_json()
+    @return configuration without name entries
+    """
+    if isinstance( config, dict ):
+        return {key: stripNames( value ) for key, value in config.items()
+                if key != "name"}
+    if isinstance( config, list ):
+        return [stripNames( value ) for value in config]
+    return config
+
+
+def architectureHash( network ):
+    """!
+    @brief Compute a hash of the architecture of a network.
+    @param network Keras model
+    @return hexadecimal digest
+    """
+    config = stripNames( json.loads( network.to_json() )["config"] )
+    return hashlib.sha1( json.dumps( config,
+                                     sort_keys=True ).encode() ).hexdigest()
+
+
+def weightsFile( module, network, dtype ):
+    """!
+    @brief Compose the name of the weights file of a network.
+    @param module name of the benchmark module
+    @param network Keras model
+    @param dtype data type of the network
+    @return path of the weights file
+    """
+    return os.path.join( storeDirectory(), "{0}_{1}_{2}.h5".format(
+        module, architectureHash( network )[:16], dtype ) )
+
+
+def saveWeights( module, network, dtype ):
+    """!
+    @brief Store the weights of a trained network.
+    @param module name of the benchmark module
+    @param network trained Keras model
+    @param dtype data type of the network
+    @return path of the weights file
+    """
+    fileName = weightsFile( module, network, dtype )
+    directory, baseName = os.path.split( fileName )
+    # Keras derives the format from the extension of the file name
+    tmpName = os.path.join( directory, ".{0}.{1}.h5".format( baseName,
+                                                              os.getpid() ) )
+    network.save_weights( tmpName )
+    os.replace( tmpName, fileName )
+    return fileName
+
+
+def loadWeights( module, network, dtype ):
+    """!
+    @brief Load the stored weights into a network.
+    @param module name of the benchmark module
+    @param network compiled Keras model with the architecture the weights were
+           stored with
+    @param dtype data type of the network
+    @return path of the weights file
+    @throw FileNotFoundError if no weights are stored for the network
+    """
+    fileName = weightsFile( module, network, dtype )
+    if not os.path.isfile( fileName ):
+        raise FileNotFoundError( "No weights of {0} with this architecture "
+                                 "and {1} stored in {2}".format(
+                                     module, dtype, fileName ) )
+    network.load_weights( fileName )
+    return fileName
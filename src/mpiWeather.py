@@ -3,7 +3,7 @@
 ##
 # @file       mpiWeather.py
 #
-# @version    1.0.0
+# @version    1.11.0
 #
 # @par Purpose
 #             Run a MPI Jena weather classification task using keras.
@@ -17,7 +17,7 @@
 
 # Known Bugs: none
 #
-# @author     Ekkehard Blanz <Ekkehard.Blanz@gmail.com> (C) 2019
+# @author     Ekkehard Blanz <Ekkehard.Blanz@gmail.com> (C) 2019-2026
 #
 # @copyright  See COPYING file that comes with this distribution
 #
@@ -26,97 +26,82 @@
 #      Date         | Author         | Modification
 #  -----------------+----------------+------------------------------------------
 #   Wed Jul 17 2019 | Ekkehard Blanz | converted from Chollet's book
+#   Sat Oct 17 2026 | Ekkehard Blanz | moved data preparation and generator
+#                   |                | to weatherData.py
+#   Sat Oct 17 2026 | Ekkehard Blanz | added callbacks parameter and
+#                   |                | module-level batch size
+#   Sat Oct 17 2026 | Ekkehard Blanz | added tf.data input pipeline option
+#   Sat Oct 17 2026 | Ekkehard Blanz | made batch size and number of epochs
+#                   |                | overridable
+#   Sat Oct 17 2026 | Ekkehard Blanz | added sampleData() for the inference
+#                   |                | measurement
+#   Sat Oct 17 2026 | Ekkehard Blanz | stored weights can replace the training
+#   Sat Oct 17 2026 | Ekkehard Blanz | the output layer computes in float32
+#   Sat Oct 17 2026 | Ekkehard Blanz | sampleData draws training samples at
+#                   |                | random
+#   Sat Oct 17 2026 | Ekkehard Blanz | added synthetic data
+#   Sat Oct 17 2026 | Ekkehard Blanz | added phase marks
+#   Sat Oct 17 2026 | Ekkehard Blanz | added trace spans
 #                   |                |
 
-import os
 import time
-import numpy as np
 
 from keras import models
 from keras import layers
 
-def prepData( originalDatasetDir, trainSize ):
+from weatherData import (prepData, generator, syntheticWindows,
+                         syntheticSpec, climateRows, climateColumns)
+import syntheticData
+import phaseTimer
+import spanTracer
+from inputPipeline import checkMode, windowDataset
 
-    fname = os.path.join( originalDatasetDir, 'mpi_roof_2009_2016.csv' )
 
-    f = open(fname)
-    data = f.read()
-    f.close()
+# number of samples per batch - benchmark.py uses it to compute throughputs
+batchSize = 128
 
-    lines = data.split('\n')
-    header = lines[0].split(',')
-    if lines[-1]:
-        lines = lines[1:]
-    else:
-        lines = lines[1:-1]
-
-    float_data = np.zeros((len(lines), len(header) - 1))
-    for i, line in enumerate(lines):
-        values = [float(x) for x in line.split(',')[1:]]
-        float_data[i, :] = values
-
-    mean = float_data[:trainSize].mean(axis=0)
-    float_data -= mean
-    std = float_data[:trainSize].std(axis=0)
-    float_data /= std
-
-    return float_data
+# number of training epochs
+epochs = 10
 
 
-def generator( data, lookback, delay, min_index, max_index,
-               shuffle=False, batch_size=128, step=6 ):
+def testRun( dtype, callbacks=None, pipeline="generator", batchSize=batchSize,
+             epochs=epochs, loadWeights=None, synthetic=False ):
     """!
-    @param data The original array of floating-point data, which you
-                normalized above
-    @param lookback How many timesteps back the input data should go
-    @param delay How many timesteps in the future the target should be
-    @param min_index and max_index Indices in the data array that delimit which
-           timesteps to draw from. This is useful for keeping a segment of the
-           data for validation and another for testing
-    @param shuffle Whether to shuffle the samples or draw them in chronological
-           order
-    @param batch_size The number of samples per batch
-    @param step—The period, in timesteps, at which you sample data. You’ll set
-           it to 6 in order to draw one data point every hour
+    @param dtype data type of the input data
+    @param callbacks list of Keras callbacks for the training
+    @param pipeline input pipeline, "generator" or "tfdata" (see
+           inputPipeline.py)
+    @param batchSize number of samples per batch, the module-level batchSize
+           by default
+    @param epochs number of training epochs, the module-level epochs by
+           default
+    @param loadWeights function that loads stored weights into the compiled
+           network, which is then not trained (see modelStore.py)
+    @param synthetic if True, random windows of the same shape replace the
+           climate data (see syntheticData.py)
     """
 
-    if max_index is None:
-        max_index = len(data) - delay - 1
-    i = min_index + lookback
-    while 1:
-        if shuffle:
-            rows = np.random.randint(
-                min_index + lookback, max_index, size=batch_size)
-        else:
-            if i + batch_size >= max_index:
-                i = min_index + lookback
-            rows = np.arange(i, min(i + batch_size, max_index))
-            i += len(rows)
-
-        samples = np.zeros((len(rows),
-                           lookback // step,
-                           data.shape[-1]))
-        targets = np.zeros((len(rows),))
-        for j, row in enumerate(rows):
-            indices = range(rows[j] - lookback, rows[j], step)
-            samples[j] = data[indices]
-            targets[j] = data[rows[j] + delay][1]
-        yield samples, targets
-
-
-
-def testRun( dtype ):
-
     lookback = 1440  # ten days
     step = 6         # one hour
     delay = 144      # one day - which element to predict
-    batch_size = 128
-    epochs = 10
+    batch_size = batchSize
     trainSize = 200000
     validationSize = 100000
 
-    float_data = prepData( "../../Data/mpiJenaClimate", trainSize )
-    testSize = len( float_data ) - (trainSize + validationSize + delay) - 1
+    # 500 batches of the default 128 samples per epoch for any batch size
+    stepsPerEpoch = max( 1, 500 * 128 // batch_size )
+
+    tfdata = checkMode( pipeline )
+    inputData = windowDataset if tfdata else generator
+
+    if synthetic:
+        inputData = syntheticWindows
+        float_data = None
+        rows, features = climateRows, climateColumns
+    else:
+        float_data = prepData( "../../Data/mpiJenaClimate", trainSize )
+        rows, features = float_data.shape
+    testSize = rows - (trainSize + validationSize + delay) - 1
 
     # customizations
     #trainSize = 0
@@ -128,36 +113,39 @@ def testRun( dtype ):
     if trainSize:
         first = 0
         last = trainSize
-        train_gen = generator( float_data,
+        train_gen = inputData( float_data,
                                lookback=lookback,
                                delay=delay,
                                min_index=first,
                                max_index=last,
                                shuffle=True,
                                step=step,
-                               batch_size=batch_size )
+                               batch_size=batch_size,
+                               dtype=dtype )
 
     if validationSize:
         first = last
         last = first + validationSize
-        val_gen = generator( float_data,
+        val_gen = inputData( float_data,
                              lookback=lookback,
                              delay=delay,
                              min_index=first,
                              max_index=last,
                              step=step,
-                             batch_size=batch_size)
+                             batch_size=batch_size,
+                             dtype=dtype )
 
     if testSize:
         first = last
         last = first + testSize
-        test_gen = generator( float_data,
+        test_gen = inputData( float_data,
                               lookback=lookback,
                               delay=delay,
                               min_index=first,
                               max_index=last,
                               step=step,
-                              batch_size=batch_size )
+                              batch_size=batch_size,
+                              dtype=dtype )
 
 
 
@@ -172,35 +160,49 @@ def testRun( dtype ):
     else:
         test_steps = 0
 
+    phaseTimer.begin( "modelBuild" )
     network = models.Sequential()
-    network.add( layers.GRU( 32, input_shape=(None, float_data.shape[-1]) ) )
-    network.add( layers.Dense( 1 ) )
+    network.add( layers.GRU( 32, input_shape=(None, features) ) )
+    # float32 output under mixed precision
+    network.add( layers.Dense( 1, dtype="float32" ) )
 
 
     network.compile( optimizer="rmsprop", loss="mae" )
 
-    if trainSize:
+    if tfdata:
+        fit, evaluate = network.fit, network.evaluate
+    else:
+        fit, evaluate = network.fit_generator, network.evaluate_generator
+
+    if loadWeights is not None:
+        # the stored weights replace the training
+        loadWeights( network )
+        trainingTime = 0
+    elif trainSize:
         start = time.time()
         if val_steps:
-            history = network.fit_generator( train_gen,
-                                             steps_per_epoch=500,
-                                             epochs=epochs,
-                                             validation_data=val_gen,
-                                             validation_steps=val_steps )
+            history = fit( train_gen,
+                           steps_per_epoch=stepsPerEpoch,
+                           epochs=epochs,
+                           validation_data=val_gen,
+                           validation_steps=val_steps,
+                           callbacks=callbacks )
             # do whatever analysis with history
         else:
-            network.fit_generator( train_gen,
-                                   steps_per_epoch=500,
-                                   epochs=epochs )
+            fit( train_gen,
+                 steps_per_epoch=stepsPerEpoch,
+                 epochs=epochs,
+                 callbacks=callbacks )
         trainingTime = time.time() - start
     else:
         trainingTime = 0
 
     if testSize:
         start = time.time()
-        testLoss = network.evaluate_generator( test_gen,
-                                               steps=(test_steps // batch_size),
-                                               verbose=1 )
+        with spanTracer.span( "evaluate", "training" ):
+            testLoss = evaluate( test_gen,
+                                 steps=(test_steps // batch_size),
+                                 verbose=1 )
         testAccuracy = None # not a classification task
         testTime = time.time() - start
     else:
@@ -209,3 +211,55 @@ def testRun( dtype ):
 
     return (trainSize, testSize,
             trainingTime, testTime, testAccuracy, network)
+
+
+def sampleData( dtype, subset="test", count=None, synthetic=False ):
+    """!
+    @brief Return windows prepared in the same way as testRun() feeds them to
+           the network, e.g. for measuring the inference.
+
+    The test windows are drawn in chronological order from the start of the
+    test range of testRun(), the training windows at random from the whole
+    training range, so that they cover all seasons.  The whole test set does
+    not fit into memory on small devices, so 4096 windows are returned by
+    default.
+    @param dtype data type of the samples
+    @param subset "train" or "test"
+    @param count number of windows or None for 4096
+    @param synthetic if True, random samples as in synthetic test runs are
+           returned
+    @return (inputs, targets) tuple
+    """
+
+    if synthetic:
+        return syntheticData.samples( syntheticSpec, subset, dtype, count )
+
+    # the same windows and ranges as in testRun()
+    lookback = 1440
+    step = 6
+    delay = 144
+    trainSize = 200000
+    validationSize = 100000
+
+    float_data = prepData( "../../Data/mpiJenaClimate", trainSize )
+    testSize = len( float_data ) - (trainSize + validationSize + delay) - 1
+
+    if subset == "train":
+        first, last = 0, trainSize
+    else:
+        first, last = trainSize, trainSize + testSize
+    if count is None:
+        count = 4096
+
+    samples, targets = next( generator( float_data,
+                                        lookback=lookback,
+                                        delay=delay,
+                                        min_index=first,
+                                        max_index=last,
+                                        shuffle=subset == "train",
+                                        step=step,
+                                        batch_size=count,
+                                        dtype=dtype,
+                                        buffers=1 ) )
+    # the generator reuses its buffers
+    return samples.copy(), targets.copy()
@@ -0,0 +1,160 @@
+# Python Implementation: periodic sampling during the phases of a test run
+# -*- coding: utf-8 -*-
+##
+# @file       phaseSampler.py
+#
+# @version    1.0.0
+#
+# @par Purpose
+#             Provide the base class of the Keras callbacks that sample
+#             quantities like the memory usage or the CPU load in a background
+#             thread during a test run and assign every sample to a phase of
+#             the test run.
+#
+# @par Comments
+#             The phases are
+#
+#             dataPrep     from the start of the test run to the beginning of
+#                          the training, i.e. loading and preprocessing the
+#                          data and building the model
+#             training     the training
+#             evaluation   from the end of the training to the end of the test
+#                          run
+#
+#             The phases are switched by the callback methods Keras calls at
+#             the beginning and the end of the training, each of which also
+#             takes a last sample of the phase that ends.  Derived classes
+#             implement measure(), which returns a dictionary of the sampled
+#             quantities; the samples are kept as one list per quantity, plus
+#             the lists time and phase, all of the same length.
+#
+#             This is Python 3 code!
+
+# Known Bugs: none
+#
+# @author     Ekkehard Blanz <Ekkehard.Blanz@gmail.com> (C) 2026
+#
+# @copyright  See COPYING file that comes with this distribution
+#
+# File history:
+#
+#      Date         | Author         | Modification
+#  -----------------+----------------+------------------------------------------
+#   Sat Oct 17 2026 | Ekkehard Blanz | created from memorySampler.py
+#                   |                |
+
+import time
+import threading
+
+from keras import callbacks
+
+
+# phases of a test run in their sequence
+phases = ("dataPrep", "training", "evaluation")
+
+
+class PhaseSampler( callbacks.Callback ):
+    """!
+    @brief Keras callback sampling quantities in a background thread.
+
+    start() has to be called before and stop() after the test run.
+    """
+
+    def __init__( self, interval=0.5 ):
+        """!
+        @brief Constructor.
+        @param interval time between two samples in seconds
+        """
+        super().__init__()
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.stopEvent = threading.Event()
+        self.thread = None
+        self.phase = phases[0]
+        self.startTime = 0.
+        self.series = {"time": [], "phase": []}
+
+
+    def measure( self ):
+        """!
+        @brief Measure the sampled quantities - to be implemented by derived
+               classes.
+        @return dictionary of quantity names to values
+        """
+        raise NotImplementedError
+
+
+    def start( self ):
+        """!
+        @brief Start sampling in the data preparation phase.
+        """
+        self.phase = phases[0]
+        self.startTime = time.perf_counter()
+        self.stopEvent.clear()
+        self.sample()
+        self.thread = threading.Thread( target=self.run, daemon=True )
+        self.thread.start()
+
+
+    def stop( self ):
+        """!
+        @brief Stop sampling after a last sample.
+        """
+        self.stopEvent.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+        self.sample()
+
+
+    def run( self ):
+        while not self.stopEvent.wait( self.interval ):
+            self.sample()
+
+
+    def sample( self ):
+        """!
+        @brief Take one sample in the current phase.
+        """
+        with self.lock:
+            values = self.measure()
+            self.series["time"].append( time.perf_counter() - self.startTime )
+            self.series["phase"].append( self.phase )
+            for name, value in values.items():
+                self.series.setdefault( name, [] ).append( value )
+
+
+    def on_train_begin( self, logs=None ):
+        # the last sample of a phase covers the time up to its very end
+        self.sample()
+        self.phase = "training"
+
+
+    def on_train_end( self, logs=None ):
+        self.sample()
+        self.phase = "evaluation"
+
+
+    def samples( self ):
+        """!
+        @brief Return a copy of the samples taken so far.
+        @return dictionary of quantity names to lists of values
+        """
+        with self.lock:
+            return {name: list( values )
+                    for name, values in self.series.items()}
+
+
+def phaseIndices( series ):
+    """!
+    @brief Find the samples of every phase.
+    @param series samples as returned by PhaseSampler.samples()
+    @return dictionary of the phases that were sampled to lists of indices
+    """
+    indices = {}
+    for phase in phases:
+        index = [i for i, name in enumerate( series["phase"] )
+                 if name == phase]
+        if index:
+            indices[phase] = index
+    return indices
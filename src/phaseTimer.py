@@ -0,0 +1,138 @@
+# Python Implementation: wall time of the phases of a benchmark
+# -*- coding: utf-8 -*-
+##
+# @file       phaseTimer.py
+#
+# @version    1.0.0
+#
+# @par Purpose
+#             Measure how the wall time of a benchmark divides into its
+#             phases, from the start of the interpreter and the import of the
+#             framework to the training, the evaluation and the writing of the
+#             log, so that it becomes visible where the time goes on slow
+#             devices.
+#
+# @par Comments
+#             There is one timer per process, which is driven by the
+#             module-level function begin(): every call ends the current phase
+#             and begins the next one, and the time of phases that occur
+#             several times, e.g. in repeated test runs, is summed up.
+#             benchmark.py begins the phases it runs itself and the
+#             datasetLoad phase of every test run, the benchmark modules begin
+#             the preprocessing and modelBuild phases, and PhaseCallback in
+#             timingCallback.py begins the firstBatch, training and evaluation
+#             phases.  A module that is not run by benchmark.py only feeds a
+#             timer that nobody reads.  These phases divide the whole
+#             benchmark more finely than the three phases of a test run in
+#             phaseSampler.py, to which the memory and load samples belong.
+#
+#             This module must not import anything heavy, since it is imported
+#             before the framework import is timed.
+#
+#             This is Python 3 code!
+
+# Known Bugs: none
+#
+# @author     Ekkehard Blanz <Ekkehard.Blanz@gmail.com> (C) 2026
+#
+# @copyright  See COPYING file that comes with this distribution
+#
+# File history:
+#
+#      Date         | Author         | Modification
+#  -----------------+----------------+------------------------------------------
+#   Sat Oct 17 2026 | Ekkehard Blanz | created
+#                   |                |
+
+import time
+
+
+class PhaseTimer:
+    """!
+    @brief Accumulate the wall time of named phases.
+    """
+
+    def __init__( self ):
+        """!
+        @brief Constructor.
+        """
+        self.times = {}
+        self.counts = {}
+        self.current = None
+        self.start = 0.
+
+
+    def add( self, name, seconds ):
+        """!
+        @brief Add time to a phase that was measured otherwise.
+        @param name name of the phase
+        @param seconds time in seconds
+        """
+        self.times[name] = self.times.get( name, 0. ) + seconds
+        self.counts[name] = self.counts.get( name, 0 ) + 1
+
+
+    def begin( self, name ):
+        """!
+        @brief End the current phase, if any, and begin the next one.
+
+        Beginning the current phase again has no effect, so that a phase can
+        be begun at several places that may follow each other.
+        @param name name of the next phase
+        """
+        if name == self.current:
+            return
+        now = time.perf_counter()
+        if self.current is not None:
+            self.add( self.current, now - self.start )
+        self.current = name
+        self.start = now
+
+
+    def end( self ):
+        """!
+        @brief End the current phase.
+        """
+        if self.current is not None:
+            self.add( self.current, time.perf_counter() - self.start )
+            self.current = None
+
+
+    def summary( self ):
+        """!
+        @brief Return the accumulated times of all phases that ended.
+        @return dictionary of phase names in the sequence they first occurred
+                to dictionaries with the total time in seconds (time) and the
+                number of occurrences (count)
+        """
+        return {name: {"time": seconds, "count": self.counts[name]}
+                for name, seconds in self.times.items()}
+
+
+    def report( self ):
+        """!
+        @brief Format the times of all phases that ended as a table for the
+               log.
+        @return multi-line string
+        """
+        total = sum( self.times.values() )
+        text = "Phase breakdown (total {0:.3f} s):\n".format( total )
+        text += "Phase                Time [s]   Share  Count\n"
+        for name, seconds in self.times.items():
+            text += "{0:18s} {1:10.3f} {2:6.1f} % {3:6d}\n".format(
+                name, seconds, seconds / total * 100 if total > 0 else 0.,
+                self.counts[name] )
+        return text
+
+
+# the timer of this process
+timer = PhaseTimer()
+
+
+def begin( name ):
+    """!
+    @brief End the current phase of the timer of this process and begin the
+           next one.
+    @param name name of the next phase
+    """
+    timer.begin( name )
@@ -0,0 +1,274 @@
+# Python Implementation: TensorFlow profiler capture of a range of steps
+# -*- coding: utf-8 -*-
+##
+# @file       profileCapture.py
+#
+# @version    1.0.0
+#
+# @par Purpose
+#             Capture a TensorFlow profile of a range of training steps of any
+#             benchmark and summarize the operations with the highest self
+#             time, so that differences between platforms can be attributed
+#             to specific kernels like Conv2D or GRU.
+#
+# @par Comments
+#             The step range is given as [E:]F-L, the training steps (batches)
+#             F to L of epoch E, all counted from 1 and inclusive; the epoch
+#             is 1 if it is omitted.  ProfilerCallback starts the profiler
+#             before step F and stops it after step L or at the end of the
+#             epoch, whichever comes first.  The profile is written by
+#             tf.profiler.experimental into the given directory as
+#             plugins/profile/<time stamp>/<host>.xplane.pb, where
+#             TensorBoard shows it with its profile plugin, including the
+#             input pipeline analysis and the trace viewer.
+#
+#             The summary is computed from the XPlane files directly.  Events
+#             named <op name>:<op type>, TensorFlow's convention for the
+#             executions of operations on the host and on devices, are taken
+#             as operations and aggregated by type.  The self time of an
+#             operation is its duration minus the durations of the operations
+#             nested in it on the same thread, e.g. the body of a While
+#             operation.  The events of the tf.data iterators (Iterator::...)
+#             are summed up separately as the time of the input pipeline; only
+#             outermost iterator events count.  If the XPlane protocol buffer
+#             module of the installed TensorFlow cannot be found, the profile
+#             is still written but not summarized.
+#
+#             This is Python 3 code!
+
+# Known Bugs: none
+#
+# @author     Ekkehard Blanz <Ekkehard.Blanz@gmail.com> (C) 2026
+#
+# @copyright  See COPYING file that comes with this distribution
+#
+# File history:
+#
+#      Date         | Author         | Modification
+#  -----------------+----------------+------------------------------------------
+#   Sat Oct 17 2026 | Ekkehard Blanz | created
+#                   |                |
+
+import os
+import re
+import glob
+import importlib
+
+import tensorflow as tf
+from keras import callbacks
+
+
+# number of operation types the log lists by default
+defaultTop = 20
+
+# modules of the XPlane protocol buffers in different TensorFlow versions
+xplaneModules = ["tsl.profiler.protobuf.xplane_pb2",
+                 "tensorflow.tsl.profiler.protobuf.xplane_pb2",
+                 "tensorflow.core.profiler.protobuf.xplane_pb2"]
+
+# names of the events of operations and of the tf.data iterators
+opPattern = re.compile( r"^([^:]*):([A-Za-z_][A-Za-z0-9_]*)$" )
+iteratorPrefix = "Iterator::"
+
+
+def parseStepRange( text ):
+    """!
+    @brief Parse a step range.
+    @param text step range as [E:]F-L, counted from 1
+    @return (epoch, first, last) tuple, counted from 1
+    @throw ValueError if the text is not a valid step range
+    """
+    match = re.match( r"^(?:(\d+):)?(\d+)-(\d+)$", text.strip() )
+    if not match:
+        raise ValueError( "step range {0} is not of the form "
+                          "[epoch:]first-last".format( text ) )
+    epoch = int( match.group( 1 ) or 1 )
+    first = int( match.group( 2 ) )
+    last = int( match.group( 3 ) )
+    if epoch < 1 or first < 1 or last < first:
+        raise ValueError( "step range {0} is empty or does not start at 1 "
+                          "or later".format( text ) )
+    return epoch, first, last
+
+
+class ProfilerCallback( callbacks.Callback ):
+    """!
+    @brief Keras callback running the TensorFlow profiler during a range of
+           training steps.
+
+    After training, capturedSteps holds the number of steps that were
+    profiled, which is smaller than the range if the epoch has fewer steps.
+    """
+
+    def __init__( self, logDir, epoch, first, last ):
+        """!
+        @brief Constructor.
+        @param logDir directory the profile is written to
+        @param epoch epoch of the steps, counted from 1
+        @param first first profiled step, counted from 1
+        @param last last profiled step, counted from 1
+        """
+        super().__init__()
+        self.logDir = logDir
+        self.epoch = epoch
+        self.first = first
+        self.last = last
+        self.currentEpoch = 0
+        self.active = False
+        self.capturedSteps = 0
+
+
+    def startProfiler( self ):
+        tf.profiler.experimental.start( self.logDir )
+        self.active = True
+
+
+    def stopProfiler( self ):
+        if self.active:
+            tf.profiler.experimental.stop()
+            self.active = False
+
+
+    def on_epoch_begin( self, epoch, logs=None ):
+        self.currentEpoch = epoch + 1
+
+
+    def on_batch_begin( self, batch, logs=None ):
+        if self.currentEpoch == self.epoch and batch + 1 == self.first:
+            self.startProfiler()
+
+
+    def on_batch_end( self, batch, logs=None ):
+        if self.active:
+            self.capturedSteps += 1
+            if batch + 1 >= self.last:
+                self.stopProfiler()
+
+
+    def on_epoch_end( self, epoch, logs=None ):
+        self.stopProfiler()
+
+
+    def on_train_end( self, logs=None ):
+        self.stopProfiler()
+
+
+def xplaneModule():
+    """!
+    @brief Import the XPlane protocol buffer module of the installed
+           TensorFlow.
+    @return module or None if none of xplaneModules can be imported
+    """
+    for name in xplaneModules:
+        try:
+            return importlib.import_module( name )
+        except ImportError:
+            continue
+    return None
+
+
+def selfTimes( events ):
+    """!
+    @brief Compute the self times of nested events of one thread.
+    @param events list of (offset, duration, name) tuples in picoseconds
+    @return list of (name, self time in picoseconds) tuples
+    """
+    events = sorted( events, key=lambda event: (event[0], -event[1]) )
+    times = [duration for _, duration, _ in events]
+    stack = []
+    for index, (offset, duration, _) in enumerate( events ):
+        while stack and events[stack[-1]][0] + events[stack[-1]][1] <= offset:
+            stack.pop()
+        if stack:
+            times[stack[-1]] -= duration
+        stack.append( index )
+    return [(event[2], time) for event, time in zip( events, times )]
+
+
+def summarize( logDir, top=defaultTop ):
+    """!
+    @brief Summarize the operations of all profiles in a directory.
+    @param logDir directory the profiles were written to
+    @param top number of operation types to list
+    @return dictionary with the number of XPlane files (files), the total self
+            time of all operations in seconds (opTime), the time of the input
+            pipeline in seconds (inputPipelineTime) and the list of the top
+            operation types (ops) with their type, self time in seconds
+            (selfTime), number of executions (count) and share of opTime
+            (share), or None if the profiles cannot be read
+    """
+    xplane = xplaneModule()
+    fileNames = glob.glob( os.path.join( logDir, "plugins", "profile", "*",
+                                         "*.xplane.pb" ) )
+    if xplane is None or not fileNames:
+        return None
+
+    opTimes = {}
+    opCounts = {}
+    inputPipeline = 0
+    for fileName in fileNames:
+        space = xplane.XSpace()
+        with open( fileName, "rb" ) as f:
+            space.ParseFromString( f.read() )
+        for plane in space.planes:
+            for line in plane.lines:
+                ops = []
+                iterators = []
+                for event in line.events:
+                    metadata = plane.event_metadata[event.metadata_id]
+                    name = metadata.display_name or metadata.name
+                    match = opPattern.match( name )
+                    if match:
+                        ops.append( (event.offset_ps, event.duration_ps,
+                                     match.group( 2 )) )
+                    elif name.startswith( iteratorPrefix ):
+                        iterators.append( (event.offset_ps,
+                                           event.duration_ps, name) )
+                for opType, time in selfTimes( ops ):
+                    opTimes[opType] = opTimes.get( opType, 0 ) + time
+                    opCounts[opType] = opCounts.get( opType, 0 ) + 1
+                # only outermost iterator events keep their full duration
+                end = -1
+                for offset, duration, _ in sorted( iterators ):
+                    if offset >= end:
+                        inputPipeline += duration
+                        end = offset + duration
+
+    total = sum( opTimes.values() )
+    ranking = sorted( opTimes.items(), key=lambda item: -item[1] )[:top]
+    return {"files": len( fileNames ),
+            "opTime": total * 1e-12,
+            "inputPipelineTime": inputPipeline * 1e-12,
+            "ops": [{"type": opType,
+                     "selfTime": time * 1e-12,
+                     "count": opCounts[opType],
+                     "share": time / total if total > 0 else None}
+                    for opType, time in ranking]}
+
+
+def report( profile ):
+    """!
+    @brief Format a profile as a table for the log.
+    @param profile dictionary with the directory (directory), the step range
+           (epoch, first, last), the number of captured steps
+           (capturedSteps) and the summary as returned by summarize()
+           (summary)
+    @return multi-line string
+    """
+    text = "TensorFlow profile of steps {0}-{1} of epoch {2} ({3} steps " \
+           "captured)\nwritten to {4}\n".format(
+               profile["first"], profile["last"], profile["epoch"],
+               profile["capturedSteps"], profile["directory"] )
+    summary = profile["summary"]
+    if summary is None:
+        return text + "No summary - the profile could not be read\n"
+    text += "Operations: {0:.3f} ms self time, input pipeline: {1:.3f} " \
+            "ms\n".format( summary["opTime"] * 1000,
+                           summary["inputPipelineTime"] * 1000 )
+    text += "Operation type               Self time [ms]   Share   Count\n"
+    for op in summary["ops"]:
+        text += "{0:28s} {1:14.3f} {2:6.1f} % {3:7d}\n".format(
+            op["type"][:28], op["selfTime"] * 1000,
+            op["share"] * 100 if op["share"] is not None else 0.,
+            op["count"] )
+    return text
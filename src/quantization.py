@@ -0,0 +1,267 @@
+# Python Implementation: post-training quantization of a trained network
+# -*- coding: utf-8 -*-
+##
+# @file       quantization.py
+#
+# @version    1.0.0
+#
+# @par Purpose
+#             Convert a trained network into TensorFlow Lite models with and
+#             without post-training quantization and measure the size, the
+#             latency and the accuracy of every model on the same test
+#             samples, so that it is known what a device that runs the models
+#             quantized gains and loses.
+#
+# @par Comments
+#             The following models are created:
+#
+#             float32   TensorFlow Lite model without optimization, the
+#                       reference for the quantized ones
+#             dynamic   weights quantized to int8, activations computed in
+#                       floating point (dynamic range quantization)
+#             int8      weights and activations quantized to int8 with the
+#                       ranges of the activations calibrated on a
+#                       representative slice of the training data (full
+#                       integer quantization); the input and output of the
+#                       model stay float32, so it gets the same samples
+#
+#             A conversion that fails, e.g. because an operation has no int8
+#             kernel, is reported with its error rather than aborting the
+#             benchmark.  The latency is measured for single samples as in an
+#             online service, the accuracy on all test samples in batches.
+#             Networks with a linear output are regression networks, for
+#             which the mean absolute error is reported instead of the
+#             accuracy.
+#
+#             This is Python 3 code!
+
+# Known Bugs: none
+#
+# @author     Ekkehard Blanz <Ekkehard.Blanz@gmail.com> (C) 2026
+#
+# @copyright  See COPYING file that comes with this distribution
+#
+# File history:
+#
+#      Date         | Author         | Modification
+#  -----------------+----------------+------------------------------------------
+#   Sat Oct 17 2026 | Ekkehard Blanz | created
+#                   |                |
+
+import time
+import numpy as np
+import tensorflow as tf
+
+import runStatistics
+
+
+# quantization modes in the sequence they are reported
+quantizationModes = ["float32", "dynamic", "int8"]
+
+# number of training samples used to calibrate the int8 model
+representativeSamples = 200
+
+# number of samples per batch when the accuracy is computed
+evaluationBatch = 64
+
+
+def convert( network, mode, representative=None ):
+    """!
+    @brief Convert a network into a TensorFlow Lite model.
+    @param network trained Keras model
+    @param mode one of quantizationModes
+    @param representative array of training samples to calibrate the int8
+           model, not needed for the other modes
+    @return serialized TensorFlow Lite model
+    """
+    converter = tf.lite.TFLiteConverter.from_keras_model( network )
+    if mode == "dynamic":
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    elif mode == "int8":
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        converter.representative_dataset = lambda: (
+            [sample[np.newaxis].astype( np.float32 )]
+            for sample in representative )
+        converter.target_spec.supported_ops = \
+            [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+    elif mode != "float32":
+        raise ValueError( "Unknown quantization mode " + mode )
+    return converter.convert()
+
+
+def predict( interpreter, samples ):
+    """!
+    @brief Predict a batch of samples with a TensorFlow Lite model.
+    @param interpreter tf.lite.Interpreter of the model
+    @param samples array with one sample per row
+    @return array of predictions
+    """
+    inputDetails = interpreter.get_input_details()[0]
+    if inputDetails["shape"][0] != len( samples ):
+        interpreter.resize_tensor_input( inputDetails["index"],
+                                         [len( samples )] +
+                                         list( samples.shape[1:] ) )
+        interpreter.allocate_tensors()
+    interpreter.set_tensor( inputDetails["index"],
+                            samples.astype( inputDetails["dtype"] ) )
+    interpreter.invoke()
+    return interpreter.get_tensor(
+        interpreter.get_output_details()[0]["index"] )
+
+
+def isRegression( network ):
+    """!
+    @brief Tell whether a network solves a regression task.
+    @param network Keras model
+    @return True if the output layer of the network is linear
+    """
+    return network.layers[-1].get_config().get( "activation" ) == "linear"
+
+
+def score( predictions, labels, regression ):
+    """!
+    @brief Compare predictions with the labels.
+    @param predictions array of predictions
+    @param labels array of labels or targets
+    @param regression True for a regression task
+    @return mean absolute error for a regression task, otherwise the
+            classification accuracy (0 to 1)
+    """
+    predictions = predictions.astype( np.float64 )
+    labels = np.asarray( labels, dtype=np.float64 )
+    if regression:
+        return float( np.mean( np.abs( predictions.reshape( labels.shape ) -
+                                       labels ) ) )
+    if predictions.shape[-1] == 1:
+        # binary classification with a sigmoid output
+        hits = (predictions.reshape( labels.shape ) > 0.5) == (labels > 0.5)
+    else:
+        # one-hot encoded labels
+        hits = predictions.argmax( axis=-1 ) == labels.argmax( axis=-1 )
+    return float( np.mean( hits ) )
+
+
+def measureModel( model, samples, labels, regression, threads=None,
+                  repeat=100, warmup=10 ):
+    """!
+    @brief Measure the latency and the accuracy of a TensorFlow Lite model.
+    @param model serialized TensorFlow Lite model
+    @param samples array of test samples
+    @param labels array of test labels or targets
+    @param regression True for a regression task
+    @param threads number of threads of the interpreter or None
+    @param repeat number of measured single-sample predictions
+    @param warmup number of single-sample predictions before the measured
+           ones
+    @return dictionary with the size of the model in bytes, the median
+            (p50), 95th (p95) and 99th (p99) percentile and the mean of the
+            latency of single samples in seconds, the throughput in samples
+            per second and the score as returned by score()
+    """
+    interpreter = tf.lite.Interpreter( model_content=model,
+                                       num_threads=threads )
+    interpreter.allocate_tensors()
+
+    for i in range( warmup ):
+        predict( interpreter, samples[i % len( samples )][np.newaxis] )
+    latencies = []
+    for i in range( repeat ):
+        sample = np.asarray( samples[i % len( samples )][np.newaxis] )
+        start = time.perf_counter()
+        predict( interpreter, sample )
+        latencies.append( time.perf_counter() - start )
+
+    predictions = []
+    for first in range( 0, len( samples ), evaluationBatch ):
+        batch = np.asarray( samples[first:first + evaluationBatch] )
+        predictions.append( predict( interpreter, batch ) )
+
+    stats = runStatistics.summarize( latencies )
+    return {"size": len( model ),
+            "p50": runStatistics.percentile( latencies, 50 ),
+            "p95": runStatistics.percentile( latencies, 95 ),
+            "p99": runStatistics.percentile( latencies, 99 ),
+            "mean": stats["mean"],
+            "throughput": repeat / sum( latencies ),
+            "score": score( np.concatenate( predictions ), labels,
+                            regression )}
+
+
+def compare( network, samples, labels, representative, threads=None,
+             repeat=100, warmup=10 ):
+    """!
+    @brief Convert a network with every quantization mode and measure the
+           resulting models on the same test samples.
+    @param network trained Keras model
+    @param samples array of test samples
+    @param labels array of test labels or targets
+    @param representative array of training samples to calibrate the int8
+           model
+    @param threads number of threads of the interpreter or None
+    @param repeat number of measured single-sample predictions
+    @param warmup number of single-sample predictions before the measured
+           ones
+    @return dictionary with the metric ("accuracy" or "mae"), the number of
+            test samples, the number of measured and warm-up predictions and
+            a list of models with the mode and either the measurements as
+            returned by measureModel() or the error of the conversion
+    """
+    regression = isRegression( network )
+    models = []
+    for mode in quantizationModes:
+        entry = {"mode": mode, "error": None}
+        try:
+            model = convert( network, mode, representative )
+        except Exception as e:
+            # converter errors come from deep inside TensorFlow and have
+            # no common type
+            entry["error"] = "{0}: {1}".format( type( e ).__name__,
+                                                str( e ).splitlines()[0]
+                                                if str( e ) else "" )
+            models.append( entry )
+            continue
+        entry.update( measureModel( model, samples, labels, regression,
+                                    threads, repeat, warmup ) )
+        models.append( entry )
+    return {"metric": "mae" if regression else "accuracy",
+            "samples": len( samples ),
+            "repeat": repeat,
+            "warmup": warmup,
+            "models": models}
+
+
+def report( comparison ):
+    """!
+    @brief Format the comparison of the models as a table for the log.
+    @param comparison dictionary as returned by compare()
+    @return multi-line string
+    """
+    regression = comparison["metric"] == "mae"
+    text = "Quantization (TensorFlow Lite, single-sample latency over {0} " \
+           "samples after {1} warm-up,\n{2} on {3} test samples):\n".format(
+               comparison["repeat"], comparison["warmup"],
+               "mean absolute error" if regression else "accuracy",
+               comparison["samples"] )
+    text += "Model    Size [kB]  p50 [ms]  p95 [ms]  p99 [ms]   Samples/s" + \
+            ("        MAE\n" if regression else "  Accuracy [%]\n")
+    reference = None
+    for entry in comparison["models"]:
+        text += "{0:8s}".format( entry["mode"] )
+        if entry["error"] is not None:
+            text += " conversion failed - " + entry["error"] + "\n"
+            continue
+        if reference is None:
+            reference = entry
+        text += " {0:9.1f} {1:9.3f} {2:9.3f} {3:9.3f} {4:11.1f}".format(
+            entry["size"] / 1024, entry["p50"] * 1000, entry["p95"] * 1000,
+            entry["p99"] * 1000, entry["throughput"] )
+        if regression:
+            text += " {0:10.4f}".format( entry["score"] )
+        else:
+            text += " {0:13.2f}".format( entry["score"] * 100 )
+        if entry is not reference:
+            text += "  ({0:.2f}x faster, {1:.1f}x smaller)".format(
+                reference["p50"] / entry["p50"],
+                reference["size"] / entry["size"] )
+        text += "\n"
+    return text
@@ -0,0 +1,425 @@
+#!/usr/bin/env python3
+
+# Python Implementation: machine-readable benchmark result records
+# -*- coding: utf-8 -*-
+##
+# @file       resultRecord.py
+#
+# @version    1.13.0
+#
+# @par Purpose
+#             Create, write and read structured result records of benchmark
+#             runs and import the legacy text logs into the same schema.
+#
+# @par Synopsis:
+#                 resultRecord.py [-o <output file>] [<log directory>]
+#             converts all logs in the log directory (../logs by default) into
+#             result records and writes them as JSON lines to the output file
+#             or to standard output.  Logs that already have a record file are
+#             not parsed but their records are copied.
+#
+# @par Comments
+#             Next to every log file <name>.log, benchmark.py writes a record
+#             file <name>.jsonl with one JSON object per measured run.  A
+#             record is a dictionary with the following keys:
+#
+#             schema          version of the record schema
+#             source          "benchmark" or "legacy" for imported logs
+#             module          name of the benchmark module
+#             platform        vendor, architecture and mlc device as used in
+#                             the log file name, e.g. AppleM1_gpu
+#             experiment      experiment number or None
+#             run             index of the measured run, starting with 0
+#             repeat          number of measured runs
+#             warmup          number of discarded warm-up runs
+#             hardware        dictionary with brand, bits, cores, frequency,
+#                             memoryGB and gpuAvailable, and as described in
+#                             hardwareInfo.py the effective number of cores
+#                             (effectiveCores), the CPU quota in cores
+#                             (cpuQuota), the memory limit in bytes
+#                             (memoryLimit), the instruction set extensions
+#                             (isa) and the cores of every NUMA node
+#                             (numaNodes), all None in imported logs
+#             device          mlc device ("cpu", "gpu" or "any") or None
+#             dtype           floating-point precision of the data
+#             precision       dictionary with the name of the Keras precision
+#                             policy (policy), the compute and variable data
+#                             types (computeDtype, variableDtype) and whether
+#                             the loss was scaled (lossScaling), each None if
+#                             no policy was selected
+#             tfVersion       TensorFlow version or None
+#             threads         dictionary with the number of intraOp and
+#                             interOp threads and the list of cores the
+#                             process was pinned to (affinity), each None if
+#                             not set
+#             options         dictionary of the options passed to testRun
+#             memory          dictionary with the peak resident set size of
+#                             the process in bytes at the end of the run
+#                             (peakRSS) and, if the memory was sampled, the
+#                             sampling interval, the peak memory of every
+#                             phase and the time series as returned by
+#                             MemorySampler.summary()
+#             utilization     sampling interval, mean CPU and GPU loads of
+#                             every phase and time series as returned by
+#                             UtilizationSampler.summary() or None
+#             inference       list with the inference latencies and
+#                             throughput of every batch size as returned by
+#                             inferenceBenchmark.measure() for the last
+#                             measured run if the inference was measured,
+#                             otherwise None
+#             quantization    comparison of the TensorFlow Lite models of the
+#                             last measured run as returned by
+#                             quantization.compare() if the network was
+#                             quantized, otherwise None
+#             phases          wall time and number of occurrences of every
+#                             phase of the whole benchmark, from the start of
+#                             the interpreter to the writing of the log and
+#                             summed over all runs, as returned by
+#                             PhaseTimer.summary() in phaseTimer.py for the
+#                             last measured run, otherwise None
+#             trace           name of the Chrome trace file of the run as
+#                             described in spanTracer.py or None
+#             profile         directory, step range (epoch, first, last),
+#                             number of captured steps and summary of the
+#                             TensorFlow profile as described in
+#                             profileCapture.py for the last measured run if
+#                             a profile was captured, otherwise None
+#             weights         dictionary with the weights file (file) and
+#                             whether the weights were saved after the
+#                             training or loaded instead of it (mode), or
+#                             None
+#             trainingSize    number of training samples
+#             testSize        number of test samples
+#             trainingTime    training time in seconds
+#             testTime        test time in seconds
+#             testAccuracy    classification accuracy (0 to 1) or None
+#             inputShape      input shape of the network as a list
+#             parameters      dictionary with total, trainable and
+#                             nonTrainable number of network parameters
+#             epochs          per-epoch and per-batch series as returned by
+#                             TimingCallback.summary() or None
+#
+#             Values that a legacy log does not contain are None.
+#
+#             This is Python 3 code!
+
+# Known Bugs: none
+#
+# @author     Ekkehard Blanz <Ekkehard.Blanz@gmail.com> (C) 2026
+#
+# @copyright  See COPYING file that comes with this distribution
+#
+# File history:
+#
+#      Date         | Author         | Modification
+#  -----------------+----------------+------------------------------------------
+#   Sat Oct 17 2026 | Ekkehard Blanz | created
+#   Sat Oct 17 2026 | Ekkehard Blanz | added options of the test run
+#   Sat Oct 17 2026 | Ekkehard Blanz | added thread pool configuration
+#   Sat Oct 17 2026 | Ekkehard Blanz | added peak memory
+#   Sat Oct 17 2026 | Ekkehard Blanz | added sampled memory
+#   Sat Oct 17 2026 | Ekkehard Blanz | added CPU and GPU utilization
+#   Sat Oct 17 2026 | Ekkehard Blanz | added inference latency
+#   Sat Oct 17 2026 | Ekkehard Blanz | added stored weights
+#   Sat Oct 17 2026 | Ekkehard Blanz | added precision policy
+#   Sat Oct 17 2026 | Ekkehard Blanz | added quantization
+#   Sat Oct 17 2026 | Ekkehard Blanz | added phase breakdown
+#   Sat Oct 17 2026 | Ekkehard Blanz | added hardware limits
+#   Sat Oct 17 2026 | Ekkehard Blanz | added trace file
+#   Sat Oct 17 2026 | Ekkehard Blanz | added TensorFlow profile
+#                   |                |
+
+import sys
+import os
+import re
+import json
+import argparse
+
+
+schemaVersion = 1
+
+# architecture names reported by cpuinfo at the end of a platform name
+archPattern = r"(X86|ARM|PPC|SPARC|MIPS|RISCV|LOONG)_\d+$"
+
+
+def makeRecord( **values ):
+    """!
+    @brief Create a result record with all keys of the schema.
+    @param values values of the record - keys that are not given are None
+    @return record dictionary
+    """
+    record = {"schema": schemaVersion,
+              "source": "benchmark",
+              "module": None,
+              "platform": None,
+              "experiment": None,
+              "run": 0,
+              "repeat": 1,
+              "warmup": 0,
+              "hardware": {"brand": None,
+                           "bits": None,
+                           "cores": None,
+                           "frequency": None,
+                           "memoryGB": None,
+                           "gpuAvailable": None,
+                           "effectiveCores": None,
+                           "cpuQuota": None,
+                           "memoryLimit": None,
+                           "isa": None,
+                           "numaNodes": None},
+              "device": None,
+              "dtype": None,
+              "tfVersion": None,
+              "precision": {"policy": None,
+                            "computeDtype": None,
+                            "variableDtype": None,
+                            "lossScaling": None},
+              "threads": {"intraOp": None,
+                          "interOp": None,
+                          "affinity": None},
+              "options": {},
+              "memory": {"peakRSS": None,
+                         "interval": None,
+                         "phases": None,
+                         "series": None},
+              "utilization": None,
+              "inference": None,
+              "quantization": None,
+              "phases": None,
+              "trace": None,
+              "profile": None,
+              "weights": None,
+              "trainingSize": None,
+              "testSize": None,
+              "trainingTime": None,
+              "testTime": None,
+              "testAccuracy": None,
+              "inputShape": None,
+              "parameters": {"total": None,
+                             "trainable": None,
+                             "nonTrainable": None},
+              "epochs": None}
+    for key, value in values.items():
+        if key not in record:
+            raise KeyError( "Unknown record key {0}".format( key ) )
+        if isinstance( record[key], dict ) and value is not None:
+            record[key].update( value )
+        else:
+            record[key] = value
+    return record
+
+
+def splitLogName( fileName ):
+    """!
+    @brief Split a log or record file name into module, platform and
+           experiment number.
+    @param fileName name of the file with or without directory
+    @return (module, platform, experiment) tuple, experiment is None if the
+            file name does not contain an experiment number
+    """
+    baseName = os.path.basename( fileName )
+    baseName = os.path.splitext( baseName )[0]
+    module, platform = baseName.split( ".", 1 )
+    experiment = None
+    # the architecture names of cpuinfo end in a number as well, e.g. ARM_8
+    # or X86_64, so a trailing number is only the experiment number if it does
+    # not belong to the architecture
+    match = re.match( r"(.*)_(\d+)$", platform )
+    if match and not re.search( archPattern, platform ):
+        platform = match.group( 1 )
+        experiment = int( match.group( 2 ) )
+    return module, platform, experiment
+
+
+def recordFileName( logFileName ):
+    """!
+    @brief Return the name of the record file belonging to a log file.
+    @param logFileName name of the log file
+    @return name of the record file
+    """
+    return os.path.splitext( logFileName )[0] + ".jsonl"
+
+
+def writeRecords( fileName, records ):
+    """!
+    @brief Write records as JSON lines.
+    @param fileName name of the file to write
+    @param records list of records
+    """
+    f = open( fileName, "w" )
+    for record in records:
+        f.write( json.dumps( record ) + "\n" )
+    f.close()
+
+
+def readRecords( fileName ):
+    """!
+    @brief Read records from a JSON lines file.
+    @param fileName name of the file to read
+    @return list of records
+    """
+    records = []
+    f = open( fileName )
+    for line in f:
+        if line.strip():
+            records.append( json.loads( line ) )
+    f.close()
+    return records
+
+
+def parseShape( text ):
+    """!
+    @brief Convert a printed shape like (None, 28, 28, 1) into a list.
+    @param text printed shape
+    @return list with None or int elements
+    """
+    shape = []
+    for element in text.strip( " ()" ).split( "," ):
+        element = element.strip()
+        if element:
+            shape.append( None if element == "None" else int( element ) )
+    return shape
+
+
+def parseLegacyLog( fileName ):
+    """!
+    @brief Parse a text log written by benchmark.py into a record.
+
+    The format of the logs changed over time, so every line is optional;
+    values that are not found stay None.  Module, platform and experiment
+    number are taken from the file name.
+    @param fileName name of the log file
+    @return record
+    """
+    module, platform, experiment = splitLogName( fileName )
+    record = makeRecord( source="legacy", module=module, platform=platform,
+                         experiment=experiment )
+    hardware = record["hardware"]
+    parameters = record["parameters"]
+
+    f = open( fileName )
+    for line in f:
+        line = line.strip()
+        match = re.match( r"Running \S+ on (.*), (\d+) bits$", line )
+        if match:
+            hardware["brand"] = match.group( 1 )
+            hardware["bits"] = int( match.group( 2 ) )
+            continue
+        match = re.match( r"with (\d+) cores, running at (.*)$", line )
+        if match:
+            hardware["cores"] = int( match.group( 1 ) )
+            hardware["frequency"] = match.group( 2 )
+            continue
+        match = re.match( r"Installed memory: (\d+) GB$", line )
+        if match:
+            hardware["memoryGB"] = int( match.group( 1 ) )
+            continue
+        match = re.match( r"Floatingpoint precision: (\S+)$", line )
+        if match:
+            record["dtype"] = match.group( 1 )
+            continue
+        if "GPU acceleration is" in line:
+            hardware["gpuAvailable"] = "not available" not in line
+            if "and used" in line:
+                record["device"] = "gpu"
+            elif "but not used" in line:
+                record["device"] = "cpu"
+            elif "may not get used" in line:
+                record["device"] = "any"
+            continue
+        match = re.match( r"Using TensorFlow Version (\S+)$", line )
+        if match:
+            record["tfVersion"] = match.group( 1 )
+            continue
+        match = re.match( r"Thread pools: (\d+) intra-op, (\d+) inter-op "
+                          r"threads(, pinned to cores ([0-9,]+))?$", line )
+        if match:
+            record["threads"]["intraOp"] = int( match.group( 1 ) )
+            record["threads"]["interOp"] = int( match.group( 2 ) )
+            if match.group( 4 ):
+                record["threads"]["affinity"] = \
+                    [int( core ) for core in match.group( 4 ).split( "," )]
+            continue
+        match = re.match( r"Training size:\s*(\d+) samples$", line )
+        if match:
+            record["trainingSize"] = int( match.group( 1 ) )
+            continue
+        match = re.match( r"Test size:\s*(\d+) samples$", line )
+        if match:
+            record["testSize"] = int( match.group( 1 ) )
+            continue
+        match = re.match( r"Training time:\s*([0-9.]+) s$", line )
+        if match:
+            record["trainingTime"] = float( match.group( 1 ) )
+            continue
+        match = re.match( r"Test time:\s*([0-9.]+) s$", line )
+        if match:
+            record["testTime"] = float( match.group( 1 ) )
+            continue
+        match = re.match( r"Peak memory:\s*([0-9.]+) MB$", line )
+        if match:
+            record["memory"]["peakRSS"] = int( float( match.group( 1 ) ) *
+                                               1024**2 )
+            continue
+        match = re.match(
+            r"Classification accuracy on test data:\s*([0-9.]+) %$", line )
+        if match:
+            record["testAccuracy"] = float( match.group( 1 ) ) / 100
+            continue
+        match = re.match( r"Input Shape:\s*(\(.*\))$", line )
+        if match:
+            record["inputShape"] = parseShape( match.group( 1 ) )
+            continue
+        match = re.match( r"(Total|Trainable|Non-trainable) params: ([0-9,]+)$",
+                          line )
+        if match:
+            key = {"Total": "total",
+                   "Trainable": "trainable",
+                   "Non-trainable": "nonTrainable"}[match.group( 1 )]
+            parameters[key] = int( match.group( 2 ).replace( ",", "" ) )
+            continue
+    f.close()
+
+    return record
+
+
+def loadDirectory( logDir ):
+    """!
+    @brief Load the records of all runs in a log directory.
+
+    For every log file, the records are read from its record file if there is
+    one, otherwise the log itself is parsed.
+    @param logDir log directory
+    @return list of records
+    """
+    records = []
+    for fileName in sorted( os.listdir( logDir ) ):
+        if not fileName.endswith( ".log" ):
+            continue
+        logFileName = os.path.join( logDir, fileName )
+        if os.path.isfile( recordFileName( logFileName ) ):
+            records += readRecords( recordFileName( logFileName ) )
+        else:
+            records.append( parseLegacyLog( logFileName ) )
+    return records
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Convert benchmark logs into JSON lines result records." )
+    parser.add_argument( "logDir", nargs="?", default="../logs",
+                         help="log directory (default: ../logs)" )
+    parser.add_argument( "-o", "--output", default=None,
+                         help="output file (default: standard output)" )
+    args = parser.parse_args()
+
+    records = loadDirectory( args.logDir )
+    if args.output is None:
+        for record in records:
+            print( json.dumps( record ) )
+    else:
+        writeRecords( args.output, records )
+        print( "Wrote {0} records to {1}".format( len( records ),
+                                                  args.output ) )
+
+    sys.exit( 0 )
@@ -0,0 +1,107 @@
+# Python Implementation: statistics over repeated benchmark runs
+# -*- coding: utf-8 -*-
+##
+# @file       runStatistics.py
+#
+# @version    1.1.0
+#
+# @par Purpose
+#             Compute summary statistics (mean, median, standard deviation,
+#             minimum, maximum and confidence interval of the mean) over the
+#             measurements of repeated benchmark runs as well as percentiles
+#             of latency distributions.
+#
+# @par Comments
+#             The confidence interval uses Student's t distribution, since the
+#             number of repetitions is typically small.  The critical values
+#             are tabulated here to avoid a dependency on scipy.
+#
+#             This is Python 3 code!
+
+# Known Bugs: none
+#
+# @author     Ekkehard Blanz <Ekkehard.Blanz@gmail.com> (C) 2026
+#
+# @copyright  See COPYING file that comes with this distribution
+#
+# File history:
+#
+#      Date         | Author         | Modification
+#  -----------------+----------------+------------------------------------------
+#   Sat Oct 17 2026 | Ekkehard Blanz | created
+#   Sat Oct 17 2026 | Ekkehard Blanz | added percentile()
+#                   |                |
+
+import math
+import statistics
+
+
+# two-sided 95 % critical values of Student's t distribution for 1 to 30
+# degrees of freedom
+tTable95 = [12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262,
+            2.228, 2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101,
+            2.093, 2.086, 2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052,
+            2.048, 2.045, 2.042]
+
+
+def tCritical95( degreesOfFreedom ):
+    """!
+    @brief Return the two-sided 95 % critical value of Student's t
+           distribution.
+    @param degreesOfFreedom degrees of freedom (at least 1)
+    @return critical value, approximated by the normal distribution above 30
+            degrees of freedom
+    """
+    if degreesOfFreedom <= len( tTable95 ):
+        return tTable95[degreesOfFreedom - 1]
+    return 1.960
+
+
+def summarize( values ):
+    """!
+    @brief Compute summary statistics of a series of measurements.
+
+    Values that are None (e.g. the accuracy of a regression task) are ignored.
+    @param values list of measurements
+    @return dictionary with the keys "n", "mean", "median", "stddev", "min",
+            "max" and "ci95", where ci95 is the half width of the 95 %
+            confidence interval of the mean, or None if there are no values
+    """
+    values = [value for value in values if value is not None]
+    n = len( values )
+    if n == 0:
+        return None
+
+    if n > 1:
+        stddev = statistics.stdev( values )
+        ci95 = tCritical95( n - 1 ) * stddev / math.sqrt( n )
+    else:
+        stddev = 0.
+        ci95 = 0.
+
+    return {"n": n,
+            "mean": statistics.mean( values ),
+            "median": statistics.median( values ),
+            "stddev": stddev,
+            "min": min( values ),
+            "max": max( values ),
+            "ci95": ci95}
+
+
+def percentile( values, p ):
+    """!
+    @brief Compute a percentile of a series of measurements.
+
+    The percentile is interpolated linearly between the two closest ranks,
+    like numpy.percentile() does by default.
+    @param values list of measurements
+    @param p percentile between 0 and 100
+    @return percentile or None if there are no values
+    """
+    values = sorted( value for value in values if value is not None )
+    if not values:
+        return None
+    rank = (len( values ) - 1) * p / 100
+    lower = math.floor( rank )
+    upper = min( lower + 1, len( values ) - 1 )
+    return values[lower] + (values[upper] - values[lower]) * (rank - lower)
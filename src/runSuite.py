@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+
+# Python Implementation: run a whole matrix of benchmarks
+# -*- coding: utf-8 -*-
+##
+# @file       runSuite.py
+#
+# @version    1.0.0
+#
+# @par Purpose
+#             Run a matrix of benchmark modules, mlc devices, floating-point
+#             precisions and experiment numbers with benchmark.py, one fresh
+#             worker process per cell, and collect all results of the session.
+#
+# @par Synopsis:
+#                 runSuite.py [--modules <m1,m2,...>] [--devices <d1,d2,...>]
+#                             [--dtypes <t1,t2,...>] [--experiments N]
+#                             [--jobs J] [--cores C] [--retries R]
+#                             [--timeout S] [-- <benchmark.py options>]
+#             runs every combination of the given modules (all eight by
+#             default), mlc devices and precisions (the defaults of
+#             benchmark.py if not given) for the experiment numbers 1 to N
+#             (4 by default, like runall).  Options after -- are passed on to
+#             every benchmark.py run, e.g. -- --repeat 5 --warmup 1.
+#
+# @par Comments
+#             Every cell runs in its own Python process, so TensorFlow starts
+#             with clean memory and thread pools.  Up to J cells run at the
+#             same time, which makes sense for cells that use only a few cores
+#             on large hosts.  On Linux, every running cell is pinned to its
+#             own set of C cores (all cores divided by J by default) and the
+#             thread pools of TensorFlow and OpenMP are sized accordingly.
+#             Cells that fail or exceed the timeout of S seconds are retried
+#             up to R times (1 by default).
+#
+#             The output of every attempt is written to a session directory
+#             ../logs/sessions/<date>_<time>, together with session.jsonl,
+#             which holds the result records of all cells, and session.json,
+#             which lists every cell with its command, status, number of
+#             attempts, duration and log file.  The logs themselves are
+#             written by benchmark.py as usual.
+#
+#             This is Python 3 code!
+
+# Known Bugs: none
+#
+# @author     Ekkehard Blanz <Ekkehard.Blanz@gmail.com> (C) 2026
+#
+# @copyright  See COPYING file that comes with this distribution
+#
+# File history:
+#
+#      Date         | Author         | Modification
+#  -----------------+----------------+------------------------------------------
+#   Sat Oct 17 2026 | Ekkehard Blanz | created
+#                   |                |
+
+import sys
+import os
+import re
+import time
+import json
+import argparse
+import subprocess
+
+import resultRecord
+
+
+# benchmark modules in the sequence runall runs them
+suiteModules = ["dogsVsCats", "imdbEmbedded", "imdb", "mnist1D", "mnist2D",
+                "mpiWeatherConv", "mpiWeather", "reuters"]
+
+
+def makeCells( modules, devices, dtypes, experiments ):
+    """!
+    @brief Create the cells of the benchmark matrix.
+
+    Like in runall, all modules run once for each experiment number before
+    the next experiment number is started.
+    @param modules list of benchmark modules
+    @param devices list of mlc devices, None for the default device
+    @param dtypes list of precisions, None for the default precision
+    @param experiments number of experiments
+    @return list of cell dictionaries with the keys module, device, dtype and
+            experiment
+    """
+    cells = []
+    for experiment in range( 1, experiments + 1 ):
+        for device in devices:
+            for dtype in dtypes:
+                for module in modules:
+                    cells.append( {"module": module,
+                                   "device": device,
+                                   "dtype": dtype,
+                                   "experiment": experiment} )
+    return cells
+
+
+def cellName( cell ):
+    """!
+    @brief Compose a name of a cell for file names and messages.
+    @param cell cell dictionary
+    @return name
+    """
+    name = cell["module"]
+    for key in ("device", "dtype"):
+        if cell[key] is not None:
+            name += "_" + cell[key]
+    return name + "_" + str( cell["experiment"] )
+
+
+def cellCommand( cell, benchmarkArgs ):
+    """!
+    @brief Compose the benchmark.py command line of a cell.
+    @param cell cell dictionary
+    @param benchmarkArgs list of further options for benchmark.py
+    @return list of command line arguments
+    """
+    command = [sys.executable, "benchmark.py", cell["module"],
+               str( cell["experiment"] )]
+    if cell["device"] is not None:
+        command.append( cell["device"] )
+    if cell["dtype"] is not None:
+        command += ["--dtype", cell["dtype"]]
+    return command + benchmarkArgs
+
+
+def coreSlots( jobs, cores ):
+    """!
+    @brief Divide the available cores into disjoint sets, one per job.
+    @param jobs number of concurrent jobs
+    @param cores number of cores per job or None to divide all cores evenly
+    @return list of core sets or None if cores cannot be pinned on this system
+    """
+    if not hasattr( os, "sched_setaffinity" ):
+        return None
+    available = sorted( os.sched_getaffinity( 0 ) )
+    if cores is None:
+        cores = max( 1, len( available ) // jobs )
+    if cores * jobs > len( available ):
+        raise ValueError( "{0} jobs with {1} cores each need more than the {2} "
+                          "available cores".format( jobs, cores,
+                                                    len( available ) ) )
+    return [set( available[i * cores:(i + 1) * cores] )
+            for i in range( jobs )]
+
+
+def startCell( command, outputName, slot ):
+    """!
+    @brief Start the worker process of a cell.
+    @param command command line of the worker
+    @param outputName name of the file receiving the output of the worker
+    @param slot set of cores to pin the worker to or None
+    @return subprocess.Popen object
+    """
+    env = dict( os.environ )
+    preexec = None
+    if slot is not None:
+        threads = str( len( slot ) )
+        env["OMP_NUM_THREADS"] = threads
+        env["TF_NUM_INTRAOP_THREADS"] = threads
+        env["TF_NUM_INTEROP_THREADS"] = "1" if len( slot ) < 4 else "2"
+        preexec = lambda: os.sched_setaffinity( 0, slot )
+    output = open( outputName, "w" )
+    output.write( " ".join( command ) + "\n\n" )
+    output.flush()
+    process = subprocess.Popen( command, stdout=output,
+                                stderr=subprocess.STDOUT, env=env,
+                                preexec_fn=preexec,
+                                cwd=os.path.dirname( os.path.abspath(
+                                    __file__ ) ) )
+    output.close()
+    return process
+
+
+def recordFile( outputName ):
+    """!
+    @brief Find the record file a worker wrote in its output.
+    @param outputName name of the file with the output of the worker
+    @return name of the record file or None if the worker did not write one
+    """
+    f = open( outputName, errors="replace" )
+    match = re.search( r"^Writing records to:\s+(.*\S)\s*$", f.read(),
+                       re.MULTILINE )
+    f.close()
+    if match is None:
+        return None
+    return os.path.join( os.path.dirname( os.path.abspath( __file__ ) ),
+                         match.group( 1 ) )
+
+
+def runCells( cells, benchmarkArgs, sessionDir, jobs=1, cores=None,
+              retries=1, timeout=None ):
+    """!
+    @brief Run all cells and retry the failed ones.
+    @param cells list of cell dictionaries - status, attempts, duration,
+           command and recordFile are added to each cell
+    @param benchmarkArgs list of further options for benchmark.py
+    @param sessionDir directory for the output of the workers
+    @param jobs number of cells that run at the same time
+    @param cores number of cores per cell or None
+    @param retries number of times a failed cell is run again
+    @param timeout time in seconds after which a cell is killed or None
+    """
+    slots = coreSlots( jobs, cores ) if jobs > 1 or cores else None
+    freeSlots = list( range( jobs ) )
+    pending = list( cells )
+    running = []
+    for cell in cells:
+        cell["attempts"] = 0
+        cell["status"] = "pending"
+
+    while pending or running:
+        while pending and freeSlots:
+            cell = pending.pop( 0 )
+            slotIndex = freeSlots.pop( 0 )
+            cell["attempts"] += 1
+            cell["command"] = cellCommand( cell, benchmarkArgs )
+            cell["cores"] = None if slots is None else \
+                            sorted( slots[slotIndex] )
+            outputName = os.path.join(
+                sessionDir, "{0}.{1}.out".format( cellName( cell ),
+                                                  cell["attempts"] ) )
+            print( "Starting {0} (attempt {1})".format( cellName( cell ),
+                                                        cell["attempts"] ) )
+            process = startCell( cell["command"], outputName,
+                                 None if slots is None else slots[slotIndex] )
+            running.append( (cell, process, slotIndex, outputName,
+                             time.time()) )
+
+        time.sleep( 0.5 )
+        for entry in list( running ):
+            cell, process, slotIndex, outputName, start = entry
+            if process.poll() is None:
+                if timeout is None or time.time() - start < timeout:
+                    continue
+                process.kill()
+                process.wait()
+            running.remove( entry )
+            freeSlots.append( slotIndex )
+            cell["duration"] = time.time() - start
+            cell["returnCode"] = process.returncode
+            cell["recordFile"] = recordFile( outputName )
+            if process.returncode == 0 and cell["recordFile"] is not None:
+                cell["status"] = "done"
+            elif cell["attempts"] <= retries:
+                cell["status"] = "retrying"
+                pending.append( cell )
+            else:
+                cell["status"] = "failed"
+            print( "{0} {1} after {2:.1f} s".format(
+                cellName( cell ), cell["status"], cell["duration"] ) )
+
+
+def writeSession( cells, sessionDir ):
+    """!
+    @brief Write the cells and the result records of a session.
+    @param cells list of cells after runCells()
+    @param sessionDir session directory
+    @return number of result records
+    """
+    records = []
+    for cell in cells:
+        if cell["status"] == "done":
+            records += resultRecord.readRecords( cell["recordFile"] )
+    resultRecord.writeRecords( os.path.join( sessionDir, "session.jsonl" ),
+                               records )
+    f = open( os.path.join( sessionDir, "session.json" ), "w" )
+    json.dump( cells, f, indent=1 )
+    f.close()
+    return len( records )
+
+
+if __name__ == "__main__":
+    if "--" in sys.argv:
+        benchmarkArgs = sys.argv[sys.argv.index( "--" ) + 1:]
+        argv = sys.argv[1:sys.argv.index( "--" )]
+    else:
+        benchmarkArgs = []
+        argv = sys.argv[1:]
+
+    parser = argparse.ArgumentParser(
+        description="Run a matrix of benchmarks in separate processes." )
+    parser.add_argument( "--modules", default=",".join( suiteModules ),
+                         help="comma-separated benchmark modules "
+                              "(default: all)" )
+    parser.add_argument( "--devices", default=None,
+                         help="comma-separated mlc devices (default: the "
+                              "default of benchmark.py)" )
+    parser.add_argument( "--dtypes", default=None,
+                         help="comma-separated precisions (default: the "
+                              "default of the platform)" )
+    parser.add_argument( "--experiments", type=int, default=4, metavar="N",
+                         help="number of experiments per cell (default: 4)" )
+    parser.add_argument( "--jobs", type=int, default=1, metavar="J",
+                         help="number of cells run at the same time "
+                              "(default: 1)" )
+    parser.add_argument( "--cores", type=int, default=None, metavar="C",
+                         help="number of cores each cell is pinned to "
+                              "(default: all cores divided by J)" )
+    parser.add_argument( "--retries", type=int, default=1, metavar="R",
+                         help="number of retries of a failed cell "
+                              "(default: 1)" )
+    parser.add_argument( "--timeout", type=float, default=None, metavar="S",
+                         help="time in seconds after which a cell is "
+                              "killed (default: none)" )
+    args = parser.parse_args( argv )
+
+    if args.jobs < 1 or args.experiments < 1 or args.retries < 0:
+        parser.error( "--jobs and --experiments must be positive and "
+                      "--retries non-negative" )
+
+    devices = [None] if args.devices is None else args.devices.split( "," )
+    dtypes = [None] if args.dtypes is None else args.dtypes.split( "," )
+    cells = makeCells( args.modules.split( "," ), devices, dtypes,
+                       args.experiments )
+
+    sessionDir = os.path.join( os.path.dirname( os.path.abspath( __file__ ) ),
+                               "..", "logs", "sessions",
+                               time.strftime( "%Y%m%d_%H%M%S" ) )
+    os.makedirs( sessionDir )
+
+    try:
+        runCells( cells, benchmarkArgs, sessionDir, args.jobs, args.cores,
+                  args.retries, args.timeout )
+    except ValueError as e:
+        print( "ERROR:", e )
+        sys.exit( 1 )
+    nRecords = writeSession( cells, sessionDir )
+
+    failed = [cellName( cell ) for cell in cells if cell["status"] != "done"]
+    print( "\n{0} of {1} cells done, {2} records written to {3}".format(
+        len( cells ) - len( failed ), len( cells ), nRecords, sessionDir ) )
+    if failed:
+        print( "Failed cells:", ", ".join( failed ) )
+        sys.exit( 1 )
+
+    sys.exit( 0 )
@@ -0,0 +1,234 @@
+# Python Implementation: timed spans exported as a Chrome trace
+# -*- coding: utf-8 -*-
+##
+# @file       spanTracer.py
+#
+# @version    1.0.0
+#
+# @par Purpose
+#             Record nested, timed spans of the data preparation, the input
+#             pipelines and the training of the benchmarks and export them as
+#             a trace file in the Chrome trace event format, which
+#             chrome://tracing and https://ui.perfetto.dev show as a timeline
+#             with one track per thread, so that stalls of the input pipeline
+#             can be seen against the training steps without a profiler.
+#
+# @par Comments
+#             Spans are recorded with
+#
+#                 with spanTracer.span( "name", key=value ):
+#                     ...
+#
+#             or by decorating a function with @spanTracer.traced; the keyword
+#             arguments of span() become the arguments of the trace event.  A
+#             span must not contain a yield, since the consumer of a generator
+#             would be timed as well.  Tracing is disabled by default, in which
+#             case span() returns a shared span that does nothing and traced
+#             functions are called directly, so the instrumentation of the hot
+#             paths costs a function call and a test.  benchmark.py enables
+#             tracing with its --trace option and writes one trace file per
+#             measured test run.
+#
+#             Spans may be recorded by several threads, e.g. the workers of
+#             Keras that run the generators; every span is recorded when it
+#             ends, appending to a list is atomic in CPython.  Nesting is not
+#             recorded explicitly, the viewers derive it from the times of the
+#             spans of each thread.
+#
+#             This module must not import anything heavy, since it is imported
+#             by the benchmark modules and their helpers.
+#
+#             This is Python 3 code!
+
+# Known Bugs: none
+#
+# @author     Ekkehard Blanz <Ekkehard.Blanz@gmail.com> (C) 2026
+#
+# @copyright  See COPYING file that comes with this distribution
+#
+# File history:
+#
+#      Date         | Author         | Modification
+#  -----------------+----------------+------------------------------------------
+#   Sat Oct 17 2026 | Ekkehard Blanz | created
+#                   |                |
+
+import os
+import time
+import json
+import functools
+import threading
+
+
+# True while spans are recorded
+enabled = False
+
+# recorded spans as Chrome trace events and names of the recording threads
+events = []
+threadNames = {}
+
+# time the timestamps of the events are relative to
+origin = time.perf_counter()
+
+
+class Span:
+    """!
+    @brief A timed span that is recorded when it ends.
+    """
+
+    def __init__( self, name, category, args ):
+        """!
+        @brief Constructor.
+        @param name name of the span
+        @param category category of the span, e.g. "data" or "training"
+        @param args dictionary of arguments shown with the span
+        """
+        self.name = name
+        self.category = category
+        self.args = args
+        self.begin = 0.
+
+
+    def start( self ):
+        """!
+        @brief Start the span.
+        @return the span itself
+        """
+        self.begin = time.perf_counter()
+        return self
+
+
+    def stop( self ):
+        """!
+        @brief End the span and record it.
+        """
+        end = time.perf_counter()
+        thread = threading.current_thread()
+        threadNames.setdefault( thread.ident, thread.name )
+        events.append( {"name": self.name,
+                        "cat": self.category,
+                        "ph": "X",
+                        "ts": (self.begin - origin) * 1e6,
+                        "dur": (end - self.begin) * 1e6,
+                        "pid": os.getpid(),
+                        "tid": thread.ident,
+                        "args": self.args} )
+
+
+    def __enter__( self ):
+        return self.start()
+
+
+    def __exit__( self, excType, excValue, traceback ):
+        self.stop()
+        return False
+
+
+class NullSpan:
+    """!
+    @brief A span that does nothing, used while tracing is disabled.
+    """
+
+    def start( self ):
+        return self
+
+
+    def stop( self ):
+        pass
+
+
+    def __enter__( self ):
+        return self
+
+
+    def __exit__( self, excType, excValue, traceback ):
+        return False
+
+
+# the span returned while tracing is disabled
+nullSpan = NullSpan()
+
+
+def span( name, category="benchmark", **args ):
+    """!
+    @brief Create a span.
+    @param name name of the span
+    @param category category of the span
+    @param args arguments shown with the span
+    @return Span or, if tracing is disabled, nullSpan
+    """
+    if not enabled:
+        return nullSpan
+    return Span( name, category, args )
+
+
+def traced( function=None, category="data" ):
+    """!
+    @brief Decorator recording every call of a function as a span named
+           after the function.
+
+    It can be used as @traced or as @traced( category="..." ).
+    @param function decorated function
+    @param category category of the spans
+    @return decorated function
+    """
+    if function is None:
+        return lambda function: traced( function, category )
+
+    @functools.wraps( function )
+    def wrapper( *args, **kwargs ):
+        if not enabled:
+            return function( *args, **kwargs )
+        with Span( function.__name__, category, {} ):
+            return function( *args, **kwargs )
+
+    return wrapper
+
+
+def enable():
+    """!
+    @brief Discard all recorded spans and start recording.
+    """
+    global enabled
+    clear()
+    enabled = True
+
+
+def disable():
+    """!
+    @brief Stop recording spans.
+    """
+    global enabled
+    enabled = False
+
+
+def clear():
+    """!
+    @brief Discard all recorded spans and make the time of the call the origin
+           of the timestamps.
+    """
+    global origin
+    del events[:]
+    origin = time.perf_counter()
+
+
+def writeTrace( fileName, metadata=None ):
+    """!
+    @brief Write the recorded spans into a file in the Chrome trace event
+           format.
+    @param fileName name of the trace file
+    @param metadata dictionary of further information about the trace, e.g.
+           the benchmark module and run, or None
+    """
+    traceEvents = [{"name": "thread_name",
+                    "ph": "M",
+                    "pid": os.getpid(),
+                    "tid": ident,
+                    "args": {"name": name}}
+                   for ident, name in threadNames.items()]
+    traceEvents.extend( events )
+    f = open( fileName, "w" )
+    json.dump( {"traceEvents": traceEvents,
+                "displayTimeUnit": "ms",
+                "otherData": metadata or {}}, f )
+    f.close()
@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+
+# Python Implementation: run a benchmark over a range of configurations
+# -*- coding: utf-8 -*-
+##
+# @file       sweep.py
+#
+# @version    1.3.0
+#
+# @par Purpose
+#             Run one benchmark module with benchmark.py for a range of thread
+#             counts or batch sizes and report throughput, speedup and
+#             parallel efficiency or throughput, accuracy and peak memory of
+#             every configuration.
+#
+# @par Synopsis:
+#                 sweep.py <module> [--threads <t1,t2,...>] [--affinity]
+#                          [-- <benchmark.py options>]
+#                 sweep.py <module> --batch-sizes <b1,b2,...>
+#                          [-- <benchmark.py options>]
+#             runs the module with the given numbers of threads, by default
+#             1, 2, 4, ... up to the number of effective cores under the CPU
+#             quota of a container (see hardwareInfo.py), or with the given
+#             batch sizes.  With --affinity, every run is pinned to as many
+#             cores as it has threads.  Options after -- are passed on to
+#             every benchmark.py run, e.g. -- cpu --repeat 3.
+#
+# @par Comments
+#             The thread pools of TensorFlow can only be configured before it
+#             is initialized, so every configuration runs in its own
+#             benchmark.py process.  The throughput of a configuration is the
+#             median steady-state throughput of its measured runs (training
+#             samples per second after the first epoch), or the training size
+#             divided by the training time if the runs have no epoch timing.
+#             The speedup is relative to the first configuration and the
+#             parallel efficiency is the speedup divided by the ratio of the
+#             thread counts.
+#
+#             A batch size sweep reports the throughput, also relative to the
+#             highest one, the median test accuracy and the peak memory of
+#             every batch size, and it marks the knee of the throughput curve:
+#             the smallest batch size that reaches 90 % of the highest
+#             throughput.  The steps per epoch of the weather benchmarks are
+#             scaled with the batch size, all other benchmarks see the whole
+#             training set in every epoch, with a smaller last batch if the
+#             batch size does not divide its size.
+#
+#             The output of the runs, their result records (session.jsonl)
+#             and one row per configuration (sweep.jsonl and sweep.txt) are
+#             written to a session directory ../logs/sessions/<date>_<time>_
+#             <module>_threads or _batchSize.  The logs are written by
+#             benchmark.py as usual, with the thread count or batch size in
+#             the platform name.
+#
+#             This is Python 3 code!
+
+# Known Bugs: none
+#
+# @author     Ekkehard Blanz <Ekkehard.Blanz@gmail.com> (C) 2026
+#
+# @copyright  See COPYING file that comes with this distribution
+#
+# File history:
+#
+#      Date         | Author         | Modification
+#  -----------------+----------------+------------------------------------------
+#   Sat Oct 17 2026 | Ekkehard Blanz | created
+#   Sat Oct 17 2026 | Ekkehard Blanz | added batch size sweep
+#   Sat Oct 17 2026 | Ekkehard Blanz | used effective number of cores
+#   Sat Oct 17 2026 | Ekkehard Blanz | corrected description of the epochs
+#                   |                |
+
+import sys
+import os
+import time
+import argparse
+
+import runStatistics
+import resultRecord
+import hardwareInfo
+from runSuite import startCell, recordFile
+
+
+# batch sizes suggested for a batch size sweep
+batchLadder = [16, 32, 64, 128, 256, 512, 1024]
+
+
+def threadLadder( maxThreads ):
+    """!
+    @brief Compute the thread counts 1, 2, 4, ... up to maxThreads.
+    @param maxThreads largest thread count, included even if it is not a
+           power of two
+    @return list of thread counts
+    """
+    ladder = []
+    threads = 1
+    while threads < maxThreads:
+        ladder.append( threads )
+        threads *= 2
+    ladder.append( maxThreads )
+    return ladder
+
+
+def throughput( record ):
+    """!
+    @brief Compute the training throughput of a run.
+    @param record result record of the run
+    @return training samples per second or None
+    """
+    if record["epochs"] is not None and \
+       record["epochs"]["steadyStateThroughput"] is not None:
+        return record["epochs"]["steadyStateThroughput"]
+    if record["trainingTime"]:
+        return record["trainingSize"] / record["trainingTime"]
+    return None
+
+
+def runPoint( command, outputName ):
+    """!
+    @brief Run benchmark.py for one configuration of a sweep.
+    @param command command line of benchmark.py
+    @param outputName name of the file receiving the output
+    @return list of result records, empty if the run failed
+    """
+    process = startCell( command, outputName, None )
+    process.wait()
+    fileName = recordFile( outputName )
+    if process.returncode != 0 or fileName is None:
+        return []
+    return resultRecord.readRecords( fileName )
+
+
+def threadRows( points ):
+    """!
+    @brief Compute throughput, speedup and efficiency of every configuration.
+    @param points list of (threads, records) tuples
+    @return list of row dictionaries with the keys threads, runs, throughput,
+            speedup and efficiency - the last three are None if the
+            configuration failed
+    """
+    rows = []
+    reference = None
+    for threads, records in points:
+        stats = runStatistics.summarize( [throughput( record )
+                                          for record in records] )
+        row = {"threads": threads,
+               "runs": len( records ),
+               "throughput": None if stats is None else stats["median"],
+               "speedup": None,
+               "efficiency": None}
+        if row["throughput"] is not None:
+            if reference is None:
+                reference = row
+            row["speedup"] = row["throughput"] / reference["throughput"]
+            row["efficiency"] = row["speedup"] * reference["threads"] / threads
+        rows.append( row )
+    return rows
+
+
+def formatThreadRows( rows ):
+    """!
+    @brief Format the rows of a thread sweep as a table.
+    @param rows list of rows as returned by threadRows()
+    @return multi-line string
+    """
+    text = "Threads  Runs   Samples/s   Speedup   Efficiency\n"
+    for row in rows:
+        text += "{0:7d} {1:5d}".format( row["threads"], row["runs"] )
+        if row["throughput"] is None:
+            text += "   failed\n"
+            continue
+        text += " {0:11.1f} {1:9.2f} {2:10.1f} %\n".format(
+            row["throughput"], row["speedup"], row["efficiency"] * 100 )
+    return text
+
+
+def peakMemory( record ):
+    """!
+    @brief Return the peak memory of a run in MB.
+    @param record result record of the run
+    @return peak resident set size in MB or None
+    """
+    # records written before the peak memory was recorded have no memory
+    peak = record.get( "memory", {} ).get( "peakRSS" )
+    if peak is None:
+        return None
+    return peak / 1024**2
+
+
+def batchRows( points, knee=0.9 ):
+    """!
+    @brief Compute throughput, accuracy and peak memory of every batch size.
+
+    The knee of the throughput curve is the smallest batch size that reaches
+    the given fraction of the highest throughput of the sweep; larger batch
+    sizes gain little throughput but usually cost accuracy and memory.
+    @param points list of (batchSize, records) tuples
+    @param knee fraction of the highest throughput that marks the knee
+    @return list of row dictionaries with the keys batchSize, runs,
+            throughput, relative (throughput relative to the highest one),
+            accuracy, peakMemory and knee (True for the knee)
+    """
+    rows = []
+    for batchSize, records in points:
+        stats = runStatistics.summarize( [throughput( record )
+                                          for record in records] )
+        accuracy = runStatistics.summarize( [record["testAccuracy"]
+                                             for record in records] )
+        memory = [peakMemory( record ) for record in records
+                  if peakMemory( record ) is not None]
+        rows.append( {"batchSize": batchSize,
+                      "runs": len( records ),
+                      "throughput": None if stats is None else stats["median"],
+                      "relative": None,
+                      "accuracy": None if accuracy is None
+                                  else accuracy["median"],
+                      "peakMemory": max( memory ) if memory else None,
+                      "knee": False} )
+
+    measured = [row for row in rows if row["throughput"] is not None]
+    if measured:
+        highest = max( row["throughput"] for row in measured )
+        for row in measured:
+            row["relative"] = row["throughput"] / highest
+        for row in sorted( measured, key=lambda row: row["batchSize"] ):
+            if row["relative"] >= knee:
+                row["knee"] = True
+                break
+    return rows
+
+
+def formatBatchRows( rows ):
+    """!
+    @brief Format the rows of a batch size sweep as a table.
+    @param rows list of rows as returned by batchRows()
+    @return multi-line string
+    """
+    text = "Batch size  Runs   Samples/s  Relative  Accuracy  Peak memory\n"
+    for row in rows:
+        text += "{0:10d} {1:5d}".format( row["batchSize"], row["runs"] )
+        if row["throughput"] is None:
+            text += "   failed\n"
+            continue
+        text += " {0:11.1f} {1:7.1f} %".format( row["throughput"],
+                                                 row["relative"] * 100 )
+        if row["accuracy"] is not None:
+            text += " {0:7.2f} %".format( row["accuracy"] * 100 )
+        else:
+            text += "       n/a"
+        if row["peakMemory"] is not None:
+            text += " {0:9.0f} MB".format( row["peakMemory"] )
+        else:
+            text += "          n/a"
+        if row["knee"]:
+            text += "  <- knee"
+        text += "\n"
+    return text
+
+
+if __name__ == "__main__":
+    if "--" in sys.argv:
+        benchmarkArgs = sys.argv[sys.argv.index( "--" ) + 1:]
+        argv = sys.argv[1:sys.argv.index( "--" )]
+    else:
+        benchmarkArgs = []
+        argv = sys.argv[1:]
+
+    parser = argparse.ArgumentParser(
+        description="Run a benchmark over a range of thread counts or batch "
+                    "sizes." )
+    parser.add_argument( "module", help="benchmark module to run" )
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument( "--threads", default=None,
+                        help="comma-separated thread counts (default: 1, 2, "
+                             "4, ... up to the number of effective cores)" )
+    group.add_argument( "--batch-sizes", default=None,
+                        help="comma-separated batch sizes, e.g. "
+                             + ",".join( str( b ) for b in batchLadder ) )
+    parser.add_argument( "--affinity", action="store_true",
+                         help="pin every run to as many cores as it has "
+                              "threads" )
+    args = parser.parse_args( argv )
+
+    if args.batch_sizes is not None:
+        name = "batchSize"
+        ladder = [int( b ) for b in args.batch_sizes.split( "," )]
+    elif args.threads is not None:
+        name = "threads"
+        ladder = [int( threads ) for threads in args.threads.split( "," )]
+    else:
+        name = "threads"
+        ladder = threadLadder( hardwareInfo.effectiveCores(
+            hardwareInfo.cpuQuota() ) )
+
+    sessionDir = os.path.join( os.path.dirname( os.path.abspath( __file__ ) ),
+                               "..", "logs", "sessions",
+                               time.strftime( "%Y%m%d_%H%M%S" ) + "_" +
+                               args.module + "_" + name )
+    os.makedirs( sessionDir )
+
+    points = []
+    records = []
+    for value in ladder:
+        command = [sys.executable, "benchmark.py", args.module] + \
+                  benchmarkArgs
+        if name == "threads":
+            command += ["--threads", str( value )]
+            if args.affinity:
+                command.append( "--affinity" )
+            print( "Running {0} with {1} threads".format( args.module,
+                                                          value ) )
+            outputName = "{0}_t{1}.out".format( args.module, value )
+        else:
+            command += ["--batch-size", str( value )]
+            print( "Running {0} with batch size {1}".format( args.module,
+                                                             value ) )
+            outputName = "{0}_b{1}.out".format( args.module, value )
+        pointRecords = runPoint( command,
+                                 os.path.join( sessionDir, outputName ) )
+        points.append( (value, pointRecords) )
+        records += pointRecords
+
+    if name == "threads":
+        rows = threadRows( points )
+        table = formatThreadRows( rows )
+    else:
+        rows = batchRows( points )
+        table = formatBatchRows( rows )
+    resultRecord.writeRecords( os.path.join( sessionDir, "session.jsonl" ),
+                               records )
+    resultRecord.writeRecords( os.path.join( sessionDir, "sweep.jsonl" ),
+                               rows )
+    f = open( os.path.join( sessionDir, "sweep.txt" ), "w" )
+    f.write( table )
+    f.close()
+
+    print( "\n" + table )
+    print( "Results written to", sessionDir )
+
+    sys.exit( 0 if all( row["throughput"] is not None for row in rows )
+              else 1 )
@@ -0,0 +1,151 @@
+# Python Implementation: synthetic data with the shapes of the real datasets
+# -*- coding: utf-8 -*-
+##
+# @file       syntheticData.py
+#
+# @version    1.0.0
+#
+# @par Purpose
+#             Generate random samples and labels with the shapes, data types,
+#             label cardinalities and sample counts of the datasets of the
+#             benchmark modules, so that the benchmarks run without their
+#             datasets and measure the model alone, independent of downloads
+#             and disk speed.
+#
+# @par Comments
+#             A benchmark module describes its data in a dictionary with the
+#             keys
+#
+#             trainSize   number of training samples
+#             testSize    number of test samples
+#             shape       shape of one sample
+#             inputs      "uniform" for values in [0, 1) like scaled pixels,
+#                         "normal" for normalized measurements, "multiHot"
+#                         for multi-hot encoded word sets with the fraction
+#                         density of ones, or "indices" for word indices
+#                         below vocabulary
+#             labels      "binary" for labels 0 and 1, "oneHot" for one-hot
+#                         encoded labels of classes classes, or "regression"
+#                         for normally distributed targets
+#
+#             The whole dataset is never materialized: batches() generates a
+#             pool of a few batches once and cycles through it, so that
+#             generating random numbers does not become part of the measured
+#             time either.  The training and test data are drawn with
+#             different seeds.  Since the labels are random, the accuracy of
+#             a synthetic test run is the one of guessing and only the times
+#             are meaningful.
+#
+#             This is Python 3 code!
+
+# Known Bugs: none
+#
+# @author     Ekkehard Blanz <Ekkehard.Blanz@gmail.com> (C) 2026
+#
+# @copyright  See COPYING file that comes with this distribution
+#
+# File history:
+#
+#      Date         | Author         | Modification
+#  -----------------+----------------+------------------------------------------
+#   Sat Oct 17 2026 | Ekkehard Blanz | created
+#                   |                |
+
+import math
+import numpy as np
+
+
+# number of distinct batches batches() cycles through
+poolBatches = 4
+
+# number of samples samples() returns by default at most
+defaultSamples = 4096
+
+# seeds of the training and the test data
+seeds = {"train": 0, "test": 1}
+
+
+def randomSamples( spec, count, dtype, seed ):
+    """!
+    @brief Generate random samples and labels.
+    @param spec dictionary describing the data as explained above
+    @param count number of samples
+    @param dtype data type of the samples and labels
+    @param seed seed of the random number generator
+    @return (inputs, labels) tuple of arrays
+    """
+    rng = np.random.RandomState( seed )
+    shape = (count,) + tuple( spec["shape"] )
+
+    if spec["inputs"] == "uniform":
+        inputs = rng.random_sample( shape )
+    elif spec["inputs"] == "normal":
+        inputs = rng.standard_normal( shape )
+    elif spec["inputs"] == "multiHot":
+        inputs = rng.random_sample( shape ) < spec["density"]
+    elif spec["inputs"] == "indices":
+        inputs = rng.randint( 0, spec["vocabulary"], size=shape )
+    else:
+        raise ValueError( "Unknown kind of inputs " + spec["inputs"] )
+
+    if spec["labels"] == "binary":
+        labels = rng.randint( 0, 2, size=count )
+    elif spec["labels"] == "oneHot":
+        labels = np.eye( spec["classes"] )[rng.randint( 0, spec["classes"],
+                                                        size=count )]
+    elif spec["labels"] == "regression":
+        labels = rng.standard_normal( count )
+    else:
+        raise ValueError( "Unknown kind of labels " + spec["labels"] )
+
+    return inputs.astype( dtype ), labels.astype( dtype )
+
+
+def steps( count, batchSize ):
+    """!
+    @brief Compute the number of batches of one pass over the data.
+    @param count number of samples
+    @param batchSize number of samples per batch
+    @return number of batches
+    """
+    return math.ceil( count / batchSize )
+
+
+def batches( spec, subset, batchSize, dtype, count=None ):
+    """!
+    @brief Generate batches of random samples and labels endlessly.
+
+    Every pass over the data consists of steps( count, batchSize ) batches,
+    the last of which may be smaller, as Keras would cut them from arrays.
+    @param spec dictionary describing the data as explained above
+    @param subset "train" or "test"
+    @param batchSize number of samples per batch
+    @param dtype data type of the samples and labels
+    @param count number of samples of one pass or None for the size of the
+           subset given in spec
+    """
+    if count is None:
+        count = spec[subset + "Size"]
+    inputs, labels = randomSamples( spec, poolBatches * batchSize, dtype,
+                                    seeds[subset] )
+    while True:
+        for first in range( 0, count, batchSize ):
+            offset = (first // batchSize) % poolBatches * batchSize
+            n = min( batchSize, count - first )
+            yield inputs[offset:offset + n], labels[offset:offset + n]
+
+
+def samples( spec, subset, dtype, count=None ):
+    """!
+    @brief Return random samples and labels, e.g. for measuring the
+           inference.
+    @param spec dictionary describing the data as explained above
+    @param subset "train" or "test"
+    @param dtype data type of the samples and labels
+    @param count number of samples or None for the size of the subset but
+           at most defaultSamples
+    @return (inputs, labels) tuple of arrays
+    """
+    if count is None:
+        count = min( spec[subset + "Size"], defaultSamples )
+    return randomSamples( spec, count, dtype, seeds[subset] )
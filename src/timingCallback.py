@@ -0,0 +1,265 @@
+# Python Implementation: per-epoch and per-batch timing of the training
+# -*- coding: utf-8 -*-
+##
+# @file       timingCallback.py
+#
+# @version    1.2.0
+#
+# @par Purpose
+#             Provide a Keras callback that records the wall time of every
+#             training epoch and batch, so that the time spent for tracing and
+#             compiling the graph in the first epoch can be separated from the
+#             steady-state throughput of the later epochs.
+#
+# @par Comments
+#             The callback is installed by benchmark.py for every test run.
+#             Keras does not pass the batch size to callbacks, therefore the
+#             number of samples per epoch is computed from the number of
+#             batches and the batch size the benchmark module declares, limited
+#             to the size of the training set for the last, partial batch.
+#             PhaseCallback, which is installed alongside, feeds the training
+#             phases of the phase timer of benchmark.py, and TraceCallback,
+#             which is installed with --trace, records the training, its
+#             epochs and batches as spans (see spanTracer.py).
+#
+#             This is Python 3 code!
+
+# Known Bugs: none
+#
+# @author     Ekkehard Blanz <Ekkehard.Blanz@gmail.com> (C) 2026
+#
+# @copyright  See COPYING file that comes with this distribution
+#
+# File history:
+#
+#      Date         | Author         | Modification
+#  -----------------+----------------+------------------------------------------
+#   Sat Oct 17 2026 | Ekkehard Blanz | created
+#   Sat Oct 17 2026 | Ekkehard Blanz | added PhaseCallback
+#   Sat Oct 17 2026 | Ekkehard Blanz | added TraceCallback
+#                   |                |
+
+import time
+
+from keras import callbacks
+
+import phaseTimer
+import spanTracer
+
+
+class TimingCallback( callbacks.Callback ):
+    """!
+    @brief Keras callback recording the wall time of epochs and batches.
+
+    After training, epochTimes holds the wall time of every epoch in seconds
+    and batchTimes holds one list of batch wall times per epoch.
+    """
+
+    def __init__( self, batchSize=None ):
+        """!
+        @brief Constructor.
+        @param batchSize number of samples per batch or None if unknown
+        """
+        super().__init__()
+        self.batchSize = batchSize
+        self.epochTimes = []
+        self.batchTimes = []
+        self.epochStart = 0.
+        self.batchStart = 0.
+
+
+    def on_train_begin( self, logs=None ):
+        self.epochTimes = []
+        self.batchTimes = []
+
+
+    def on_epoch_begin( self, epoch, logs=None ):
+        self.batchTimes.append( [] )
+        self.epochStart = time.perf_counter()
+
+
+    def on_epoch_end( self, epoch, logs=None ):
+        self.epochTimes.append( time.perf_counter() - self.epochStart )
+
+
+    def on_batch_begin( self, batch, logs=None ):
+        self.batchStart = time.perf_counter()
+
+
+    def on_batch_end( self, batch, logs=None ):
+        self.batchTimes[-1].append( time.perf_counter() - self.batchStart )
+        # standalone Keras reports the actual size of each batch
+        if logs and "size" in logs and self.batchSize is None:
+            self.batchSize = int( logs["size"] )
+
+
+    def epochSamples( self, trainingSize ):
+        """!
+        @brief Compute the number of samples processed in every epoch.
+        @param trainingSize size of the training set
+        @return list with the number of samples per epoch or None if the batch
+                size is unknown
+        """
+        if self.batchSize is None:
+            return None
+        return [min( len( batches ) * self.batchSize, trainingSize )
+                for batches in self.batchTimes]
+
+
+    def summary( self, trainingSize ):
+        """!
+        @brief Summarize the recorded times.
+
+        The first epoch contains the tracing and compilation of the graph, so
+        it is reported separately from the steady state of all later epochs.
+        @param trainingSize size of the training set
+        @return dictionary with the per-epoch series and the first-epoch and
+                steady-state times and throughputs
+        """
+        samples = self.epochSamples( trainingSize )
+        throughput = None
+        if samples is not None:
+            throughput = [n / t if t > 0 else None
+                          for n, t in zip( samples, self.epochTimes )]
+
+        steadyTime = sum( self.epochTimes[1:] )
+        steadyThroughput = None
+        if samples is not None and steadyTime > 0:
+            steadyThroughput = sum( samples[1:] ) / steadyTime
+
+        return {"batchSize": self.batchSize,
+                "epochTimes": self.epochTimes,
+                "epochSamples": samples,
+                "epochThroughput": throughput,
+                "batchTimes": self.batchTimes,
+                "firstEpochTime": self.epochTimes[0] if self.epochTimes
+                                  else None,
+                "firstBatchTime": self.batchTimes[0][0] if self.batchTimes and
+                                  self.batchTimes[0] else None,
+                "steadyStateTime": steadyTime,
+                "steadyStateThroughput": steadyThroughput}
+
+
+    def report( self, trainingSize ):
+        """!
+        @brief Format the recorded times as a table for the log.
+        @param trainingSize size of the training set
+        @return multi-line string, empty if no epoch was recorded
+        """
+        if not self.epochTimes:
+            return ""
+        stats = self.summary( trainingSize )
+
+        text = "Epoch timing (batch size {0}):\n".format(
+            self.batchSize if self.batchSize is not None else "unknown" )
+        text += "Epoch   Time [s]  Batches   Median batch [ms]" \
+                "   Max batch [ms]   Samples/s\n"
+        for epoch, epochTime in enumerate( self.epochTimes ):
+            batches = sorted( self.batchTimes[epoch] )
+            if batches:
+                median = batches[len( batches ) // 2] * 1000
+                longest = batches[-1] * 1000
+            else:
+                median = longest = 0.
+            text += "{0:5d} {1:10.3f} {2:8d} {3:19.3f} {4:16.3f}".format(
+                epoch + 1, epochTime, len( batches ), median, longest )
+            if stats["epochThroughput"] is not None and \
+               stats["epochThroughput"][epoch] is not None:
+                text += " {0:11.1f}".format( stats["epochThroughput"][epoch] )
+            text += "\n"
+
+        text += "First epoch (incl. tracing): " \
+                "{0:9.3f} s\n".format( stats["firstEpochTime"] )
+        if stats["firstBatchTime"] is not None:
+            text += "First batch (incl. tracing): " \
+                    "{0:9.3f} s\n".format( stats["firstBatchTime"] )
+        if len( self.epochTimes ) > 1:
+            text += "Steady state (epochs 2-{0}):  ".format(
+                len( self.epochTimes ) )
+            text += "{0:9.3f} s".format( stats["steadyStateTime"] )
+            if stats["steadyStateThroughput"] is not None:
+                text += ", {0:.1f} samples/s".format(
+                    stats["steadyStateThroughput"] )
+            text += "\n"
+        text += "Per-batch times [ms] of every epoch:\n"
+        for epoch, batches in enumerate( self.batchTimes ):
+            text += "{0:5d}: ".format( epoch + 1 )
+            text += " ".join( "{0:.2f}".format( t * 1000 ) for t in batches )
+            text += "\n"
+
+        return text
+
+
+class PhaseCallback( callbacks.Callback ):
+    """!
+    @brief Keras callback switching the phases of the phase timer (see
+           phaseTimer.py) during the training.
+
+    The first batch includes tracing and compiling the graph, so it is timed
+    as a phase of its own, separate from the steady-state training, and the
+    evaluation phase lasts from the end of the training to the next phase.
+    """
+
+    def __init__( self ):
+        """!
+        @brief Constructor.
+        """
+        super().__init__()
+        self.firstBatch = True
+
+
+    def on_train_begin( self, logs=None ):
+        self.firstBatch = True
+        phaseTimer.begin( "firstBatch" )
+
+
+    def on_batch_end( self, batch, logs=None ):
+        if self.firstBatch:
+            self.firstBatch = False
+            phaseTimer.begin( "training" )
+
+
+    def on_train_end( self, logs=None ):
+        phaseTimer.begin( "evaluation" )
+
+
+class TraceCallback( callbacks.Callback ):
+    """!
+    @brief Keras callback recording the training, every epoch and every batch
+           as spans of the span tracer (see spanTracer.py).
+    """
+
+    def __init__( self ):
+        """!
+        @brief Constructor.
+        """
+        super().__init__()
+        self.fitSpan = spanTracer.nullSpan
+        self.epochSpan = spanTracer.nullSpan
+        self.batchSpan = spanTracer.nullSpan
+
+
+    def on_train_begin( self, logs=None ):
+        self.fitSpan = spanTracer.span( "fit", "training" ).start()
+
+
+    def on_train_end( self, logs=None ):
+        self.fitSpan.stop()
+
+
+    def on_epoch_begin( self, epoch, logs=None ):
+        self.epochSpan = spanTracer.span( "epoch", "training",
+                                          epoch=epoch + 1 ).start()
+
+
+    def on_epoch_end( self, epoch, logs=None ):
+        self.epochSpan.stop()
+
+
+    def on_batch_begin( self, batch, logs=None ):
+        self.batchSpan = spanTracer.span( "batch", "training",
+                                          batch=batch ).start()
+
+
+    def on_batch_end( self, batch, logs=None ):
+        self.batchSpan.stop()
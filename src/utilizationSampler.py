@@ -0,0 +1,255 @@
+# Python Implementation: CPU and GPU utilization sampling during a test run
+# -*- coding: utf-8 -*-
+##
+# @file       utilizationSampler.py
+#
+# @version    1.0.0
+#
+# @par Purpose
+#             Provide a Keras callback that samples the load of every CPU core
+#             and of the GPU in a background thread during a test run, so
+#             that every run shows whether the input pipeline or the model is
+#             the bottleneck - a job that used to require external tools as in
+#             doc/CPUandGPUloadMpiWeather.jpg.
+#
+# @par Comments
+#             Every sample holds the utilization of every core in percent
+#             since the previous sample, as reported by psutil, the rate of
+#             context switches of the whole system per second and the current
+#             frequency of every core in MHz, both only on Linux where they
+#             are read from /proc/stat and /sys/devices/system/cpu, and the
+#             load of the GPU in percent, which is available only on NVIDIA
+#             Jetson boards in /sys/devices/gpu.0/load.  Quantities that are
+#             not available are None.  The samples are assigned to the data
+#             preparation, training and evaluation phases as described in
+#             phaseSampler.py.
+#
+#             A single busy core during the training with idle other cores and
+#             an idle GPU points to the input pipeline, all cores or the GPU
+#             busy to the model.
+#
+#             This is Python 3 code!
+
+# Known Bugs: none
+#
+# @author     Ekkehard Blanz <Ekkehard.Blanz@gmail.com> (C) 2026
+#
+# @copyright  See COPYING file that comes with this distribution
+#
+# File history:
+#
+#      Date         | Author         | Modification
+#  -----------------+----------------+------------------------------------------
+#   Sat Oct 17 2026 | Ekkehard Blanz | created
+#                   |                |
+
+import os
+import time
+
+import psutil
+
+from phaseSampler import PhaseSampler, phases, phaseIndices
+
+
+# load of the GPU of NVIDIA Jetson boards in 1/10 percent
+jetsonGpuLoad = "/sys/devices/gpu.0/load"
+
+# shortest time in seconds over which loads and rates are meaningful
+minimumInterval = 0.01
+
+
+def readContextSwitches():
+    """!
+    @brief Read the number of context switches since boot from /proc/stat.
+    @return number of context switches or None if not available
+    """
+    try:
+        f = open( "/proc/stat" )
+        for line in f:
+            if line.startswith( "ctxt " ):
+                f.close()
+                return int( line.split()[1] )
+        f.close()
+    except OSError:
+        pass
+    return None
+
+
+def readFrequencies( cores ):
+    """!
+    @brief Read the current frequency of every core from sysfs.
+    @param cores number of cores
+    @return list of frequencies in MHz or None if not available
+    """
+    frequencies = []
+    for core in range( cores ):
+        try:
+            f = open( "/sys/devices/system/cpu/cpu{0}/cpufreq/"
+                      "scaling_cur_freq".format( core ) )
+            frequencies.append( int( f.read() ) / 1000 )
+            f.close()
+        except (OSError, ValueError):
+            return None
+    return frequencies
+
+
+def readGpuLoad():
+    """!
+    @brief Read the load of the GPU.
+    @return load in percent or None if not available
+    """
+    if not os.path.exists( jetsonGpuLoad ):
+        return None
+    try:
+        f = open( jetsonGpuLoad )
+        load = int( f.read() ) / 10
+        f.close()
+    except (OSError, ValueError):
+        return None
+    return load
+
+
+class UtilizationSampler( PhaseSampler ):
+    """!
+    @brief Keras callback sampling the CPU and GPU load in a background
+           thread.
+
+    start() has to be called before and stop() after the test run.
+    """
+
+    def __init__( self, interval=0.5 ):
+        """!
+        @brief Constructor.
+        @param interval time between two samples in seconds
+        """
+        super().__init__( interval )
+        self.cores = psutil.cpu_count()
+        self.lastSwitches = None
+        self.lastTime = 0.
+
+
+    def start( self ):
+        # the first call of cpu_percent() only sets its reference point
+        psutil.cpu_percent( percpu=True )
+        self.lastSwitches = readContextSwitches()
+        self.lastTime = time.perf_counter()
+        super().start()
+
+
+    def measure( self ):
+        now = time.perf_counter()
+        switches = readContextSwitches()
+        load = psutil.cpu_percent( percpu=True )
+        rate = None
+        if now - self.lastTime < minimumInterval:
+            # e.g. the first sample right after start()
+            load = None
+        elif switches is not None and self.lastSwitches is not None:
+            rate = (switches - self.lastSwitches) / (now - self.lastTime)
+        self.lastSwitches = switches
+        self.lastTime = now
+        return {"cpu": load,
+                "contextSwitches": rate,
+                "frequency": readFrequencies( self.cores ),
+                "gpu": readGpuLoad()}
+
+
+    def summary( self ):
+        """!
+        @brief Summarize the samples per phase.
+        @return dictionary with the sampling interval, a dictionary with the
+                mean load of all cores (meanCPU), the mean load of the
+                busiest core (meanBusiestCore), the mean context switch rate
+                (contextSwitchRate) and the mean GPU load (meanGPU) for every
+                phase that was sampled, and the time series of all samples as
+                a dictionary of lists (time, phase, cpu, contextSwitches,
+                frequency, gpu) where cpu and frequency hold one list per
+                sample with one value per core
+        """
+        series = self.samples()
+
+        def mean( values ):
+            values = [value for value in values if value is not None]
+            return sum( values ) / len( values ) if values else None
+
+        phaseStats = {}
+        for phase, index in phaseIndices( series ).items():
+            loads = [series["cpu"][i] for i in index if series["cpu"][i]]
+            phaseStats[phase] = {
+                "meanCPU": mean( [sum( load ) / len( load )
+                                  for load in loads] ),
+                "meanBusiestCore": mean( [max( load ) for load in loads] ),
+                "contextSwitchRate": mean( [series["contextSwitches"][i]
+                                            for i in index] ),
+                "meanGPU": mean( [series["gpu"][i] for i in index] )}
+
+        return {"interval": self.interval,
+                "phases": phaseStats,
+                "series": series}
+
+
+    def report( self ):
+        """!
+        @brief Format the mean utilization of every phase as a table for the
+               log.
+        @return multi-line string
+        """
+        stats = self.summary()
+        text = "Utilization (sampled every {0} s, {1} cores):\n".format(
+            self.interval, self.cores )
+        text += "Phase        Mean CPU [%]  Busiest core [%]" \
+                "  Ctx switches/s  Mean GPU [%]\n"
+        for phase in phases:
+            if phase not in stats["phases"]:
+                continue
+            phaseStats = stats["phases"][phase]
+            text += "{0:12s}".format( phase )
+            for key, width, precision in (("meanCPU", 13, 1),
+                                          ("meanBusiestCore", 18, 1),
+                                          ("contextSwitchRate", 16, 0),
+                                          ("meanGPU", 14, 1)):
+                if phaseStats[key] is None:
+                    text += "{0:>{1}s}".format( "n/a", width )
+                else:
+                    text += "{0:{1}.{2}f}".format( phaseStats[key], width,
+                                                   precision )
+            text += "\n"
+        return text
+
+
+def writeCsv( fileName, samplers ):
+    """!
+    @brief Write the time series of the utilization as a CSV file for
+           plotting.
+
+    Every line holds one sample with the columns run, time, phase, the load
+    of every core, the context switch rate, the frequency of every core and
+    the GPU load; values that are not available are empty.
+    @param fileName name of the CSV file
+    @param samplers list of UtilizationSampler objects, one per run
+    """
+    cores = max( sampler.cores for sampler in samplers )
+    f = open( fileName, "w" )
+    f.write( ",".join( ["run", "time", "phase"] +
+                       ["cpu{0}".format( core ) for core in range( cores )] +
+                       ["contextSwitches"] +
+                       ["freq{0}".format( core ) for core in range( cores )] +
+                       ["gpu"] ) + "\n" )
+    for run, sampler in enumerate( samplers ):
+        series = sampler.samples()
+        for i in range( len( series["time"] ) ):
+            columns = [str( run ), "{0:.3f}".format( series["time"][i] ),
+                       series["phase"][i]]
+            load = series["cpu"][i] or []
+            columns += ["{0:.1f}".format( value ) for value in load]
+            columns += [""] * (cores - len( load ))
+            columns.append( "" if series["contextSwitches"][i] is None
+                            else "{0:.0f}".format(
+                                series["contextSwitches"][i] ) )
+            frequencies = series["frequency"][i] or []
+            columns += ["{0:.0f}".format( value ) for value in frequencies]
+            columns += [""] * (cores - len( frequencies ))
+            columns.append( "" if series["gpu"][i] is None
+                            else "{0:.1f}".format( series["gpu"][i] ) )
+            f.write( ",".join( columns ) + "\n" )
+    f.close()
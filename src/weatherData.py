@@ -0,0 +1,222 @@
+# Python Implementation: MPI Jena climate data preparation
+# -*- coding: utf-8 -*-
+##
+# @file       weatherData.py
+#
+# @version    1.5.0
+#
+# @par Purpose
+#             Provide the data preparation and batch generation shared by the
+#             MPI Jena weather forecasting benchmarks.
+#
+# @par Comments
+#             The functions in here used to be duplicated in mpiWeather.py and
+#             mpiWeatherConv.py.  The batch generator gathers all windows of a
+#             batch with a single np.take() call into preallocated buffers
+#             rather than filling the batch sample by sample in a Python loop,
+#             but it draws exactly the same samples as the generator in
+#             Chollet's book.  The CSV file is parsed only once and cached in
+#             binary form with datasetCache.py.  For synthetic test runs,
+#             syntheticWindows() generates random windows of the same shape
+#             without the CSV file.
+#
+#             This is Python 3 code!
+
+# Known Bugs: none
+#
+# @author     Ekkehard Blanz <Ekkehard.Blanz@gmail.com> (C) 2019-2026
+#
+# @copyright  See COPYING file that comes with this distribution
+#
+# File history:
+#
+#      Date         | Author         | Modification
+#  -----------------+----------------+------------------------------------------
+#   Sat Oct 17 2026 | Ekkehard Blanz | extracted from mpiWeather.py and
+#                   |                | mpiWeatherConv.py, vectorized generator
+#   Sat Oct 17 2026 | Ekkehard Blanz | added cache of the parsed CSV data
+#   Sat Oct 17 2026 | Ekkehard Blanz | moved the cache to datasetCache.py
+#   Sat Oct 17 2026 | Ekkehard Blanz | added synthetic windows
+#   Sat Oct 17 2026 | Ekkehard Blanz | added phase marks
+#   Sat Oct 17 2026 | Ekkehard Blanz | added trace spans
+#                   |                |
+
+import os
+import numpy as np
+
+from datasetCache import cachedArrays
+import syntheticData
+import phaseTimer
+import spanTracer
+
+
+# number of rows and measured quantities of mpi_roof_2009_2016.csv, which
+# synthetic test runs use instead of reading the file
+climateRows = 420551
+climateColumns = 14
+
+# data of synthetic test runs - normalized windows of ten days sampled every
+# hour and the temperature one day later as the target, the sizes are the
+# defaults of the weather benchmarks
+syntheticSpec = {"trainSize": 200000,
+                 "testSize": climateRows - (200000 + 100000 + 144) - 1,
+                 "shape": (1440 // 6, climateColumns),
+                 "inputs": "normal",
+                 "labels": "regression"}
+
+
+@spanTracer.traced
+def parseCsv( fname ):
+    """!
+    @brief Parse the climate CSV file into a float64 array without the leading
+           date column.
+    @param fname name of the CSV file
+    @return two-dimensional array with one row per line of the file
+    """
+
+    f = open( fname )
+    header = f.readline().split( ',' )
+    float_data = np.loadtxt( f, delimiter=',', ndmin=2,
+                             usecols=range( 1, len( header ) ) )
+    f.close()
+
+    return float_data
+
+
+def normalizedData( fname, trainSize ):
+    """!
+    @brief Parse the climate CSV file and normalize the data.
+    @param fname name of the CSV file
+    @param trainSize number of leading samples used for the normalization
+    @return dictionary with the normalized data and the mean and standard
+            deviation used for the normalization
+    """
+
+    float_data = parseCsv( fname )
+
+    phaseTimer.begin( "preprocessing" )
+
+    mean = float_data[:trainSize].mean(axis=0)
+    float_data -= mean
+    std = float_data[:trainSize].std(axis=0)
+    float_data /= std
+
+    return {"data": float_data, "mean": mean, "std": std}
+
+
+@spanTracer.traced
+def prepData( originalDatasetDir, trainSize ):
+    """!
+    @brief Load the normalized MPI Jena climate data.
+
+    Parsing the 420k lines of the CSV file dominates the start-up time on slow
+    machines, so the normalized data are stored in the dataset cache after the
+    first run and memory-mapped on later runs.  The cache entry is keyed by
+    the size and modification time of the CSV file as well as by the training
+    size, which determines the normalization statistics; the mean and
+    standard deviation are stored alongside.
+    @param originalDatasetDir directory where mpi_roof_2009_2016.csv resides
+    @param trainSize number of leading samples used for the normalization
+    @return read-only array with one normalized row per time step
+    """
+
+    fname = os.path.join( originalDatasetDir, 'mpi_roof_2009_2016.csv' )
+
+    stat = os.stat( fname )
+    data = cachedArrays( "mpiJenaClimate",
+                         {"size": stat.st_size, "mtime": stat.st_mtime_ns,
+                          "trainSize": trainSize},
+                         lambda: normalizedData( fname, trainSize ) )
+
+    return data["data"]
+
+
+def generator( data, lookback, delay, min_index, max_index,
+               shuffle=False, batch_size=128, step=6, dtype=None,
+               buffers=16 ):
+    """!
+    @param data The original array of floating-point data, which you
+                normalized above
+    @param lookback How many timesteps back the input data should go
+    @param delay How many timesteps in the future the target should be
+    @param min_index and max_index Indices in the data array that delimit which
+           timesteps to draw from. This is useful for keeping a segment of the
+           data for validation and another for testing
+    @param shuffle Whether to shuffle the samples or draw them in chronological
+           order
+    @param batch_size The number of samples per batch
+    @param step—The period, in timesteps, at which you sample data. You’ll set
+           it to 6 in order to draw one data point every hour
+    @param dtype data type of the yielded samples and targets - if None, the
+           data type of data is used
+    @param buffers number of batch buffers that are used in turn - this must
+           be larger than the number of batches the consumer may hold at any
+           one time (Keras queues up to 10 batches by default), since a buffer
+           is overwritten when its turn comes up again
+    """
+
+    if max_index is None:
+        max_index = len(data) - delay - 1
+    if dtype is None:
+        dtype = data.dtype
+    # convert once rather than on every batch
+    data = np.ascontiguousarray( data, dtype=dtype )
+    temperature = np.ascontiguousarray( data[:, 1] )
+
+    # offsets of the samples in a window relative to the row it ends at
+    offsets = np.arange( -lookback, 0, step )
+
+    samplesBuffers = np.empty( (buffers, batch_size, len( offsets ),
+                                data.shape[-1]), dtype=dtype )
+    targetsBuffers = np.empty( (buffers, batch_size), dtype=dtype )
+    indices = np.empty( (batch_size, len( offsets )), dtype=np.intp )
+    current = 0
+
+    i = min_index + lookback
+    while 1:
+        with spanTracer.span( "generator", "data" ):
+            if shuffle:
+                rows = np.random.randint(
+                    min_index + lookback, max_index, size=batch_size)
+            else:
+                if i + batch_size >= max_index:
+                    i = min_index + lookback
+                rows = np.arange(i, min(i + batch_size, max_index))
+                i += len(rows)
+
+            n = len( rows )
+            samples = samplesBuffers[current, :n]
+            targets = targetsBuffers[current, :n]
+            current = (current + 1) % buffers
+
+            np.add( rows[:, np.newaxis], offsets, out=indices[:n] )
+            np.take( data, indices[:n], axis=0, out=samples )
+            np.take( temperature, rows + delay, out=targets )
+        yield samples, targets
+
+
+def syntheticWindows( data, lookback, delay, min_index, max_index,
+                      shuffle=False, batch_size=128, step=6, dtype=None,
+                      buffers=16 ):
+    """!
+    @brief Generate batches of random windows in place of generator().
+
+    The parameters are the ones of generator(), but data, delay and buffers
+    are ignored and the windows are normally distributed like the normalized
+    data.  The training data are the ones drawn at random (shuffle=True).
+    @param data ignored, may be None
+    @param lookback How many timesteps back the input data should go
+    @param delay ignored
+    @param min_index and max_index Indices that delimit the timesteps to draw
+           from, which determine the number of windows of one pass
+    @param shuffle Whether these are the training data
+    @param batch_size The number of samples per batch
+    @param step The period, in timesteps, at which the windows are sampled
+    @param dtype data type of the yielded samples and targets
+    @param buffers ignored
+    """
+    spec = dict( syntheticSpec,
+                 shape=(len( range( -lookback, 0, step ) ), climateColumns) )
+    return syntheticData.batches( spec, "train" if shuffle else "test",
+                                  batch_size, dtype,
+                                  max_index - min_index - lookback )